@@ -0,0 +1 @@
+"""Performance benchmarks for MCPyDoc (see benchmarks/run.py)."""
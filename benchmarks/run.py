@@ -0,0 +1,360 @@
+"""Benchmark the MCPyDoc tools over synthetic packages.
+
+Drives ``MCPServer.handle_request`` for get_package_docs, search_symbols,
+get_source_code and analyze_structure in each introspection mode:
+
+- ``subprocess``: package-manager subprocess introspection (the project's
+  interpreter runs the scripts; static analysis off)
+- ``direct``: direct import into the server process (static analysis off)
+- ``static``: the default configuration, static analysis first
+
+Every mode runs in its own child process, so imported modules and peak RSS
+do not carry over between modes. A cold call is the first call for a package
+on a fresh server with empty caches (each cold iteration uses a newly
+generated package); warm calls repeat it on the same server. Server startup
+(``initialize`` and ``tools/list`` of a freshly spawned ``python -m mcpydoc``)
+is measured as well.
+
+Results are written as JSON; pass an earlier result as ``--baseline`` to
+print the change of every p50 latency::
+
+    python -m benchmarks.run --output before.json
+    git checkout feature && python -m benchmarks.run --baseline before.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+from .synthetic import SyntheticSpec, generate_package
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+MODES = ("subprocess", "direct", "static")
+TOOLS = ("get_package_docs", "search_symbols", "get_source_code", "analyze_structure")
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class _CountingPopen(subprocess.Popen):
+    """Popen that counts the processes started (subprocess.run uses it too)."""
+
+    spawned = 0
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        _CountingPopen.spawned += 1
+        super().__init__(*args, **kwargs)
+
+
+def percentile(samples: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    """p50/p95 of latencies in milliseconds."""
+    p50, p95 = percentile(samples, 0.5), percentile(samples, 0.95)
+    return {
+        "n": len(samples),
+        "p50_ms": None if p50 is None else round(p50 * 1000, 3),
+        "p95_ms": None if p95 is None else round(p95 * 1000, 3),
+    }
+
+
+def peak_rss_kb(who: str = "self") -> Optional[int]:
+    """Peak resident set size in KiB of this process or its reaped children."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(
+        resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN
+    )
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+
+def _tool_arguments(tool: str, package: str, symbols: List[str]) -> Dict[str, Any]:
+    symbol = symbols[0] if symbols else "helper_0"
+    if tool == "get_package_docs":
+        return {"package_name": package, "module_path": symbol}
+    if tool == "search_symbols":
+        return {"package_name": package, "pattern": "method_1"}
+    if tool == "get_source_code":
+        return {"package_name": package, "symbol_name": symbol}
+    return {"package_name": package}
+
+
+async def _call(server: Any, request_id: int, tool: str, arguments: Dict) -> bool:
+    """Call a tool, returning whether it succeeded."""
+    request = {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": tool, "arguments": arguments},
+    }
+    response = json.loads(await server.handle_request(json.dumps(request)))
+    if "error" in response:
+        return False
+    payload = json.loads(response["result"]["content"][0]["text"])
+    return not (isinstance(payload, dict) and "error" in payload)
+
+
+async def _bench_mode(
+    mode: str, spec: SyntheticSpec, iterations: int, warm_iterations: int
+) -> Dict[str, Any]:
+    """Benchmark one mode in the current process."""
+    from mcpydoc.analyzer import PackageAnalyzer
+    from mcpydoc.mcp_server import MCPServer
+    from mcpydoc.subprocess_introspection import clear_cache
+    from mcpydoc.worker_pool import shutdown_workers
+
+    root = Path(tempfile.mkdtemp(prefix="mcpydoc-bench-"))
+    packages = {}
+    for i in range(iterations):
+        name = f"mcpydoc_synthetic_{i}"
+        packages[name] = generate_package(root, name, spec)
+
+    cold: Dict[str, List[float]] = {tool: [] for tool in TOOLS}
+    warm: Dict[str, List[float]] = {tool: [] for tool in TOOLS}
+    errors = {tool: 0 for tool in TOOLS}
+    spawns = {"cold": 0, "warm": 0}
+    request_id = 0
+
+    # The synthetic project has no package manager; run its scripts with
+    # this interpreter, whose working directory makes the package importable
+    runner = patch(
+        "mcpydoc.subprocess_introspection.detect_package_manager",
+        return_value=([sys.executable], root),
+    )
+    with runner, patch("subprocess.Popen", _CountingPopen):
+        for package, symbols in packages.items():
+            clear_cache()
+            shutdown_workers()
+            server = MCPServer()
+            server.mcpydoc.analyzer = PackageAnalyzer(
+                python_paths=[str(root)],
+                enable_subprocess=mode == "subprocess",
+                working_directory=root,
+                enable_static_analysis=mode == "static",
+            )
+            for phase, samples, repeat in (
+                ("cold", cold, 1),
+                ("warm", warm, warm_iterations),
+            ):
+                spawned = _CountingPopen.spawned
+                for _ in range(repeat):
+                    for tool in TOOLS:
+                        request_id += 1
+                        arguments = _tool_arguments(tool, package, symbols)
+                        start = time.perf_counter()
+                        ok = await _call(server, request_id, tool, arguments)
+                        samples[tool].append(time.perf_counter() - start)
+                        errors[tool] += not ok
+                spawns[phase] += _CountingPopen.spawned - spawned
+            server.mcpydoc.shutdown()
+        shutdown_workers()
+    shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "tools": {
+            tool: {
+                "cold": summarize(cold[tool]),
+                "warm": summarize(warm[tool]),
+                "errors": errors[tool],
+            }
+            for tool in TOOLS
+        },
+        "subprocess_spawns": spawns,
+        "peak_rss_kb": peak_rss_kb("self"),
+        "children_peak_rss_kb": peak_rss_kb("children"),
+    }
+
+
+def bench_startup(iterations: int) -> Dict[str, Any]:
+    """Time initialize and tools/list of a freshly started server process."""
+    handshake: List[float] = []
+    spawn_to_ready: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "mcpydoc"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            cwd=REPO_ROOT,
+        )
+        try:
+            sent = time.perf_counter()
+            for request_id, method in enumerate(("initialize", "tools/list"), 1):
+                message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+                process.stdin.write(json.dumps({**message, "params": {}}) + "\n")
+                process.stdin.flush()
+                process.stdout.readline()
+                if request_id == 1:
+                    # Interpreter startup plus imports, then the reply itself
+                    spawn_to_ready.append(time.perf_counter() - start)
+                    sent = time.perf_counter()
+            handshake.append(time.perf_counter() - sent)
+        finally:
+            process.kill()
+            process.wait()
+    return {
+        "spawn_to_initialize": summarize(spawn_to_ready),
+        "tools_list": summarize(handshake),
+    }
+
+
+def _run_mode_in_child(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one mode's benchmark in a fresh interpreter."""
+    with tempfile.TemporaryDirectory(prefix="mcpydoc-bench-cache-") as cache_dir:
+        env = dict(
+            os.environ,
+            MCPYDOC_CACHE_DIR=cache_dir,
+            MCPYDOC_PREWARM="0",
+        )
+        command = [
+            sys.executable,
+            "-m",
+            "benchmarks.run",
+            "--single-mode",
+            mode,
+            *_spec_arguments(args),
+        ]
+        result = subprocess.run(
+            command, cwd=REPO_ROOT, env=env, capture_output=True, text=True
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark of {mode} mode failed:\n{result.stderr}")
+    return json.loads(result.stdout)
+
+
+def _spec_arguments(args: argparse.Namespace) -> List[str]:
+    return [
+        f"--modules={args.modules}",
+        f"--classes={args.classes}",
+        f"--methods={args.methods}",
+        f"--docstring-lines={args.docstring_lines}",
+        f"--extensions={args.extensions}",
+        f"--iterations={args.iterations}",
+        f"--warm-iterations={args.warm_iterations}",
+    ]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Describe the change of every p50 latency against a baseline result."""
+    lines = []
+    if baseline.get("spec") != current["spec"]:
+        lines.append("Note: the baseline used a different package size")
+    for mode, result in current["modes"].items():
+        before = baseline.get("modes", {}).get(mode)
+        if before is None:
+            continue
+        for tool, phases in result["tools"].items():
+            for phase in ("cold", "warm"):
+                new = phases[phase]["p50_ms"]
+                old = before["tools"].get(tool, {}).get(phase, {}).get("p50_ms")
+                if not new or not old:
+                    continue
+                lines.append(
+                    f"{mode:10} {tool:18} {phase:4} p50 {old:10.2f} -> "
+                    f"{new:10.2f} ms ({(new - old) / old:+.1%})"
+                )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--modules", type=int, default=SyntheticSpec.modules)
+    parser.add_argument("--classes", type=int, default=SyntheticSpec.classes)
+    parser.add_argument("--methods", type=int, default=SyntheticSpec.methods)
+    parser.add_argument(
+        "--docstring-lines", type=int, default=SyntheticSpec.docstring_lines
+    )
+    parser.add_argument("--extensions", type=int, default=SyntheticSpec.extensions)
+    parser.add_argument(
+        "--iterations", type=int, default=5, help="cold runs (one package each)"
+    )
+    parser.add_argument(
+        "--warm-iterations", type=int, default=10, help="warm calls per cold run"
+    )
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--startup-iterations", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write the JSON result here")
+    parser.add_argument("--baseline", type=Path, help="earlier result to compare")
+    parser.add_argument("--single-mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    spec = SyntheticSpec(
+        modules=args.modules,
+        classes=args.classes,
+        methods=args.methods,
+        docstring_lines=args.docstring_lines,
+        extensions=args.extensions,
+    )
+
+    if args.single_mode:
+        result = asyncio.run(
+            _bench_mode(args.single_mode, spec, args.iterations, args.warm_iterations)
+        )
+        print(json.dumps(result))
+        return 0
+
+    import mcpydoc
+
+    report = {
+        "mcpydoc_version": mcpydoc.__version__,
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "spec": spec.to_dict(),
+        "iterations": args.iterations,
+        "warm_iterations": args.warm_iterations,
+        "startup": bench_startup(args.startup_iterations),
+        "modes": {mode: _run_mode_in_child(mode, args) for mode in args.modes},
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        print("\n".join(compare(baseline, report)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
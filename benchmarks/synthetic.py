@@ -0,0 +1,161 @@
+"""Synthetic packages for MCPyDoc benchmarks.
+
+Generates an installed-looking distribution of configurable size: a package
+directory with N submodules of M classes with K methods each, docstrings of a
+given length, and C-extension-like modules whose functions are builtins
+without Python source (described by a ``.pyi`` stub, as compiled extensions
+usually are). The distribution's ``.dist-info`` sits next to the package, so
+the directory works both as an environment path for direct import and as the
+working directory of a ``python -c`` introspection subprocess.
+"""
+
+import base64
+import hashlib
+import textwrap
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Builtins re-exported by extension-like modules (no inspect.getsource)
+_BUILTINS = ("len", "abs", "min", "max", "sorted", "repr")
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """Size of a generated package."""
+
+    modules: int = 10
+    classes: int = 5
+    methods: int = 8
+    docstring_lines: int = 6
+    extensions: int = 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the spec as a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def _docstring(summary: str, lines: int, indent: str) -> str:
+    """Build a Google-style docstring with roughly the given number of lines."""
+    body = [summary]
+    if lines > 1:
+        body.append("")
+        body.extend(
+            f"Detail line {i} describing {summary.lower().rstrip('.')}."
+            for i in range(max(0, lines - 5))
+        )
+        body.extend(["", "Args:", "    value: Input value"])
+    text = "\n".join(body)
+    return textwrap.indent(f'"""{text}\n"""', indent).lstrip()
+
+
+def _class_source(name: str, spec: SyntheticSpec) -> str:
+    lines = [
+        f"class {name}(Base):",
+        f"    {_docstring(f'{name} synthetic class.', spec.docstring_lines, '    ')}",
+        "",
+    ]
+    for k in range(spec.methods):
+        lines.extend(
+            [
+                f"    def method_{k}(self, value: int = {k}) -> int:",
+                f"        {_docstring(f'Method {k} of {name}.', spec.docstring_lines, '        ')}",
+                f"        return value + {k}",
+                "",
+            ]
+        )
+    return "\n".join(lines)
+
+
+def _module_source(index: int, spec: SyntheticSpec) -> str:
+    parts = [
+        f'"""Synthetic module {index}."""',
+        "",
+        "",
+        "class Base:",
+        '    """Common base class."""',
+        "",
+        "",
+    ]
+    for j in range(spec.classes):
+        parts.append(_class_source(f"Class{index}_{j}", spec))
+        parts.append("")
+    parts.extend(
+        [
+            f"def helper_{index}(value: int) -> int:",
+            f"    {_docstring(f'Helper of module {index}.', spec.docstring_lines, '    ')}",
+            "    return value",
+            "",
+        ]
+    )
+    return "\n".join(parts)
+
+
+def _extension_sources(index: int) -> Dict[str, str]:
+    """Source and stub of an extension-like module."""
+    names = [f"native_{name}" for name in _BUILTINS]
+    source = [f'"""Extension-like module {index}."""', ""]
+    source.extend(f"from builtins import {b} as {n}" for b, n in zip(_BUILTINS, names))
+    stub = [f"def {name}(*args: object) -> object: ..." for name in names]
+    return {
+        f"_native{index}.py": "\n".join(source) + "\n",
+        f"_native{index}.pyi": "\n".join(stub) + "\n",
+    }
+
+
+def _record_line(root: Path, relative: str) -> str:
+    data = (root / relative).read_bytes()
+    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=")
+    return f"{relative},sha256={digest.decode()},{len(data)}"
+
+
+def generate_package(root: Path, name: str, spec: SyntheticSpec) -> List[str]:
+    """Write a synthetic package and its distribution metadata.
+
+    Args:
+        root: Directory to install into (acts as site-packages)
+        name: Import name of the package
+        spec: Package size
+
+    Returns:
+        Dotted paths of one class per submodule, for per-symbol queries
+    """
+    package = root / name
+    package.mkdir(parents=True)
+    files: Dict[str, str] = {}
+    exports = []
+    for i in range(spec.modules):
+        files[f"mod_{i}.py"] = _module_source(i, spec)
+        exports.append(f"from .mod_{i} import helper_{i}")
+    for i in range(spec.extensions):
+        files.update(_extension_sources(i))
+    files["__init__.py"] = (
+        f"{_docstring(f'Synthetic package {name}.', spec.docstring_lines, '')}\n\n"
+        + "\n".join(exports)
+        + "\n"
+    )
+
+    written = []
+    for filename, source in files.items():
+        (package / filename).write_text(source, encoding="utf-8")
+        written.append(f"{name}/{filename}")
+
+    dist_info = root / f"{name}-1.0.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\n"
+        f"Name: {name}\n"
+        "Version: 1.0.0\n"
+        f"Summary: Synthetic benchmark package {name}\n"
+        "Author: MCPyDoc benchmarks\n"
+        "License: MIT\n",
+        encoding="utf-8",
+    )
+    (dist_info / "top_level.txt").write_text(f"{name}\n", encoding="utf-8")
+    record = [_record_line(root, path) for path in written]
+    record.append(f"{dist_info.name}/METADATA,,")
+    record.append(f"{dist_info.name}/top_level.txt,,")
+    record.append(f"{dist_info.name}/RECORD,,")
+    (dist_info / "RECORD").write_text("\n".join(record) + "\n", encoding="utf-8")
+
+    return [f"mod_{i}.Class{i}_0" for i in range(spec.modules) if spec.classes]
@@ -1,26 +1,31 @@
 """MCPyDoc - Model Context Protocol server for Python package documentation."""
 
-from .analyzer import PackageAnalyzer
-from .documentation import DocumentationParser
-from .exceptions import (
-    ImportError,
-    MCPyDocError,
-    PackageNotFoundError,
-    SourceCodeUnavailableError,
-    SymbolNotFoundError,
-    VersionConflictError,
-)
-from .models import (
-    DocumentationInfo,
-    MethodSummary,
-    ModuleDocumentationResult,
-    PackageInfo,
-    PackageStructure,
-    SourceCodeResult,
-    SymbolInfo,
-    SymbolSearchResult,
-)
-from .server import MCPyDoc
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .analyzer import PackageAnalyzer
+    from .documentation import DocumentationParser
+    from .exceptions import (
+        ImportError,
+        MCPyDocError,
+        PackageNotFoundError,
+        SourceCodeUnavailableError,
+        SymbolNotFoundError,
+        VersionConflictError,
+    )
+    from .models import (
+        BatchDocumentationResult,
+        DocumentationInfo,
+        MethodSummary,
+        ModuleDocumentationResult,
+        PackageInfo,
+        PackageStructure,
+        SourceCodeResult,
+        SymbolInfo,
+        SymbolSearchResult,
+    )
+    from .server import MCPyDoc
 
 __version__ = "1.4.0"
 
@@ -39,6 +44,7 @@ __all__ = [
     "PackageStructure",
     "SourceCodeResult",
     "ModuleDocumentationResult",
+    "BatchDocumentationResult",
     # Exceptions
     "MCPyDocError",
     "PackageNotFoundError",
@@ -47,3 +53,40 @@ __all__ = [
     "SymbolNotFoundError",
     "SourceCodeUnavailableError",
 ]
+
+# Exports are imported on first access (PEP 562) so that importing the
+# package, e.g. to start the server, does not load pydantic and
+# docstring_parser up front.
+_EXPORTS = {
+    "MCPyDoc": ".server",
+    "PackageAnalyzer": ".analyzer",
+    "DocumentationParser": ".documentation",
+    "PackageInfo": ".models",
+    "SymbolInfo": ".models",
+    "MethodSummary": ".models",
+    "DocumentationInfo": ".models",
+    "SymbolSearchResult": ".models",
+    "PackageStructure": ".models",
+    "SourceCodeResult": ".models",
+    "ModuleDocumentationResult": ".models",
+    "BatchDocumentationResult": ".models",
+    "MCPyDocError": ".exceptions",
+    "PackageNotFoundError": ".exceptions",
+    "VersionConflictError": ".exceptions",
+    "ImportError": ".exceptions",
+    "SymbolNotFoundError": ".exceptions",
+    "SourceCodeUnavailableError": ".exceptions",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,41 +1,109 @@
 """Package analysis functionality for MCPyDoc."""
 
+import contextvars
 import inspect
 import logging
 import os
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from functools import lru_cache
-from importlib import import_module, metadata
+from importlib import import_module
 from pathlib import Path
 from types import ModuleType
-from typing import Dict, List, Optional, get_type_hints
+from typing import Any, Dict, List, Optional, Tuple, get_type_hints
 
+from .deadline import check_deadline, remaining_time
+from .dist_index import (
+    find_distribution,
+    find_distribution_by_import_name,
+    resolve_import_name,
+)
 from .exceptions import (
     ImportError,
+    MCPyDocError,
     PackageNotFoundError,
+    ResourceLimitError,
     SymbolNotFoundError,
     ValidationError,
     VersionConflictError,
 )
+from .metrics import increment, span
 from .models import MethodSummary, PackageInfo, SymbolInfo
+from .search_index import SymbolSearchIndex, index_symbols
 from .security import (
+    DEFAULT_DETAIL,
+    MAX_BATCH_SYMBOLS,
+    MAX_SCAN_SYMBOLS,
     audit_log,
     memory_limit,
     timeout,
+    validate_detail,
     validate_package_name,
     validate_symbol_path,
     validate_version,
 )
+from .static_analysis import extract_symbols, find_package_source
 from .subprocess_introspection import (
+    CacheEntry,
+    find_project_root,
+    get_failure,
     get_working_directory,
     introspect_package_docstring,
     introspect_package_info,
     introspect_symbol,
+    introspect_symbols,
+    record_failure,
     search_symbols_subprocess,
 )
 
 logger = logging.getLogger(__name__)
 
+# Guards sys.path changes made before importing an environment's packages
+_sys_path_lock = threading.RLock()
+
+# Search indexes kept per analyzer; "+source" indexes hold full source text
+SEARCH_INDEX_CACHE_SIZE = 32
+
+
+def _discover_environments(use_cache: bool = True) -> "Future[List[str]]":
+    """Detect the active Python environments on a background thread.
+
+    Detection walks the workspace and common project directories looking for
+    virtual environments, which can take seconds on large trees; callers get
+    a future instead of waiting for it.
+
+    Args:
+        use_cache: If False, bypass the environment detection cache
+
+    Returns:
+        Future resolved with the environment paths (empty if detection failed)
+    """
+    future: "Future[List[str]]" = Future()
+
+    def discover() -> None:
+        from .env_detection import get_active_python_environments
+
+        try:
+            future.set_result(get_active_python_environments(use_cache=use_cache))
+        except Exception as e:
+            logger.warning(f"Python environment detection failed: {e}")
+            future.set_result([])
+
+    # Run in a copy of the caller's context so a workspace_scope() applies
+    context = contextvars.copy_context()
+    threading.Thread(
+        target=context.run, args=(discover,), name="mcpydoc-env-discovery", daemon=True
+    ).start()
+    return future
+
+
+def _is_method_like(obj: object) -> bool:
+    """Predicate for class members reported as methods by symbol search."""
+    return inspect.isfunction(obj) or inspect.ismethod(obj)
+
 
 class PackageAnalyzer:
     """Analyzes Python packages to extract documentation and structure."""
@@ -45,6 +113,7 @@ class PackageAnalyzer:
         python_paths: Optional[List[str]] = None,
         enable_subprocess: bool = True,
         working_directory: Optional[Path] = None,
+        enable_static_analysis: bool = True,
     ) -> None:
         """Initialize the analyzer with optional Python environment paths.
 
@@ -56,20 +125,28 @@ class PackageAnalyzer:
                              as the primary method (solves Python version mismatches).
             working_directory: Working directory for package manager detection.
                              If None, uses get_working_directory().
+            enable_static_analysis: If True, serve symbol searches by parsing the
+                             package's source files before falling back to
+                             import-based introspection.
         """
         self._package_cache: Dict[str, ModuleType] = {}
         self._explicit_python_paths = (
             python_paths  # Store if user provided explicit paths
         )
         if python_paths is None:
-            from .env_detection import get_active_python_environments
-
-            self._python_paths = get_active_python_environments()
+            # Detected in the background so that server startup does not wait
+            self._environments = _discover_environments()
         else:
-            self._python_paths = python_paths
+            self._environments = Future()
+            self._environments.set_result(python_paths)
         self._version_cache: Dict[str, Dict[str, PackageInfo]] = {}
         self._subprocess_enabled = enable_subprocess
+        self._static_analysis_enabled = enable_static_analysis
+        # Search indexes, least recently used first, revalidated on every use
+        self._search_indexes: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._search_indexes_lock = threading.Lock()
         self._working_directory = working_directory or get_working_directory()
+        self._dist_dirs: Optional[List[str]] = None
 
     def refresh_environments(self) -> None:
         """Refresh Python environments and working directory.
@@ -79,16 +156,109 @@ class PackageAnalyzer:
         """
         # Only refresh if user didn't provide explicit paths
         if self._explicit_python_paths is None:
-            from .env_detection import get_active_python_environments
-
-            # Force re-detection (bypass cache)
-            self._python_paths = get_active_python_environments(use_cache=False)
-            logger.info(f"Refreshed Python environments: {self._python_paths}")
+            # Force re-detection (bypass cache); lookups wait for the result
+            self._environments = _discover_environments(use_cache=False)
+            self._environments.add_done_callback(
+                lambda future: logger.info(
+                    f"Refreshed Python environments: {future.result()}"
+                )
+            )
 
         # Always refresh working directory
         self._working_directory = get_working_directory()
         logger.info(f"Refreshed working directory: {self._working_directory}")
 
+        # Symbol indexes belong to the previous workspace's environment
+        with self._search_indexes_lock:
+            self._search_indexes.clear()
+        self._dist_dirs = None
+
+    @property
+    def environments_ready(self) -> "Future[List[str]]":
+        """Future resolved with the Python environment paths once detected."""
+        return self._environments
+
+    @property
+    def _python_paths(self) -> List[str]:
+        """Python environment paths, waiting for detection to finish."""
+        try:
+            return self._environments.result(remaining_time())
+        except FutureTimeoutError:
+            raise ResourceLimitError(
+                "Python environment detection exceeded its time budget"
+            ) from None
+
+    def _distribution_dirs(self) -> List[str]:
+        """Get the directories to look up distributions in, in priority order.
+
+        Each environment path is searched together with its site-packages
+        directory, followed by the server's own sys.path.
+        """
+        if self._dist_dirs is None:
+            from .env_detection import get_site_packages_paths
+
+            dirs: List[str] = []
+            for env_path in self._python_paths:
+                for path in [env_path, *get_site_packages_paths([env_path])]:
+                    if path not in dirs:
+                        dirs.append(path)
+            self._dist_dirs = dirs
+
+        with _sys_path_lock:
+            extra = [path for path in sys.path if path and path not in self._dist_dirs]
+        return self._dist_dirs + extra
+
+    def _make_importable(self, module_path: str) -> None:
+        """Put the directory providing a module's top-level package on sys.path.
+
+        Locating packages never touches sys.path; this is only done right
+        before an environment's package is actually imported.
+        """
+        import_name = module_path.split(".")[0]
+        if import_name in sys.modules:
+            return
+
+        dist_dirs = self._distribution_dirs()
+        dist = find_distribution_by_import_name(
+            import_name, dist_dirs
+        ) or find_distribution(import_name, dist_dirs)
+        if dist is None:
+            return
+
+        directory = str(dist.site_packages)
+        with _sys_path_lock:
+            if directory not in sys.path:
+                # Prioritize the environment over the server's own packages
+                sys.path.insert(0, directory)
+
+    def resolve_import_name(self, package_name: str) -> str:
+        """Map a distribution name to the module it installs.
+
+        Lets callers pass either name (``PyYAML`` or ``yaml``) without a
+        failed import of the one that is not a module.
+
+        Args:
+            package_name: Distribution or import name
+
+        Returns:
+            Import name of the package
+        """
+        return resolve_import_name(package_name, self._distribution_dirs())
+
+    def _failure_key(self, lookup: str, *names: str) -> str:
+        """Get the negative cache key of a direct-import lookup."""
+        return ":".join(("direct", lookup, *names, os.pathsep.join(self._python_paths)))
+
+    def _record_direct_failure(self, key: str, message: str) -> None:
+        """Remember a lookup that direct import could not resolve.
+
+        The failure is forgotten once a searched site-packages directory
+        changes, i.e. when something is installed or removed.
+        """
+        record_failure(
+            key, "direct", "not_found", message, paths=self._distribution_dirs()
+        )
+
     @timeout(30)
     def get_package_info(
         self, package_name: str, version: Optional[str] = None
@@ -154,12 +324,22 @@ class PackageAnalyzer:
                     f"falling back to direct import"
                 )
 
+        failure_key = self._failure_key("pkg_info", package_name)
+        if get_failure(failure_key) is not None:
+            from .env_detection import get_searched_directories
+
+            logger.debug(f"Package {package_name} was not found recently")
+            raise PackageNotFoundError(
+                package_name, self._python_paths, get_searched_directories()
+            )
+
         versions = {}
         found = False
 
         # First, check if it's a built-in or standard library module
         try:
-            module = import_module(package_name)
+            with span("analyzer.import"):
+                module = import_module(package_name)
 
             # Check if it's a built-in module
             if package_name in sys.builtin_module_names:
@@ -207,70 +387,38 @@ class PackageAnalyzer:
         except (ImportError, ModuleNotFoundError):
             pass
 
-        # If not found as built-in/stdlib, search for installed packages
+        # If not found as built-in/stdlib, look it up in the distribution indexes
         if not found:
-            from .env_detection import get_site_packages_paths
-
-            # Get site-packages paths from python environment paths
-            site_packages = get_site_packages_paths(self._python_paths)
-
-            # Search in each environment
-            for env_path in self._python_paths:
-                # Temporarily add both the environment path and its site-packages to sys.path
-                paths_to_add = [env_path]
-
-                # Add corresponding site-packages if found
-                # Use proper path containment checking to avoid false positives
-                env_path_resolved = str(Path(env_path).resolve())
-                for sp in site_packages:
-                    sp_resolved = str(Path(sp).resolve())
-                    # Check if site-packages path is within the environment path
-                    if (
-                        sp_resolved.startswith(env_path_resolved + os.sep)
-                        or sp_resolved == env_path_resolved
-                    ):
-                        paths_to_add.append(sp)
-
-                # Insert paths at the beginning to prioritize this environment
-                inserted_count = 0
-                for p in paths_to_add:
-                    if p not in sys.path:
-                        sys.path.insert(inserted_count, p)
-                        inserted_count += 1
-
-                try:
-                    dist = metadata.distribution(package_name)
-                    found = True
-                    pkg_location = Path(dist.locate_file(""))
-
-                    logger.info(
-                        f"Found package '{package_name}' version {dist.metadata['Version']} "
-                        f"in environment: {env_path}"
-                    )
+            dist_dirs = self._distribution_dirs()
+            dist = find_distribution(
+                package_name, dist_dirs
+            ) or find_distribution_by_import_name(package_name, dist_dirs)
+            if dist is not None:
+                dist_metadata = dist.metadata()
+                found = True
 
-                    pkg_info = PackageInfo(
-                        name=dist.metadata["Name"],
-                        version=dist.metadata["Version"],
-                        summary=dist.metadata.get("Summary"),
-                        author=dist.metadata.get("Author"),
-                        license=dist.metadata.get("License"),
-                        location=pkg_location,
-                    )
-                    versions[pkg_info.version] = pkg_info
+                logger.info(
+                    f"Found package '{package_name}' version {dist_metadata['Version']} "
+                    f"in {dist.site_packages}"
+                )
 
-                    # Package found, break to keep these paths in sys.path for imports
-                    break
-                except metadata.PackageNotFoundError:
-                    # Remove the temporarily added paths if package not found here
-                    for _ in range(inserted_count):
-                        if sys.path:
-                            sys.path.pop(0)
-                    continue
+                pkg_info = PackageInfo(
+                    name=dist_metadata["Name"],
+                    version=dist_metadata["Version"],
+                    summary=dist_metadata.get("Summary"),
+                    author=dist_metadata.get("Author"),
+                    license=dist_metadata.get("License"),
+                    location=dist.site_packages,
+                )
+                versions[pkg_info.version] = pkg_info
 
         if not found:
             from .env_detection import get_searched_directories
 
             searched_dirs = get_searched_directories()
+            self._record_direct_failure(
+                failure_key, f"Package '{package_name}' not found"
+            )
             raise PackageNotFoundError(package_name, self._python_paths, searched_dirs)
 
         self._version_cache[package_name] = versions
@@ -306,9 +454,13 @@ class PackageAnalyzer:
         if cache_key in self._package_cache:
             return self._package_cache[cache_key]
 
+        check_deadline(f"Import of {module_path}")
+        self._make_importable(module_path)
+
         # Try to import directly first (for built-in modules)
         try:
-            module = import_module(module_path)
+            with span("analyzer.import"):
+                module = import_module(module_path)
 
             # Check if this is a built-in module or standard library
             if hasattr(module, "__file__") and module.__file__:
@@ -393,19 +545,25 @@ class PackageAnalyzer:
 
         # Fall back to direct import
         try:
-            module = self._import_module(package_name, version)
+            module = self._import_module(
+                self.resolve_import_name(package_name), version
+            )
             return module.__doc__
         except Exception as e:
             logger.warning(f"Failed to get docstring for {package_name}: {e}")
             return None
 
     @timeout(20)
-    def get_symbol_info(self, package_name: str, symbol_path: str) -> SymbolInfo:
+    def get_symbol_info(
+        self, package_name: str, symbol_path: str, detail: str = DEFAULT_DETAIL
+    ) -> SymbolInfo:
         """Get detailed information about a symbol in a package.
 
         Args:
             package_name: Name of the package containing the symbol
             symbol_path: Dot-separated path to the symbol (e.g., 'ClassName', 'ClassName.method', 'module.ClassName')
+            detail: How much to collect: "signature" (no docstring or method
+                summaries), "summary" (no source) or "full"
 
         Returns:
             SymbolInfo object containing symbol details
@@ -418,6 +576,7 @@ class PackageAnalyzer:
         # Validate inputs
         validate_package_name(package_name)
         validate_symbol_path(symbol_path)
+        validate_detail(detail)
 
         # Audit log the operation
         audit_log("get_symbol_info", package_name=package_name, symbol_path=symbol_path)
@@ -425,52 +584,170 @@ class PackageAnalyzer:
         # Try subprocess introspection first
         if self._subprocess_enabled:
             symbol_data = introspect_symbol(
-                package_name, symbol_path, self._working_directory
+                package_name, symbol_path, self._working_directory, detail=detail
             )
             if symbol_data and "error" not in symbol_data:
                 logger.info(
                     f"Using subprocess introspection for {package_name}.{symbol_path}"
                 )
-                # Convert methods list to MethodSummary objects
-                methods = None
-                if symbol_data.get("methods"):
-                    methods = [
-                        MethodSummary(
-                            name=m["name"],
-                            signature=m.get("signature"),
-                            doc_preview=m.get("doc_preview"),
-                        )
-                        for m in symbol_data["methods"]
-                    ]
-                return SymbolInfo(
-                    name=symbol_data["name"],
-                    qualname=symbol_data["qualname"],
-                    kind=symbol_data["kind"],
-                    module=symbol_data["module"],
-                    docstring=symbol_data.get("docstring"),
-                    signature=symbol_data.get("signature"),
-                    source=symbol_data.get("source"),
-                    methods=methods,
-                )
+                return self._symbol_info_from_data(symbol_data)
             else:
                 logger.debug(
                     f"Subprocess introspection not available for symbol, "
                     f"falling back to direct import"
                 )
 
+        return self._resolve_symbol_directly_cached(package_name, symbol_path, detail)
+
+    @timeout(30)
+    def get_symbols_info(
+        self, package_name: str, symbol_paths: List[str], detail: str = DEFAULT_DETAIL
+    ) -> Dict[str, SymbolInfo]:
+        """Get detailed information about several symbols at once.
+
+        All symbols are resolved in a single introspection round-trip, so
+        asking for many methods of one class costs one interpreter call
+        instead of one per symbol.
+
+        Args:
+            package_name: Name of the package containing the symbols
+            symbol_paths: Dot-separated paths to the symbols
+            detail: How much to collect for each symbol (see get_symbol_info)
+
+        Returns:
+            Dictionary mapping each resolved symbol path to its SymbolInfo.
+            Paths that cannot be resolved are omitted.
+
+        Raises:
+            ValidationError: If input validation fails
+        """
+        # Validate inputs
+        validate_package_name(package_name)
+        if not symbol_paths:
+            raise ValidationError("At least one symbol path is required")
+        if len(symbol_paths) > MAX_BATCH_SYMBOLS:
+            raise ValidationError(
+                f"Too many symbol paths: {len(symbol_paths)} > {MAX_BATCH_SYMBOLS}"
+            )
+        for symbol_path in symbol_paths:
+            validate_symbol_path(symbol_path)
+        validate_detail(detail)
+
+        # Audit log the operation
+        audit_log(
+            "get_symbols_info",
+            package_name=package_name,
+            symbol_paths=",".join(symbol_paths),
+        )
+
+        results: Dict[str, SymbolInfo] = {}
+
+        # Try subprocess introspection first
+        if self._subprocess_enabled:
+            symbols_data = introspect_symbols(
+                package_name, symbol_paths, self._working_directory, detail=detail
+            )
+            if symbols_data is not None:
+                logger.info(
+                    f"Using batched subprocess introspection for {package_name} "
+                    f"({len(symbols_data)}/{len(symbol_paths)} symbols resolved)"
+                )
+                for symbol_path, symbol_data in symbols_data.items():
+                    results[symbol_path] = self._symbol_info_from_data(symbol_data)
+            else:
+                logger.debug(
+                    f"Batched subprocess introspection not available, "
+                    f"falling back to direct import"
+                )
+
+        # Resolve whatever is left in-process
+        for symbol_path in symbol_paths:
+            if symbol_path in results:
+                continue
+            check_deadline(f"Symbol lookup in {package_name}")
+            try:
+                results[symbol_path] = self._resolve_symbol_directly_cached(
+                    package_name, symbol_path, detail
+                )
+            except (ImportError, SymbolNotFoundError) as e:
+                logger.debug(f"Could not resolve {package_name}.{symbol_path}: {e}")
+
+        return results
+
+    def _symbol_info_from_data(self, symbol_data: Dict) -> SymbolInfo:
+        """Build a SymbolInfo from introspection script output."""
+        # Convert methods list to MethodSummary objects
+        methods = None
+        if symbol_data.get("methods"):
+            methods = [
+                MethodSummary(
+                    name=m["name"],
+                    signature=m.get("signature"),
+                    doc_preview=m.get("doc_preview"),
+                )
+                for m in symbol_data["methods"]
+            ]
+        return SymbolInfo(
+            name=symbol_data["name"],
+            qualname=symbol_data["qualname"],
+            kind=symbol_data["kind"],
+            module=symbol_data["module"],
+            docstring=symbol_data.get("docstring"),
+            signature=symbol_data.get("signature"),
+            source=symbol_data.get("source"),
+            methods=methods,
+        )
+
+    def _resolve_symbol_directly_cached(
+        self, package_name: str, symbol_path: str, detail: str = DEFAULT_DETAIL
+    ) -> SymbolInfo:
+        """Resolve a symbol by direct import unless that failed recently.
+
+        Raises:
+            SymbolNotFoundError: If symbol cannot be found
+        """
+        failure_key = self._failure_key("symbol", package_name, symbol_path)
+        failure = get_failure(failure_key)
+        if failure is not None:
+            logger.debug(f"Symbol {package_name}.{symbol_path} was not found recently")
+            raise SymbolNotFoundError(symbol_path, failure.message)
+
+        try:
+            return self._resolve_symbol_directly(package_name, symbol_path, detail)
+        except SymbolNotFoundError as e:
+            self._record_direct_failure(failure_key, e.module_path)
+            raise
+
+    def _resolve_symbol_directly(
+        self, package_name: str, symbol_path: str, detail: str = DEFAULT_DETAIL
+    ) -> SymbolInfo:
+        """Resolve a symbol by importing it into this process.
+
+        Args:
+            package_name: Name of the package containing the symbol
+            symbol_path: Dot-separated path to the symbol
+            detail: How much to collect (see get_symbol_info)
+
+        Returns:
+            SymbolInfo object containing symbol details
+
+        Raises:
+            SymbolNotFoundError: If symbol cannot be found
+        """
         # Enhanced symbol resolution with multiple fallback strategies
         strategies = []
+        module_root = self.resolve_import_name(package_name)
 
         if "." in symbol_path:
             parts = symbol_path.split(".")
 
             # Strategy 1: Treat first part as module, rest as nested symbols
             strategies.append(
-                {"module_name": f"{package_name}.{parts[0]}", "symbol_parts": parts[1:]}
+                {"module_name": f"{module_root}.{parts[0]}", "symbol_parts": parts[1:]}
             )
 
             # Strategy 2: Treat entire path as nested symbols in main package
-            strategies.append({"module_name": package_name, "symbol_parts": parts})
+            strategies.append({"module_name": module_root, "symbol_parts": parts})
 
             # Strategy 3: Try progressive module resolution (for deep nesting)
             for i in range(1, len(parts)):
@@ -478,14 +755,14 @@ class PackageAnalyzer:
                 symbol_parts = parts[i:]
                 strategies.append(
                     {
-                        "module_name": f"{package_name}.{'.'.join(module_parts)}",
+                        "module_name": f"{module_root}.{'.'.join(module_parts)}",
                         "symbol_parts": symbol_parts,
                     }
                 )
         else:
             # Single symbol - try main package first
             strategies.append(
-                {"module_name": package_name, "symbol_parts": [symbol_path]}
+                {"module_name": module_root, "symbol_parts": [symbol_path]}
             )
 
         # Try each strategy until one succeeds
@@ -506,29 +783,13 @@ class PackageAnalyzer:
                             symbol_path, f"'{part}' not found in {full_path}"
                         )
 
-                # Determine the symbol kind
-                kind = self._get_symbol_kind(obj)
-
-                # Get the symbol's signature if applicable
-                signature = self._get_signature(obj)
-
-                # Get source code if available
-                source = self._get_source_code(obj)
-
-                # For classes, extract method summaries
-                methods = None
-                if kind == "class":
-                    methods = self._get_class_methods(obj)
-
-                return SymbolInfo(
-                    name=getattr(obj, "__name__", str(obj)),
-                    qualname=getattr(obj, "__qualname__", symbol_path),
-                    kind=kind,
-                    module=getattr(obj, "__module__", package_name),
-                    docstring=getattr(obj, "__doc__", None),
-                    signature=signature,
-                    source=source,
-                    methods=methods,
+                return self._symbol_info_from_object(
+                    obj,
+                    package_name,
+                    name=str(obj),
+                    qualname=symbol_path,
+                    include_source=detail == "full",
+                    include_methods=detail != "signature",
                 )
 
             except (ImportError, SymbolNotFoundError) as e:
@@ -548,6 +809,46 @@ class PackageAnalyzer:
                 symbol_path, f"No valid resolution strategy found for '{symbol_path}'"
             )
 
+    def _symbol_info_from_object(
+        self,
+        obj: Any,
+        package_name: str,
+        name: str,
+        qualname: str,
+        kind: Optional[str] = None,
+        include_source: bool = False,
+        include_methods: bool = False,
+    ) -> SymbolInfo:
+        """Build a SymbolInfo from an already imported object.
+
+        Args:
+            obj: The object to describe
+            package_name: Name of the package the object belongs to
+            name: Name to use if the object has no __name__
+            qualname: Qualified name to use if the object has no __qualname__
+            kind: Symbol kind; detected from the object if None
+            include_source: Whether to retrieve the source code
+            include_methods: Whether to summarize methods of classes
+
+        Returns:
+            SymbolInfo object describing obj
+        """
+        kind = kind or self._get_symbol_kind(obj)
+        return SymbolInfo(
+            name=getattr(obj, "__name__", name),
+            qualname=getattr(obj, "__qualname__", qualname),
+            kind=kind,
+            module=getattr(obj, "__module__", package_name),
+            docstring=getattr(obj, "__doc__", None),
+            signature=self._get_signature(obj),
+            source=self._get_source_code(obj) if include_source else None,
+            methods=(
+                self._get_class_methods(obj)
+                if include_methods and kind == "class"
+                else None
+            ),
+        )
+
     def _get_symbol_kind(self, obj: any) -> str:
         """Determine the kind of a Python object."""
         if inspect.ismodule(obj):
@@ -636,6 +937,72 @@ class PackageAnalyzer:
         except Exception:
             return None
 
+    def _extract_symbols_statically(
+        self,
+        package_name: str,
+        version: Optional[str] = None,
+        pattern: Optional[str] = None,
+    ) -> Optional[List[SymbolInfo]]:
+        """Collect a package's symbols by parsing its source files.
+
+        Args:
+            package_name: Name of the package to scan
+            version: Optional specific version to scan
+            pattern: Optional pattern to filter symbols; only applied when the
+                package has more than MAX_SCAN_SYMBOLS symbols
+
+        Returns:
+            List of SymbolInfo objects, or None if the package source cannot be
+            located, defines no symbols (e.g. C extensions) or re-exports names
+            whose definitions cannot be found statically
+        """
+        try:
+            location = self.get_package_info(package_name, version).location
+        except MCPyDocError as e:
+            logger.debug(f"Static analysis skipped for {package_name}: {e}")
+            return None
+
+        import_name = self.resolve_import_name(package_name)
+        source = find_package_source(import_name, location)
+        if source is None:
+            logger.debug(f"No Python source found for {package_name} in {location}")
+            return None
+
+        unresolved: List[str] = []
+        with span("analyzer.static_analysis"):
+            symbols_data = extract_symbols(import_name, source, unresolved=unresolved)
+        if unresolved:
+            logger.debug(
+                f"Static analysis of {package_name} cannot resolve re-exported "
+                f"names {unresolved[:5]}; falling back to import-based search"
+            )
+            return None
+        if not any(symbol["kind"] != "module" for symbol in symbols_data):
+            return None
+        if pattern and len(symbols_data) >= MAX_SCAN_SYMBOLS:
+            # Extraction stopped early, so filter while extracting instead
+            with span("analyzer.static_analysis"):
+                symbols_data = extract_symbols(import_name, source, pattern)
+
+        logger.info(
+            f"Using static analysis for indexing {package_name} "
+            f"(found {len(symbols_data)} symbols in {source})"
+        )
+        with span("models.symbol_info"):
+            return [
+                SymbolInfo(
+                    name=symbol_data["name"],
+                    qualname=symbol_data["qualname"],
+                    kind=symbol_data["kind"],
+                    module=symbol_data["module"],
+                    docstring=symbol_data.get("docstring"),
+                    signature=symbol_data.get("signature"),
+                    source=None,  # Source not included in search results
+                    decorators=symbol_data.get("decorators"),
+                )
+                for symbol_data in symbols_data
+            ]
+
     @timeout(45)
     @memory_limit(256)
     def search_symbols(
@@ -643,16 +1010,22 @@ class PackageAnalyzer:
         package_name: str,
         pattern: Optional[str] = None,
         version: Optional[str] = None,
+        include_source: bool = False,
     ) -> List[SymbolInfo]:
         """Search for symbols in a package matching an optional pattern.
 
+        The package's symbols are collected once into a SymbolSearchIndex;
+        later searches with any pattern are answered from that index.
+
         Args:
             package_name: Name of the package to search
             pattern: Optional pattern to filter symbols
             version: Optional specific version to search
+            include_source: If True, include source code in the results
+                (requires importing the package)
 
         Returns:
-            List of SymbolInfo objects matching the criteria
+            List of SymbolInfo objects matching the criteria, most relevant first
 
         Raises:
             ImportError: If package cannot be imported
@@ -673,7 +1046,184 @@ class PackageAnalyzer:
             version=version,
         )
 
-        # Try subprocess introspection first
+        index = self._search_index_for(package_name, pattern, version, include_source)
+        return index.search(pattern)
+
+    @timeout(45)
+    @memory_limit(256)
+    def search_symbols_page(
+        self,
+        package_name: str,
+        pattern: Optional[str] = None,
+        version: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[SymbolInfo], int]:
+        """Search for one page of symbols in a package.
+
+        Like search_symbols, but only the requested slice of the ranked results
+        is materialized, so callers can page through large packages.
+
+        Args:
+            package_name: Name of the package to search
+            pattern: Optional pattern to filter symbols
+            version: Optional specific version to search
+            offset: Number of leading results to skip
+            limit: Optional maximum number of results in the page
+
+        Returns:
+            Tuple of (SymbolInfo objects in the page, total number of matches)
+
+        Raises:
+            ImportError: If package cannot be imported
+            ValidationError: If input validation fails
+            ResourceLimitError: If resource limits are exceeded
+        """
+        validate_package_name(package_name)
+        if pattern is not None and len(pattern) > 100:
+            raise ValidationError(f"Search pattern too long: {len(pattern)} > 100")
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValidationError("Search offset and limit must not be negative")
+
+        audit_log(
+            "search_symbols_page",
+            package_name=package_name,
+            pattern=pattern,
+            version=version,
+            offset=offset,
+            limit=limit,
+        )
+
+        index = self._search_index_for(package_name, pattern, version)
+        return index.search_page(pattern, limit, offset)
+
+    def _search_index_for(
+        self,
+        package_name: str,
+        pattern: Optional[str] = None,
+        version: Optional[str] = None,
+        include_source: bool = False,
+    ) -> SymbolSearchIndex[SymbolInfo]:
+        """Get an index that holds every symbol matching a pattern.
+
+        This is the package's search index, unless collecting its symbols
+        stopped at MAX_SCAN_SYMBOLS: then the symbols matching the pattern
+        are collected by a scan of their own, as the index may lack some.
+        """
+        index = self._get_search_index(package_name, version, include_source)
+        if not pattern or len(index) < MAX_SCAN_SYMBOLS:
+            return index
+
+        increment("analyzer.pattern_scan")
+        logger.info(
+            f"{package_name} has more than {MAX_SCAN_SYMBOLS} symbols; "
+            f"scanning for {pattern!r}"
+        )
+        with span("analyzer.index_symbols"):
+            return index_symbols(
+                self.resolve_import_name(package_name),
+                self._collect_symbols(package_name, version, include_source, pattern),
+            )
+
+    def _get_search_index(
+        self,
+        package_name: str,
+        version: Optional[str] = None,
+        include_source: bool = False,
+    ) -> SymbolSearchIndex[SymbolInfo]:
+        """Get the search index of a package, building it on first use."""
+        cache_key = f"{package_name}@{version if version else 'latest'}"
+        if include_source:
+            cache_key += "+source"
+        with self._search_indexes_lock:
+            entry = self._search_indexes.get(cache_key)
+            if entry is not None:
+                self._search_indexes.move_to_end(cache_key)
+        if entry is not None and entry.is_valid():
+            increment("cache.search_index.hit")
+            logger.debug(f"Using search index for {package_name}")
+            cached: SymbolSearchIndex[SymbolInfo] = entry.value
+            return cached
+
+        increment("cache.search_index.miss")
+        # Stat the package's files before reading them, so that changes made
+        # while indexing invalidate the index
+        entry = CacheEntry.create(
+            None,
+            find_project_root(self._working_directory),
+            *self._index_dependencies(package_name, version),
+        )
+        with span("analyzer.index_symbols"):
+            # Symbol paths are relative to the module, not the distribution
+            index = index_symbols(
+                self.resolve_import_name(package_name),
+                self._collect_symbols(package_name, version, include_source),
+            )
+        entry.value = index
+        with self._search_indexes_lock:
+            self._search_indexes[cache_key] = entry
+            self._search_indexes.move_to_end(cache_key)
+            while len(self._search_indexes) > SEARCH_INDEX_CACHE_SIZE:
+                self._search_indexes.popitem(last=False)
+        logger.info(f"Indexed {len(index)} symbols of {package_name}")
+        return index
+
+    def _index_dependencies(
+        self, package_name: str, version: Optional[str] = None
+    ) -> List[str]:
+        """Get the directories whose change makes a package's index stale.
+
+        The site-packages directory changes when any distribution in it is
+        installed, upgraded or removed; the package directory when modules
+        are added or removed.
+        """
+        try:
+            location = self.get_package_info(package_name, version).location
+        except MCPyDocError:
+            return []
+        if location is None:
+            return []
+        paths = [str(location)]
+        source = find_package_source(self.resolve_import_name(package_name), location)
+        if source is not None and source != location:
+            paths.append(str(source))
+        return paths
+
+    def _collect_symbols(
+        self,
+        package_name: str,
+        version: Optional[str] = None,
+        include_source: bool = False,
+        pattern: Optional[str] = None,
+    ) -> List[SymbolInfo]:
+        """Collect the public symbols of a package for indexing.
+
+        Args:
+            package_name: Name of the package to scan
+            version: Optional specific version to scan
+            include_source: If True, scan by direct import so that source code
+                can be attached to each symbol
+            pattern: Optional pattern to filter symbols, for packages with
+                more symbols than a scan collects (MAX_SCAN_SYMBOLS)
+
+        Returns:
+            List of SymbolInfo objects, at most MAX_SCAN_SYMBOLS of them
+
+        Raises:
+            ImportError: If package cannot be imported
+        """
+        if include_source:
+            return self._scan_symbols_directly(package_name, version, True, pattern)
+
+        # Parse the package source first; nothing gets imported on this path
+        if self._static_analysis_enabled:
+            static_results = self._extract_symbols_statically(
+                package_name, version, pattern
+            )
+            if static_results is not None:
+                return static_results
+
+        # Try subprocess introspection next
         if self._subprocess_enabled:
             symbols_data = search_symbols_subprocess(
                 package_name, pattern, self._working_directory
@@ -683,9 +1233,8 @@ class PackageAnalyzer:
                     f"Using subprocess introspection for searching {package_name} "
                     f"(found {len(symbols_data)} symbols)"
                 )
-                results = []
-                for symbol_data in symbols_data:
-                    results.append(
+                with span("models.symbol_info"):
+                    return [
                         SymbolInfo(
                             name=symbol_data["name"],
                             qualname=symbol_data["qualname"],
@@ -695,20 +1244,54 @@ class PackageAnalyzer:
                             signature=symbol_data.get("signature"),
                             source=None,  # Source not included in search results
                         )
-                    )
-                return results
+                        for symbol_data in symbols_data
+                    ]
             else:
                 logger.debug(
                     f"Subprocess introspection not available for search, "
                     f"falling back to direct import"
                 )
 
-        results = []
+        return self._scan_symbols_directly(package_name, version, pattern=pattern)
+
+    def _scan_symbols_directly(
+        self,
+        package_name: str,
+        version: Optional[str] = None,
+        include_source: bool = False,
+        pattern: Optional[str] = None,
+    ) -> List[SymbolInfo]:
+        """Collect a package's symbols by importing it into this process.
+
+        Each module is walked once and SymbolInfo objects are built from the
+        members already in hand.
+
+        Args:
+            package_name: Name of the package to scan
+            version: Optional specific version to scan
+            include_source: Whether to retrieve source code for every symbol
+            pattern: Optional pattern the symbols' paths must contain
+
+        Returns:
+            List of SymbolInfo objects, at most MAX_SCAN_SYMBOLS of them
+
+        Raises:
+            ImportError: If package cannot be imported
+        """
+        results: List[SymbolInfo] = []
+        pattern_lower = (pattern or "").lower()
+        package_name = self.resolve_import_name(package_name)
         logger.info(f"Starting symbol search for package: {package_name}")
         package = self._import_module(package_name, version)
         logger.info(f"Successfully imported {package_name}, module: {package.__name__}")
 
+        # Modules already scanned (packages often import their own submodules
+        # from several places, e.g. json.tool imports json)
+        scanned_modules = {package.__name__}
+
         def _scan_module(module: ModuleType, prefix: str = "") -> None:
+            check_deadline(f"Symbol scan of {package_name}")
+
             # Get all module contents, both direct and imported
             members = inspect.getmembers(module)
             logger.debug(
@@ -727,115 +1310,80 @@ class PackageAnalyzer:
                     # Skip if symbol is from a different package entirely
                     if not obj_module.startswith(package_name):
                         continue
+                elif inspect.ismodule(obj) and not obj.__name__.startswith(
+                    f"{package_name}."
+                ):
+                    # Modules have no __module__; skip the package itself and
+                    # unrelated modules imported by it
+                    continue
 
                 full_name = f"{prefix}{name}" if prefix else name
 
-                # If a pattern is provided, check if it matches
-                if pattern and pattern.lower() not in full_name.lower():
-                    continue
-
+                # Describe the object we already hold instead of resolving
+                # full_name again through get_symbol_info
                 try:
-                    # Try to get symbol info
-                    # For root level, first try the simple name
-                    if not prefix:
-                        try:
-                            info = self.get_symbol_info(package_name, name)
-                        except (SymbolNotFoundError, AttributeError):
-                            # If that fails and object has __module__, try the full path
-                            if (
-                                hasattr(obj, "__module__")
-                                and obj.__module__ != package_name
-                            ):
-                                # Construct the path from the module
-                                module_suffix = obj.__module__[
-                                    len(package_name) :
-                                ].lstrip(".")
-                                if module_suffix:
-                                    full_path = f"{module_suffix}.{name}"
-                                    info = self.get_symbol_info(package_name, full_path)
-                                else:
-                                    raise
-                            else:
-                                raise
-                    else:
-                        info = self.get_symbol_info(package_name, full_name)
-                    results.append(info)
-                except (ImportError, SymbolNotFoundError, AttributeError) as e:
+                    if pattern_lower in full_name.lower():
+                        results.append(
+                            self._symbol_info_from_object(
+                                obj,
+                                package_name,
+                                name=name,
+                                qualname=full_name,
+                                include_source=include_source,
+                            )
+                        )
+                except Exception as e:
                     # Log the error for debugging but continue scanning
-                    logger.debug(f"Could not get symbol info for {full_name}: {e}")
+                    logger.debug(f"Could not describe {full_name}: {e}")
                     continue
 
-                # Search for methods within classes
+                # Methods, class methods and static methods defined on classes
                 if inspect.isclass(obj):
                     for method_name, method_obj in inspect.getmembers(
-                        obj, inspect.ismethod
+                        obj, _is_method_like
                     ):
                         if method_name.startswith("_"):
                             continue
-
-                        method_full_name = f"{full_name}.{method_name}"
-
-                        # Check pattern match for methods
-                        if pattern and pattern.lower() not in method_name.lower():
+                        if pattern_lower not in f"{full_name}.{method_name}".lower():
                             continue
 
                         try:
-                            method_info = SymbolInfo(
-                                name=method_name,
-                                qualname=f"{obj.__name__}.{method_name}",
-                                kind="method",
-                                module=getattr(obj, "__module__", package_name),
-                                docstring=getattr(method_obj, "__doc__", None),
-                                signature=self._get_signature(method_obj),
-                                source=self._get_source_code(method_obj),
+                            results.append(
+                                SymbolInfo(
+                                    name=method_name,
+                                    qualname=f"{obj.__name__}.{method_name}",
+                                    kind="method",
+                                    module=getattr(obj, "__module__", package_name),
+                                    docstring=getattr(method_obj, "__doc__", None),
+                                    signature=self._get_signature(method_obj),
+                                    source=(
+                                        self._get_source_code(method_obj)
+                                        if include_source
+                                        else None
+                                    ),
+                                )
                             )
-                            results.append(method_info)
-                        except Exception:
-                            continue
-
-                    # Also search for functions within classes (static methods, class methods)
-                    for func_name, func_obj in inspect.getmembers(
-                        obj, inspect.isfunction
-                    ):
-                        if func_name.startswith("_"):
-                            continue
-
-                        # Check pattern match for functions
-                        if pattern and pattern.lower() not in func_name.lower():
-                            continue
-
-                        try:
-                            func_info = SymbolInfo(
-                                name=func_name,
-                                qualname=f"{obj.__name__}.{func_name}",
-                                kind="method",
-                                module=getattr(obj, "__module__", package_name),
-                                docstring=getattr(func_obj, "__doc__", None),
-                                signature=self._get_signature(func_obj),
-                                source=self._get_source_code(func_obj),
-                            )
-                            results.append(func_info)
                         except Exception:
                             continue
 
                 # Recursively scan submodules
                 if (
                     inspect.ismodule(obj)
-                    and obj.__name__.startswith(package_name)
-                    and len(results) < 1000  # Prevent infinite recursion
+                    and obj.__name__ not in scanned_modules
+                    and len(results) < MAX_SCAN_SYMBOLS  # Prevent runaway scans
                 ):
+                    scanned_modules.add(obj.__name__)
                     _scan_module(obj, prefix=f"{full_name}." if prefix else f"{name}.")
 
         _scan_module(package)
 
         # Explicitly discover and scan submodules that aren't imported in __init__.py
         # This is crucial for packages like fido2 where classes are in submodules
-        if hasattr(package, "__path__") and len(results) < 1000:
+        if hasattr(package, "__path__") and len(results) < MAX_SCAN_SYMBOLS:
             logger.info(f"Discovering submodules for {package_name}")
             try:
                 import pkgutil
 
-                scanned_modules = {package.__name__}  # Track what we've scanned
                 submodule_count = 0
 
                 for importer, modname, ispkg in pkgutil.iter_modules(
@@ -844,7 +1392,10 @@ class PackageAnalyzer:
                     submodule_count += 1
                     logger.info(f"Found submodule: {modname}")
 
-                    if modname not in scanned_modules and len(results) < 1000:
+                    if (
+                        modname not in scanned_modules
+                        and len(results) < MAX_SCAN_SYMBOLS
+                    ):
                         try:
                             # Import the submodule
                             logger.info(f"Importing submodule: {modname}")
@@ -864,6 +1415,8 @@ class PackageAnalyzer:
                             logger.info(
                                 f"Submodule {modname} yielded {after_count - before_count} symbols"
                             )
+                        except ResourceLimitError:
+                            raise
                         except Exception as e:
                             logger.error(
                                 f"Failed to scan submodule {modname}: {type(e).__name__}: {e}",
@@ -874,6 +1427,8 @@ class PackageAnalyzer:
                 logger.info(
                     f"Discovered {submodule_count} submodules for {package_name}, total results: {len(results)}"
                 )
+            except ResourceLimitError:
+                raise
             except Exception as e:
                 logger.error(
                     f"Failed to discover submodules for {package_name}: {type(e).__name__}: {e}",
@@ -0,0 +1,91 @@
+"""Request deadlines for MCPyDoc.
+
+Timeouts used to be enforced with a process-wide ``SIGALRM`` handler, which
+only fires on the main thread and is reset by any nested timed call. A
+deadline is instead stored in a context variable: it follows the request into
+executor threads (``contextvars.copy_context``), nested scopes can only
+shorten it, and long-running code checks it cooperatively between units of
+work. Subprocess calls cap their own timeouts with the time remaining.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, overload
+
+from .exceptions import ResourceLimitError
+
+# Absolute time.monotonic() deadline of the current request, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("mcpydoc_deadline", default=None)
+
+
+def get_deadline() -> Optional[float]:
+    """Get the current deadline as a time.monotonic() value, or None."""
+    return _deadline.get()
+
+
+@overload
+def remaining_time(default: float) -> float: ...
+
+
+@overload
+def remaining_time(default: None = None) -> Optional[float]: ...
+
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """Get the seconds left before the current deadline.
+
+    Args:
+        default: Budget to use (and cap at) when computing a timeout, e.g.
+            the usual timeout of a subprocess call
+
+    Returns:
+        Seconds remaining (never negative), capped by default; default itself
+        if no deadline is set
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    remaining = max(0.0, deadline - time.monotonic())
+    return remaining if default is None else min(default, remaining)
+
+
+def check_deadline(operation: str = "Operation") -> None:
+    """Raise if the current deadline has passed.
+
+    Args:
+        operation: Name of the running operation, used in the error message
+
+    Raises:
+        ResourceLimitError: If the deadline has expired
+    """
+    deadline = _deadline.get()
+    if deadline is not None and time.monotonic() >= deadline:
+        raise ResourceLimitError(f"{operation} exceeded its time budget")
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """Run a block under a deadline.
+
+    A scope never extends an enclosing deadline; it only shortens it.
+
+    Args:
+        seconds: Time budget for the block, or None to keep the current one
+
+    Yields:
+        The effective deadline as a time.monotonic() value, or None
+    """
+    current = _deadline.get()
+    if seconds is None:
+        yield current
+        return
+
+    deadline = time.monotonic() + seconds
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
@@ -0,0 +1,279 @@
+"""Per-directory distribution index for MCPyDoc.
+
+Locating an installed package used to prepend each environment's directories
+to the global ``sys.path`` and call ``metadata.distribution``, which rescans
+every path entry per lookup and left the paths of the environment it found
+behind. This module lists each site-packages directory once into an index of
+normalized distribution name -> dist-info directory, version and top-level
+import names. Lookups are dictionary hits without ``sys.path`` side effects,
+and an index is rebuilt only when its directory's mtime changes (installing
+or removing a distribution adds or removes a directory entry).
+
+The index also maps between distribution and import names in both directions
+(``PyYAML`` <-> ``yaml``, ``scikit-learn`` <-> ``sklearn``), from top_level.txt
+or, for distributions built without one, the installed files listed in RECORD.
+"""
+
+import csv
+import logging
+import os
+import re
+import threading
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .static_analysis import EXTENSION_SUFFIXES
+
+logger = logging.getLogger(__name__)
+
+# "<name>-<version>.dist-info" and "<name>-<version>[-pyX.Y].egg-info"
+_METADATA_DIR_PATTERN = re.compile(
+    r"^(?P<name>.+?)-(?P<version>[^-]+?)(?:-py\d[^-]*(?:-.+)?)?\.(?:dist|egg)-info$"
+)
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name as in PEP 503 (``Foo.Bar_baz`` -> ``foo-bar-baz``)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _record_top_level(record: str) -> List[str]:
+    """Derive top-level import names from the file list of a RECORD file."""
+    names: List[str] = []
+    for row in csv.reader(record.splitlines()):
+        if not row:
+            continue
+        parts = row[0].replace("\\", "/").split("/")
+        first = parts[0]
+        if first in ("", "..", "__pycache__") or first.endswith(
+            (".dist-info", ".egg-info", ".data")
+        ):
+            continue
+        if len(parts) > 1:
+            name = first
+        elif first.endswith(".py"):
+            name = first[:-3]
+        elif first.endswith(EXTENSION_SUFFIXES):
+            # "_cffi_backend.cpython-311-x86_64-linux-gnu.so" -> "_cffi_backend"
+            name = first.split(".")[0]
+        else:
+            continue
+        if name.isidentifier() and name not in names:
+            names.append(name)
+    return names
+
+
+def _mtime_ns(directory: Union[str, Path]) -> Optional[int]:
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+class InstalledDistribution:
+    """A distribution installed in an indexed directory."""
+
+    __slots__ = ("name", "version", "path", "site_packages", "_top_level")
+
+    def __init__(self, name: str, version: str, path: Path, site_packages: Path):
+        """Initialize the distribution.
+
+        Args:
+            name: Distribution name as spelled in the metadata directory name
+            version: Version from the metadata directory name
+            path: The ``.dist-info`` / ``.egg-info`` directory
+            site_packages: Directory the distribution is installed in
+        """
+        self.name = name
+        self.version = version
+        self.path = path
+        self.site_packages = site_packages
+        self._top_level: Optional[List[str]] = None
+
+    def _read(self, filename: str) -> str:
+        try:
+            return (self.path / filename).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return ""
+
+    @property
+    def top_level(self) -> List[str]:
+        """Top-level import names, read on first use.
+
+        Taken from top_level.txt, or from RECORD for distributions built
+        without one (most non-setuptools backends), else guessed from the
+        distribution name.
+        """
+        if self._top_level is None:
+            text = self._read("top_level.txt")
+            names = [line.strip() for line in text.splitlines() if line.strip()]
+            self._top_level = (
+                names
+                or _record_top_level(self._read("RECORD"))
+                or [normalize_name(self.name).replace("-", "_")]
+            )
+        return self._top_level
+
+    @property
+    def import_name(self) -> str:
+        """The module to import for this distribution (``PyYAML`` -> ``yaml``).
+
+        Among several top-level names, the one matching the distribution name
+        wins, then the first public one.
+        """
+        names = self.top_level
+        normalized = normalize_name(self.name).replace("-", "_")
+        for name in names:
+            if name.lower() == normalized:
+                return name
+        public = [name for name in names if not name.startswith("_")]
+        return (public or names)[0]
+
+    def metadata(self) -> Dict[str, str]:
+        """Read the distribution's core metadata (a single file).
+
+        Returns:
+            The first value of each field, e.g. ``Name`` and ``Version``
+        """
+        fields = metadata.Distribution.at(self.path).metadata
+        return {field: fields[field] for field in fields}
+
+
+class DistributionIndex:
+    """Distributions of one directory, built from a single listing."""
+
+    def __init__(self, directory: Path) -> None:
+        """Index a directory.
+
+        Args:
+            directory: site-packages (or any sys.path-style) directory
+        """
+        self.directory = directory
+        self.mtime_ns = _mtime_ns(directory)
+        self.distributions: Dict[str, InstalledDistribution] = {}
+        self._by_import_name: Optional[Dict[str, InstalledDistribution]] = None
+        self._lock = threading.Lock()
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    match = _METADATA_DIR_PATTERN.match(entry.name)
+                    if match is None or not entry.is_dir():
+                        continue
+                    key = normalize_name(match.group("name"))
+                    # A .dist-info wins over a stale .egg-info of the same name
+                    if key in self.distributions and entry.name.endswith(".egg-info"):
+                        continue
+                    self.distributions[key] = InstalledDistribution(
+                        match.group("name"),
+                        match.group("version"),
+                        Path(entry.path),
+                        directory,
+                    )
+        except OSError as e:
+            logger.debug(f"Could not list {directory}: {e}")
+
+    def get(self, name: str) -> Optional[InstalledDistribution]:
+        """Look up a distribution by (unnormalized) name."""
+        return self.distributions.get(normalize_name(name))
+
+    def by_import_name(self, import_name: str) -> Optional[InstalledDistribution]:
+        """Look up the distribution providing a top-level module.
+
+        The reverse map is built on first use, reading each top_level.txt once.
+        """
+        with self._lock:
+            if self._by_import_name is None:
+                mapping: Dict[str, InstalledDistribution] = {}
+                for dist in self.distributions.values():
+                    for name in dist.top_level:
+                        mapping.setdefault(name, dist)
+                self._by_import_name = mapping
+        return self._by_import_name.get(import_name)
+
+
+_indexes: Dict[str, DistributionIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(directory: Union[str, Path]) -> DistributionIndex:
+    """Get the index of a directory, rebuilding it if the directory changed.
+
+    Args:
+        directory: Directory to index
+
+    Returns:
+        Up-to-date DistributionIndex
+    """
+    key = str(directory)
+    with _indexes_lock:
+        index = _indexes.get(key)
+    if index is not None and index.mtime_ns == _mtime_ns(directory):
+        return index
+
+    index = DistributionIndex(Path(directory))
+    with _indexes_lock:
+        _indexes[key] = index
+    return index
+
+
+def find_distribution(
+    name: str, directories: Iterable[Union[str, Path]]
+) -> Optional[InstalledDistribution]:
+    """Find an installed distribution by name.
+
+    Args:
+        name: Distribution name (any spelling, e.g. ``Typing_Extensions``)
+        directories: Directories to search, in priority order
+
+    Returns:
+        The first matching distribution, or None
+    """
+    for directory in directories:
+        dist = get_index(directory).get(name)
+        if dist is not None:
+            return dist
+    return None
+
+
+def find_distribution_by_import_name(
+    import_name: str, directories: Iterable[Union[str, Path]]
+) -> Optional[InstalledDistribution]:
+    """Find the installed distribution providing a top-level module.
+
+    Args:
+        import_name: Top-level module name, e.g. ``yaml``
+        directories: Directories to search, in priority order
+
+    Returns:
+        The first distribution listing the module, or None
+    """
+    for directory in directories:
+        dist = get_index(directory).by_import_name(import_name)
+        if dist is not None:
+            return dist
+    return None
+
+
+def resolve_import_name(name: str, directories: Iterable[Union[str, Path]]) -> str:
+    """Map a distribution name to the module it installs.
+
+    Args:
+        name: Distribution name (``PyYAML``) or import name (``yaml``)
+        directories: Directories to search, in priority order
+
+    Returns:
+        The import name of the named distribution; other names, including
+        import names and standard library modules, are returned unchanged
+    """
+    dist = find_distribution(name, directories)
+    if dist is None or name in dist.top_level:
+        return name
+    return dist.import_name
+
+
+def clear_indexes() -> None:
+    """Drop all directory indexes."""
+    with _indexes_lock:
+        _indexes.clear()
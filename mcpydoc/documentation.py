@@ -1,19 +1,60 @@
 """Documentation parsing and formatting functionality."""
 
-from typing import Optional
+import hashlib
+import inspect
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
 
 from docstring_parser import parse
 from docstring_parser.common import ParseError
 
 from .models import DocumentationInfo
 
+logger = logging.getLogger(__name__)
+
+# Default number of parsed docstrings kept in memory
+DEFAULT_DOCSTRING_CACHE_SIZE = 4096
+
 
 class DocumentationParser:
     """Parses and formats Python docstrings."""
 
+    def __init__(self, cache_size: Optional[int] = None) -> None:
+        """Initialize the parser.
+
+        Args:
+            cache_size: Maximum number of parsed docstrings to keep (0 disables
+                caching). If None, uses MCPYDOC_DOCSTRING_CACHE_SIZE or
+                DEFAULT_DOCSTRING_CACHE_SIZE.
+        """
+        if cache_size is None:
+            value = os.environ.get(
+                "MCPYDOC_DOCSTRING_CACHE_SIZE", str(DEFAULT_DOCSTRING_CACHE_SIZE)
+            )
+            try:
+                cache_size = int(value)
+            except ValueError:
+                logger.warning(
+                    f"Ignoring invalid MCPYDOC_DOCSTRING_CACHE_SIZE: {value!r}"
+                )
+                cache_size = DEFAULT_DOCSTRING_CACHE_SIZE
+        self.cache_size = max(0, cache_size)
+        # Parsed docstrings keyed by content hash, least recently used first.
+        # DocumentationInfo is frozen, so cached results are shared as-is.
+        self._cache: "OrderedDict[bytes, DocumentationInfo]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def parse_docstring(self, docstring: Optional[str]) -> DocumentationInfo:
         """Parse a docstring into structured documentation.
 
+        Results are cached by docstring content, so identical docstrings
+        (e.g. inherited by many classes) are parsed once.
+
         Args:
             docstring: The docstring to parse
 
@@ -23,6 +64,67 @@ class DocumentationParser:
         if not docstring:
             return DocumentationInfo()
 
+        if not self.cache_size:
+            return self._parse_uncached(docstring)
+
+        key = hashlib.blake2b(
+            docstring.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+
+        documentation = self._parse_uncached(docstring)
+
+        with self._cache_lock:
+            self._cache[key] = documentation
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return documentation
+
+    def summarize_docstring(self, docstring: Optional[str]) -> DocumentationInfo:
+        """Get the short description of a docstring without parsing it.
+
+        Used for "summary" detail responses, which only show the description.
+
+        Args:
+            docstring: The docstring to summarize
+
+        Returns:
+            DocumentationInfo with only the description (first paragraph) set
+        """
+        if not docstring:
+            return DocumentationInfo()
+        first_paragraph = inspect.cleandoc(docstring).split("\n\n")[0]
+        return DocumentationInfo(description=" ".join(first_paragraph.split()) or None)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Get docstring cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, current size and maximum size
+        """
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+            }
+
+    def clear_cache(self) -> None:
+        """Drop all cached docstrings and reset the counters."""
+        with self._cache_lock:
+            self._cache.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
+
+    def _parse_uncached(self, docstring: str) -> DocumentationInfo:
+        """Parse a docstring without consulting the cache."""
         try:
             parsed = parse(docstring)
             return self._build_documentation_info(parsed)
@@ -157,7 +157,7 @@ def get_client_roots_environment() -> Optional[str]:
         # Import the module (not the variable) to get the current value
         from . import subprocess_introspection
 
-        client_working_dir = subprocess_introspection._client_working_directory
+        client_working_dir = subprocess_introspection.client_working_directory()
 
         if client_working_dir is not None:
             logger.debug(f"Checking client root for venv: {client_working_dir}")
@@ -423,10 +423,9 @@ def get_active_python_environments(use_cache: bool = True) -> List[str]:
         try:
             from . import subprocess_introspection
 
-            if subprocess_introspection._client_working_directory is not None:
-                _searched_directories.append(
-                    str(subprocess_introspection._client_working_directory)
-                )
+            client_working_dir = subprocess_introspection.client_working_directory()
+            if client_working_dir is not None:
+                _searched_directories.append(str(client_working_dir))
         except ImportError:
             pass
 
@@ -521,7 +520,8 @@ def get_active_python_environments(use_cache: bool = True) -> List[str]:
 
     logger.info(f"Python environment search order: {unique_paths}")
 
-    # Cache the results
-    _environment_cache = unique_paths
+    # Cache the results, unless they include a workspace's own environment
+    if client_roots_env is None:
+        _environment_cache = unique_paths
 
     return unique_paths
@@ -0,0 +1,458 @@
+"""Streamable HTTP transport for the MCPyDoc MCP server.
+
+Opt-in: with MCPYDOC_HTTP_PORT set, the server listens on
+``http://127.0.0.1:<port>/mcp`` instead of stdio, so one warm process serves
+every editor window and agent. It follows the MCP streamable HTTP transport:
+
+- ``POST /mcp`` carries a JSON-RPC message (or a batch of them). Requests are
+  answered in an ``application/json`` body; notifications and responses get
+  ``202 Accepted``. The ``initialize`` request opens a session, and its
+  response carries an ``Mcp-Session-Id`` header that the client repeats on
+  every later request.
+- ``GET /mcp`` opens the session's server-sent event stream, which delivers
+  the server's own requests to the client (``roots/list``).
+- ``DELETE /mcp`` ends the session.
+
+Sessions a client abandons without DELETE are closed after
+MCPYDOC_HTTP_SESSION_TIMEOUT seconds without requests or an open event
+stream. At most MCPYDOC_HTTP_MAX_SESSIONS sessions are open at once; beyond
+that, initialize closes the least recently active idle session, or is
+refused if every session is busy.
+
+Each session is an MCPServer with its own capabilities, roots and pending
+requests. All sessions draw from one workspace pool, so sessions working in
+the same workspace share its documentation server and caches (see
+workspaces.py). The endpoint binds to localhost
+unless MCPYDOC_HTTP_HOST says otherwise and has no authentication; requests
+from web pages of other origins are refused (DNS rebinding).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import secrets
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .mcp_server import MCPServer, configured_max_concurrency
+from .metrics import increment
+from .metrics_exporter import Gauges
+from .worker_pool import active_worker_count, queued_request_count
+from .workspaces import WorkspacePool
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HTTP_HOST = "127.0.0.1"
+
+MCP_PATH = "/mcp"
+
+SESSION_HEADER = "Mcp-Session-Id"
+
+# Seconds between comments keeping idle event streams (and proxies) alive
+KEEPALIVE_INTERVAL = 15.0
+
+DEFAULT_SESSION_TIMEOUT = 1800.0
+
+DEFAULT_MAX_SESSIONS = 64
+
+# Seconds between sweeps for idle sessions
+SESSION_SWEEP_INTERVAL = 60.0
+
+# Origins of local pages, which may use the endpoint
+_LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+def http_port() -> Optional[int]:
+    """Get the port of the HTTP transport (MCPYDOC_HTTP_PORT), or None."""
+    value = os.environ.get("MCPYDOC_HTTP_PORT")
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid MCPYDOC_HTTP_PORT: {value!r}")
+        return None
+
+
+def http_host() -> str:
+    """Get the bind address of the HTTP transport (MCPYDOC_HTTP_HOST)."""
+    return os.environ.get("MCPYDOC_HTTP_HOST", DEFAULT_HTTP_HOST)
+
+
+def session_timeout() -> float:
+    """Get the idle time in seconds after which sessions are closed
+    (MCPYDOC_HTTP_SESSION_TIMEOUT)."""
+    value = os.environ.get("MCPYDOC_HTTP_SESSION_TIMEOUT", str(DEFAULT_SESSION_TIMEOUT))
+    try:
+        return max(1.0, float(value))
+    except ValueError:
+        logger.warning(f"Ignoring invalid MCPYDOC_HTTP_SESSION_TIMEOUT: {value!r}")
+        return DEFAULT_SESSION_TIMEOUT
+
+
+def max_sessions() -> int:
+    """Get the number of sessions open at once (MCPYDOC_HTTP_MAX_SESSIONS)."""
+    value = os.environ.get("MCPYDOC_HTTP_MAX_SESSIONS", str(DEFAULT_MAX_SESSIONS))
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f"Ignoring invalid MCPYDOC_HTTP_MAX_SESSIONS: {value!r}")
+        return DEFAULT_MAX_SESSIONS
+
+
+class HTTPSession(MCPServer):
+    """One client's session on the HTTP transport."""
+
+    def __init__(
+        self,
+        session_id: str,
+        workspaces: WorkspacePool,
+        max_concurrency: Optional[int] = None,
+        request_timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the session.
+
+        Args:
+            session_id: Value of the session's Mcp-Session-Id header
+            workspaces: Documentation servers shared between sessions
+            max_concurrency: Maximum number of this session's tool calls
+                executing at once
+            request_timeout: Time budget in seconds for each tool call
+        """
+        super().__init__(
+            max_concurrency=max_concurrency,
+            request_timeout=request_timeout,
+            workspaces=workspaces,
+        )
+        self.session_id = session_id
+        # Server-initiated messages for the event stream; None closes it
+        self.outbox: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        self.stream_open = False
+        self.last_active = time.monotonic()
+
+    @property
+    def is_idle(self) -> bool:
+        """Whether the session has no event stream and no tool call running."""
+        return not self.stream_open and self.active_tool_calls == 0
+
+    def touch(self) -> None:
+        """Record activity, postponing the session's idle timeout."""
+        self.last_active = time.monotonic()
+
+    def _write_message(self, message: str) -> None:
+        """Queue a server-initiated message for the session's event stream."""
+        self.outbox.put_nowait(message)
+
+    def close(self) -> None:
+        """End the session and its event stream."""
+        if self._prewarmer is not None:
+            self._prewarmer.shutdown()
+        self.outbox.put_nowait(None)
+
+
+def _error_body(code: int, message: str) -> str:
+    return json.dumps(
+        {"jsonrpc": "2.0", "id": None, "error": {"code": code, "message": message}}
+    )
+
+
+class HTTPTransport:
+    """Serves MCP client sessions over streamable HTTP."""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        request_timeout: Optional[float] = None,
+        max_open_sessions: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the transport.
+
+        Args:
+            max_concurrency: Maximum number of tool calls of each session
+                executing at once (and analyzer threads of each workspace).
+                If None, uses MCPYDOC_MAX_CONCURRENCY or MAX_CONCURRENT_REQUESTS.
+            request_timeout: Time budget in seconds for each tool call. If None,
+                uses MCPYDOC_REQUEST_TIMEOUT or MAX_REQUEST_TIME_SECONDS.
+            max_open_sessions: Maximum number of open sessions. If None, uses
+                MCPYDOC_HTTP_MAX_SESSIONS or DEFAULT_MAX_SESSIONS.
+            idle_timeout: Seconds without requests or event stream after which
+                a session is closed. If None, uses MCPYDOC_HTTP_SESSION_TIMEOUT
+                or DEFAULT_SESSION_TIMEOUT.
+        """
+        self._max_concurrency = configured_max_concurrency(max_concurrency)
+        self._request_timeout = request_timeout
+        self._max_sessions = (
+            max_open_sessions if max_open_sessions is not None else max_sessions()
+        )
+        self._idle_timeout = (
+            idle_timeout if idle_timeout is not None else session_timeout()
+        )
+        self.workspaces = WorkspacePool(max_workers=self._max_concurrency)
+        self.sessions: Dict[str, HTTPSession] = {}
+        self._sweeper: Optional["asyncio.Task[None]"] = None
+
+    def _check_origin(self, request: "web.Request") -> None:
+        """Refuse browser requests from pages that are not served locally."""
+        from aiohttp import web
+
+        origin = request.headers.get("Origin")
+        if origin is not None and urlsplit(origin).hostname not in _LOCAL_HOSTS:
+            logger.warning(f"Refused HTTP request from origin {origin}")
+            raise web.HTTPForbidden(
+                text=_error_body(-32000, "Origin not allowed"),
+                content_type="application/json",
+            )
+
+    def _find_session(self, request: "web.Request") -> HTTPSession:
+        """Get the session a request belongs to.
+
+        Raises:
+            HTTPBadRequest: If the request has no session header
+            HTTPNotFound: If the session is unknown or has ended; the client
+                starts over with initialize
+        """
+        from aiohttp import web
+
+        session_id = request.headers.get(SESSION_HEADER)
+        if session_id is None:
+            raise web.HTTPBadRequest(
+                text=_error_body(-32000, f"Missing {SESSION_HEADER} header"),
+                content_type="application/json",
+            )
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise web.HTTPNotFound(
+                text=_error_body(-32001, "Session not found"),
+                content_type="application/json",
+            )
+        session.touch()
+        return session
+
+    def _close_session(self, session: HTTPSession, reason: str) -> None:
+        self.sessions.pop(session.session_id, None)
+        session.close()
+        increment("http.sessions_closed", reason=reason)
+        logger.info(f"Closed HTTP session {session.session_id} ({reason})")
+
+    def expire_sessions(self) -> None:
+        """Close sessions that have been idle longer than the idle timeout."""
+        cutoff = time.monotonic() - self._idle_timeout
+        for session in list(self.sessions.values()):
+            if session.is_idle and session.last_active < cutoff:
+                self._close_session(session, "idle")
+
+    async def _sweep_sessions(self) -> None:
+        """Expire idle sessions periodically while serving."""
+        while True:
+            await asyncio.sleep(min(SESSION_SWEEP_INTERVAL, self._idle_timeout))
+            self.expire_sessions()
+
+    def _open_session(self) -> HTTPSession:
+        """Open a session, making room under the session limit.
+
+        Raises:
+            HTTPServiceUnavailable: If the limit is reached and every session
+                has an event stream or a tool call running
+        """
+        from aiohttp import web
+
+        self.expire_sessions()
+        while len(self.sessions) >= self._max_sessions:
+            idle = [s for s in self.sessions.values() if s.is_idle]
+            if not idle:
+                logger.warning(
+                    f"Refused HTTP session: {len(self.sessions)} sessions are busy"
+                )
+                raise web.HTTPServiceUnavailable(
+                    text=_error_body(-32000, "Too many open sessions"),
+                    content_type="application/json",
+                )
+            self._close_session(min(idle, key=lambda s: s.last_active), "limit")
+
+        session_id = secrets.token_hex(16)
+        session = HTTPSession(
+            session_id,
+            self.workspaces,
+            max_concurrency=self._max_concurrency,
+            request_timeout=self._request_timeout,
+        )
+        self.sessions[session_id] = session
+        logger.info(f"Opened HTTP session {session_id}")
+        return session
+
+    async def handle_post(self, request: "web.Request") -> "web.Response":
+        """Handle JSON-RPC messages sent by a client."""
+        from aiohttp import web
+
+        self._check_origin(request)
+        try:
+            payload = json.loads(await request.text())
+        except ValueError as e:
+            raise web.HTTPBadRequest(
+                text=_error_body(-32700, f"Parse error: {e}"),
+                content_type="application/json",
+            )
+        messages = payload if isinstance(payload, list) else [payload]
+        if not messages or not all(isinstance(m, dict) for m in messages):
+            raise web.HTTPBadRequest(
+                text=_error_body(-32600, "Invalid Request"),
+                content_type="application/json",
+            )
+
+        if any(m.get("method") == "initialize" for m in messages):
+            if len(messages) > 1:
+                raise web.HTTPBadRequest(
+                    text=_error_body(-32600, "initialize must be sent on its own"),
+                    content_type="application/json",
+                )
+            session = self._open_session()
+        else:
+            session = self._find_session(request)
+
+        replies = await asyncio.gather(
+            *(session.handle_request(json.dumps(m)) for m in messages)
+        )
+        session.touch()
+        responses: List[str] = [r for r in replies if r is not None]
+        if not responses:
+            return web.Response(status=202)
+
+        body = responses[0] if isinstance(payload, dict) else f"[{','.join(responses)}]"
+        return web.Response(
+            text=body,
+            content_type="application/json",
+            headers={SESSION_HEADER: session.session_id},
+        )
+
+    async def handle_get(self, request: "web.Request") -> "web.StreamResponse":
+        """Stream server-initiated messages to a client as server-sent events."""
+        from aiohttp import web
+
+        self._check_origin(request)
+        session = self._find_session(request)
+        if session.stream_open:
+            raise web.HTTPConflict(
+                text=_error_body(-32000, "Session already has an event stream"),
+                content_type="application/json",
+            )
+
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+        )
+        session.stream_open = True
+        try:
+            await response.prepare(request)
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        session.outbox.get(), KEEPALIVE_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    await response.write(b": keepalive\n\n")
+                    continue
+                if message is None:
+                    break
+                await response.write(f"event: message\ndata: {message}\n\n".encode())
+        except ConnectionResetError:
+            logger.debug(f"Event stream of session {session.session_id} disconnected")
+        finally:
+            session.stream_open = False
+            # The idle timeout counts from the disconnect
+            session.touch()
+        return response
+
+    async def handle_delete(self, request: "web.Request") -> "web.Response":
+        """End a client's session."""
+        from aiohttp import web
+
+        self._check_origin(request)
+        session = self._find_session(request)
+        self._close_session(session, "deleted")
+        return web.Response(status=204)
+
+    def metrics_gauges(self) -> Gauges:
+        """Get the server's point-in-time metrics for the metrics endpoint."""
+        return {
+            "mcpydoc_active_workers": (
+                "Running persistent introspection workers.",
+                active_worker_count(),
+            ),
+            "mcpydoc_interpreter_queue_depth": (
+                "Introspection calls waiting for an interpreter slot.",
+                queued_request_count(),
+            ),
+            "mcpydoc_tool_calls_in_flight": (
+                "Tool calls received and not yet answered.",
+                sum(s.active_tool_calls for s in self.sessions.values()),
+            ),
+            "mcpydoc_http_sessions": (
+                "Open HTTP client sessions.",
+                len(self.sessions),
+            ),
+            "mcpydoc_workspaces": (
+                "Open workspaces, each with its own analyzer and caches.",
+                len(self.workspaces.roots()),
+            ),
+        }
+
+    async def start(self, port: int, host: str = DEFAULT_HTTP_HOST) -> "web.AppRunner":
+        """Serve ``/mcp`` over HTTP on the running event loop.
+
+        Args:
+            port: Port to listen on (0 picks a free one)
+            host: Address to bind
+
+        Returns:
+            The running AppRunner; call close(), its cleanup() and then
+            shutdown() to stop serving
+        """
+        # Imported here so that stdio servers never load aiohttp
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_post(MCP_PATH, self.handle_post)
+        app.router.add_get(MCP_PATH, self.handle_get)
+        app.router.add_delete(MCP_PATH, self.handle_delete)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        self._sweeper = asyncio.ensure_future(self._sweep_sessions())
+        logger.info(f"Serving MCP over HTTP at http://{host}:{port}{MCP_PATH}")
+        return runner
+
+    def close(self) -> None:
+        """End every session, closing their event streams."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        for session in self.sessions.values():
+            session.close()
+        self.sessions.clear()
+
+    def shutdown(self) -> None:
+        """Release the workspaces' analyzer threads."""
+        self.workspaces.shutdown()
+
+    async def serve(self, port: int, host: str = DEFAULT_HTTP_HOST) -> None:
+        """Serve until cancelled (e.g. by Ctrl+C).
+
+        Args:
+            port: Port to listen on
+            host: Address to bind
+        """
+        runner = await self.start(port, host)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            self.close()
+            # Lets in-flight requests finish
+            await runner.cleanup()
+            self.shutdown()
+            logger.info("MCPyDoc HTTP server stopped")
@@ -7,30 +7,240 @@ to expose MCPyDoc functionality as tools that can be used by MCP clients like Cl
 """
 
 import asyncio
+import base64
+import binascii
+import hashlib
 import json
 import logging
+import os
 import sys
-from typing import Any, Dict, List, Optional, Union
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
 
 import mcpydoc
 
+from .deadline import deadline_scope
 from .exceptions import (
     ValidationError,
 )
+from .metrics import (
+    increment,
+    registry,
+    request_timings,
+    response_timings_enabled,
+    span,
+)
+from .metrics_exporter import (
+    Gauges,
+    metrics_host,
+    metrics_port,
+    start_metrics_server,
+)
+from .prewarm import DependencyPrewarmer, prewarm_enabled
 from .security import (
+    DEFAULT_DETAIL,
+    DETAIL_LEVELS,
+    MAX_BATCH_SYMBOLS,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_REQUEST_TIME_SECONDS,
+    MAX_SEARCH_PAGE_SIZE,
     audit_log,
+    validate_detail,
     validate_package_name,
+    validate_root,
     validate_symbol_path,
     validate_version,
 )
-from .server import MCPyDoc
+from .server import DEFAULT_SEARCH_PAGE_SIZE, MCPyDoc
+from .worker_pool import active_worker_count, queued_request_count
+from .workspaces import WorkspacePool
+
+logger = logging.getLogger(__name__)
+
+# Tools answered by _handle_tools_call; other names are not used in metrics
+_TOOL_NAMES = (
+    "get_package_docs",
+    "get_symbols_docs",
+    "search_symbols",
+    "get_source_code",
+    "analyze_structure",
+    "server_stats",
+)
+
+# Input schema of the detail argument of the documentation tools
+DETAIL_SCHEMA = {
+    "type": "string",
+    "enum": list(DETAIL_LEVELS),
+    "description": "How much to return: 'signature' (names, kinds and signatures only), 'summary' (adds one-line descriptions and class method lists) or 'full' (default; parsed parameters, returns, raises, type hints and package metadata). Lower levels are faster and use fewer tokens",
+}
+
+# Input schema of the root argument of the documentation tools
+ROOT_SCHEMA = {
+    "type": "string",
+    "description": "Optional directory to answer for, within the client's workspace roots (absolute, or relative to the first root). In a monorepo, pass the service or package directory whose environment should be used; each root keeps its own warm caches. Defaults to the first workspace root",
+}
+
+# Response keys only included at "full" detail, and keys additionally left
+# out at "signature" detail
+_FULL_DETAIL_KEYS = frozenset(
+    {
+        "author",
+        "license",
+        "location",
+        "long_description",
+        "parameters",
+        "returns",
+        "raises",
+        "type_hints",
+        "alternative_paths",
+    }
+)
+_SUMMARY_DETAIL_KEYS = frozenset({"summary", "documentation", "methods"})
+
+
+def project_response(data: Dict[str, Any], detail: str) -> Dict[str, Any]:
+    """Drop the fields of a tool response that a detail level leaves out.
+
+    Args:
+        data: Tool response (nested dicts and lists)
+        detail: One of DETAIL_LEVELS
+
+    Returns:
+        The response without the omitted keys, at any depth
+    """
+    if detail == DEFAULT_DETAIL:
+        return data
+    omitted = _FULL_DETAIL_KEYS
+    if detail == "signature":
+        omitted = omitted | _SUMMARY_DETAIL_KEYS
+
+    def prune(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: prune(v) for k, v in value.items() if k not in omitted}
+        if isinstance(value, list):
+            return [prune(item) for item in value]
+        return value
+
+    return {k: prune(v) for k, v in data.items() if k not in omitted}
+
+
+def _search_fingerprint(
+    package_name: str, pattern: Optional[str], version: Optional[str]
+) -> str:
+    """Identify a search query so cursors cannot be replayed against another."""
+    query = json.dumps([package_name, pattern or "", version or ""])
+    return hashlib.sha256(query.encode()).hexdigest()[:16]
+
+
+def encode_search_cursor(
+    offset: int, package_name: str, pattern: Optional[str], version: Optional[str]
+) -> str:
+    """Build the opaque cursor pointing at the next page of a search.
+
+    Args:
+        offset: Position of the first result of the next page
+        package_name: Searched package
+        pattern: Search pattern
+        version: Requested package version
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = f"{offset}:{_search_fingerprint(package_name, pattern, version)}"
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_search_cursor(
+    cursor: str, package_name: str, pattern: Optional[str], version: Optional[str]
+) -> int:
+    """Get the result offset from a search cursor.
+
+    Args:
+        cursor: Cursor returned by a previous search_symbols call
+        package_name: Searched package
+        pattern: Search pattern
+        version: Requested package version
+
+    Returns:
+        Offset of the first result of the page
+
+    Raises:
+        ValidationError: If the cursor is malformed or belongs to another query
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor.encode()).decode()
+        offset_text, fingerprint = payload.split(":", 1)
+        offset = int(offset_text)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValidationError("Invalid search cursor")
+    if offset < 0 or fingerprint != _search_fingerprint(package_name, pattern, version):
+        raise ValidationError(
+            "Search cursor does not match this query; repeat the search without a cursor"
+        )
+    return offset
+
+
+def configured_max_concurrency(max_concurrency: Optional[int] = None) -> int:
+    """Get the limit on concurrent tool calls.
+
+    Args:
+        max_concurrency: Explicit limit. If None, uses MCPYDOC_MAX_CONCURRENCY
+            or MAX_CONCURRENT_REQUESTS.
+    """
+    if max_concurrency is None:
+        value = os.environ.get("MCPYDOC_MAX_CONCURRENCY", str(MAX_CONCURRENT_REQUESTS))
+        try:
+            max_concurrency = int(value)
+        except ValueError:
+            logger.warning(f"Ignoring invalid MCPYDOC_MAX_CONCURRENCY: {value!r}")
+            max_concurrency = MAX_CONCURRENT_REQUESTS
+    return max(1, max_concurrency)
+
+
+def configured_request_timeout(request_timeout: Optional[float] = None) -> float:
+    """Get the time budget in seconds for each tool call.
+
+    Args:
+        request_timeout: Explicit budget. If None, uses MCPYDOC_REQUEST_TIMEOUT
+            or MAX_REQUEST_TIME_SECONDS.
+    """
+    if request_timeout is not None:
+        return request_timeout
+    value = os.environ.get("MCPYDOC_REQUEST_TIMEOUT", str(MAX_REQUEST_TIME_SECONDS))
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid MCPYDOC_REQUEST_TIMEOUT: {value!r}")
+        return float(MAX_REQUEST_TIME_SECONDS)
 
 
 class MCPServer:
     """MCP JSON-RPC server implementation for MCPyDoc."""
 
-    def __init__(self):
-        self.mcpydoc = MCPyDoc()
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        request_timeout: Optional[float] = None,
+        workspaces: Optional[WorkspacePool] = None,
+    ):
+        """Initialize the server.
+
+        Args:
+            max_concurrency: Maximum number of tool calls executing at once.
+                If None, uses MCPYDOC_MAX_CONCURRENCY or MAX_CONCURRENT_REQUESTS.
+            request_timeout: Time budget in seconds for each tool call. If None,
+                uses MCPYDOC_REQUEST_TIMEOUT or MAX_REQUEST_TIME_SECONDS.
+            workspaces: Documentation servers per workspace root, e.g. shared
+                with other sessions. If None, the server opens its own.
+        """
+        self._max_concurrency = configured_max_concurrency(max_concurrency)
+        self._request_timeout = configured_request_timeout(request_timeout)
+        self._owns_workspaces = workspaces is None
+        self._workspaces = workspaces or WorkspacePool(
+            max_workers=self._max_concurrency
+        )
+        # Workspace of the client's first root; tool calls may name another
+        self._workspace_root: Optional[Path] = None
         self.request_id = 0
         self.logger = logging.getLogger(__name__)
         # Track client capabilities for roots support
@@ -39,6 +249,22 @@ class MCPServer:
         self._pending_requests: Dict[int, Any] = {}
         self._next_request_id = 1
         self._roots_requested = False
+        # In-flight request tasks and the limit on concurrent tool calls
+        self._tasks: Set[asyncio.Task] = set()
+        self._tool_semaphore: Optional[asyncio.Semaphore] = None
+        # Running tool calls; background pre-indexing waits for zero
+        self._active_tool_calls = 0
+        self._idle_event: Optional[asyncio.Event] = None
+        self._prewarmer: Optional[DependencyPrewarmer] = (
+            DependencyPrewarmer(self.mcpydoc, self._wait_until_idle)
+            if prewarm_enabled()
+            else None
+        )
+
+    @property
+    def mcpydoc(self) -> MCPyDoc:
+        """Documentation server of the client's workspace."""
+        return self._workspaces.get(self._workspace_root)
 
     def _create_response(
         self,
@@ -110,10 +336,38 @@ class MCPServer:
                                 "type": "string",
                                 "description": "Optional specific version to use (ensures version-accurate documentation)",
                             },
+                            "detail": DETAIL_SCHEMA,
+                            "root": ROOT_SCHEMA,
                         },
                         "required": ["package_name"],
                     },
                 },
+                {
+                    "name": "get_symbols_docs",
+                    "description": "Get documentation for several classes, functions or methods of one Python package in a single call. Use this instead of repeated get_package_docs calls when you need many symbols at once, e.g. the 10-30 methods of a class you are about to use: all symbols are resolved in one round-trip. Returns signatures, parsed parameters, return types and method summaries for each symbol, plus the list of paths that could not be found.",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "package_name": {
+                                "type": "string",
+                                "description": "Name of the Python package containing the symbols",
+                            },
+                            "symbol_paths": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "maxItems": MAX_BATCH_SYMBOLS,
+                                "description": "Dot-separated paths to the symbols, e.g. ['Session', 'Session.get', 'Session.post', 'utils.helper']",
+                            },
+                            "version": {
+                                "type": "string",
+                                "description": "Optional specific version to use (ensures version-accurate documentation)",
+                            },
+                            "detail": DETAIL_SCHEMA,
+                            "root": ROOT_SCHEMA,
+                        },
+                        "required": ["package_name", "symbol_paths"],
+                    },
+                },
                 {
                     "name": "search_symbols",
                     "description": "Discover available classes, functions, and modules in private or unfamiliar Python packages to prevent API guessing and hallucination. Use after analyze_structure when you need to find specific functionality by name. Perfect for exploring what functionality actually exists in a package that may not be in your training data before diving into documentation. Essential for finding the right methods before writing code, discovering package capabilities, or when users ask about available functionality in third-party or private libraries. Returns actual symbol names and signatures from the current environment. Follow up with get_package_docs for detailed documentation of interesting symbols.",
@@ -132,6 +386,18 @@ class MCPServer:
                                 "type": "string",
                                 "description": "Optional specific version to ensure accurate symbol discovery",
                             },
+                            "limit": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "maximum": MAX_SEARCH_PAGE_SIZE,
+                                "description": f"Maximum number of symbols to return (default {DEFAULT_SEARCH_PAGE_SIZE})",
+                            },
+                            "cursor": {
+                                "type": "string",
+                                "description": "Cursor from a previous response's next_cursor to fetch the next page of the same search",
+                            },
+                            "detail": DETAIL_SCHEMA,
+                            "root": ROOT_SCHEMA,
                         },
                         "required": ["package_name"],
                     },
@@ -154,6 +420,7 @@ class MCPServer:
                                 "type": "string",
                                 "description": "Optional specific version to ensure source code accuracy",
                             },
+                            "root": ROOT_SCHEMA,
                         },
                         "required": ["package_name", "symbol_name"],
                     },
@@ -172,13 +439,59 @@ class MCPServer:
                                 "type": "string",
                                 "description": "Optional specific version to ensure accurate structure analysis",
                             },
+                            "detail": DETAIL_SCHEMA,
+                            "root": ROOT_SCHEMA,
                         },
                         "required": ["package_name"],
                     },
                 },
+                {
+                    "name": "server_stats",
+                    "description": "Diagnostics for MCPyDoc itself, not for packages: where time goes in tool calls (timing histograms of validation, package manager detection, subprocess runs, imports, docstring parsing, model construction and serialization), cache hit and miss counts, subprocess and worker counts and timeouts. Use when tool calls are slow.",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "reset": {
+                                "type": "boolean",
+                                "description": "Clear the statistics after reading them",
+                                "default": False,
+                            },
+                        },
+                    },
+                },
             ]
         }
 
+    def _tool_root(self, arguments: Dict[str, Any]) -> Optional[Path]:
+        """Get the workspace a tool call is answered for.
+
+        Args:
+            arguments: Tool arguments; ``root`` names a directory within the
+                client's roots, e.g. one service of a monorepo
+
+        Returns:
+            The directory, or the client's workspace root if none was named
+        """
+        root = arguments.get("root")
+        if root is None:
+            return self._workspace_root
+        with span("validate"):
+            return validate_root(root, self._client_roots, self._workspace_directory())
+
+    async def _call_tool(
+        self, tool_name: str, arguments: Dict[str, Any], mcpydoc: MCPyDoc
+    ) -> Dict[str, Any]:
+        """Run a documentation tool against a workspace's server."""
+        if tool_name == "get_package_docs":
+            return await self._get_package_docs(arguments, mcpydoc)
+        if tool_name == "get_symbols_docs":
+            return await self._get_symbols_docs(arguments, mcpydoc)
+        if tool_name == "search_symbols":
+            return await self._search_symbols(arguments, mcpydoc)
+        if tool_name == "get_source_code":
+            return await self._get_source_code(arguments, mcpydoc)
+        return await self._analyze_structure(arguments, mcpydoc)
+
     async def _handle_tools_call(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle tools/call request."""
         # Ensure we've requested roots from client (non-blocking)
@@ -188,25 +501,29 @@ class MCPServer:
         tool_name = params.get("name")
         arguments = params.get("arguments", {})
 
+        metric = tool_name if tool_name in _TOOL_NAMES else "unknown"
         try:
-            if tool_name == "get_package_docs":
-                result = await self._get_package_docs(arguments)
-            elif tool_name == "search_symbols":
-                result = await self._search_symbols(arguments)
-            elif tool_name == "get_source_code":
-                result = await self._get_source_code(arguments)
-            elif tool_name == "analyze_structure":
-                result = await self._analyze_structure(arguments)
-            else:
-                raise ValueError(f"Unknown tool: {tool_name}")
+            with span(f"tool.{metric}"):
+                if tool_name == "server_stats":
+                    result = self._server_stats(arguments)
+                elif tool_name in _TOOL_NAMES:
+                    root = self._tool_root(arguments)
+                    # The workspace stays open (not evicted) during the call
+                    with self._workspaces.use(root) as mcpydoc:
+                        # Environment detection started in the background
+                        # when the workspace was opened
+                        with span("server.wait_for_environments"):
+                            await mcpydoc.wait_until_ready()
+                        result = await self._call_tool(tool_name, arguments, mcpydoc)
+                else:
+                    raise ValueError(f"Unknown tool: {tool_name}")
 
-            return {
-                "content": [
-                    {"type": "text", "text": json.dumps(result, indent=2, default=str)}
-                ]
-            }
+                with span("serialize"):
+                    text = json.dumps(result, indent=2, default=str)
+            return {"content": [{"type": "text", "text": text}]}
 
         except Exception as e:
+            increment("tool_errors", tool=metric)
             # Enhanced error handling with recovery suggestions
             error_message = str(e)
             enhanced_response = {
@@ -238,6 +555,13 @@ class MCPServer:
                         f"Add module_path='ClassName' to get specific class documentation",
                     ]
 
+            elif tool_name == "get_symbols_docs":
+                enhanced_response["recovery_suggestions"] = [
+                    f"Pass symbol_paths as a list of strings, e.g. ['ClassName', 'ClassName.method_name']",
+                    f"Request at most {MAX_BATCH_SYMBOLS} symbols per call",
+                    f"Use search_symbols to find the correct symbol names",
+                ]
+
             elif tool_name == "search_symbols" and "not found" in error_message.lower():
                 enhanced_response["recovery_suggestions"] = [
                     f"Try analyze_structure to see all available symbols",
@@ -343,7 +667,7 @@ class MCPServer:
         self._pending_requests[request_id] = None  # Mark as pending (no future needed)
 
         # Send request to client via stdout
-        print(request_json, flush=True)
+        self._write_message(request_json)
 
     def _handle_response(self, response: Dict[str, Any]) -> bool:
         """Handle a JSON-RPC response (to a server-initiated request).
@@ -392,15 +716,36 @@ class MCPServer:
 
         # Update working directory based on roots
         if self._client_roots:
-            from .subprocess_introspection import set_working_directory
-
-            set_working_directory(self._client_roots[0])
+            self._use_workspace(self._client_roots[0])
             self.logger.info(
                 f"Working directory set from client roots: {self._client_roots[0]}"
             )
+            self._start_prewarm()
+        else:
+            # The server's own working directory, opened on the next tool call
+            self._workspace_root = None
+
+    def _use_workspace(self, root: Optional[str]) -> None:
+        """Answer tool calls for a client workspace root.
 
-            # Refresh the analyzer's environments to pick up the new workspace
-            self.mcpydoc.analyzer.refresh_environments()
+        Each root keeps its own analyzer in the workspace pool, so returning
+        to an earlier root finds its environments and caches warm; nothing
+        process-wide changes.
+
+        Args:
+            root: Root directory, or None to forget the current one until the
+                client sends its roots again
+        """
+        path = None if root is None else Path(root)
+        if path is not None and not path.is_dir():
+            self.logger.warning(f"Client root path does not exist: {root}")
+            path = None
+        self._workspace_root = path
+        # Opens the workspace, starting its environment detection
+        mcpydoc = self.mcpydoc
+        if self._prewarmer is not None:
+            self._prewarmer.shutdown()
+            self._prewarmer = DependencyPrewarmer(mcpydoc, self._wait_until_idle)
 
     def _ensure_roots_requested(self) -> None:
         """Ensure we've requested roots from the client (if supported).
@@ -418,38 +763,102 @@ class MCPServer:
     def _handle_roots_changed(self) -> None:
         """Handle notification that client roots have changed.
 
-        This clears the cached roots and working directory so they
-        will be re-fetched on the next tool call.
+        This clears the cached roots and requests them again. Tool calls keep
+        using the current workspace until the new roots arrive, rather than
+        opening one for the server's working directory in the meantime.
         """
         self.logger.info("Client roots changed, clearing cached roots")
         self._client_roots = []
         self._roots_requested = False  # Allow re-requesting
+        if self._prewarmer is not None:
+            self._prewarmer.cancel()
 
-        # Clear the working directory so it will be re-fetched
-        from .subprocess_introspection import set_working_directory
+        # Request fresh roots
+        self._send_roots_request()
 
-        set_working_directory(None)
+    def _workspace_directory(self) -> Path:
+        """Get the directory of the workspace tool calls are answered for."""
+        if self._workspace_root is not None:
+            return self._workspace_root
 
-        # Refresh the analyzer's environments (will re-detect when roots arrive)
-        self.mcpydoc.analyzer.refresh_environments()
+        from .subprocess_introspection import get_working_directory
 
-        # Request fresh roots
-        self._send_roots_request()
+        return get_working_directory()
+
+    def _start_prewarm(self) -> None:
+        """Pre-index the workspace's dependencies in the background."""
+        if self._prewarmer is None:
+            return
+        # A shared workspace is pre-indexed by the first session using it
+        root = self._workspace_root
+        if not self._workspaces.claim_prewarm(root):
+            return
+
+        from .subprocess_introspection import find_project_root
 
-    async def _get_package_docs(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        project_root = find_project_root(self._workspace_directory())
+        if project_root is None:
+            self.logger.debug("No project root found, skipping pre-indexing")
+            return
+        task = self._prewarmer.start(project_root)
+        if task is not None:
+            # Keep the workspace open while it is being warmed
+            self._workspaces.pin(root)
+            task.add_done_callback(lambda _: self._workspaces.unpin(root))
+
+    def _server_stats(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the server's timing and counter statistics."""
+        stats = registry.snapshot()
+        stats["active_workers"] = active_worker_count()
+        stats["active_tool_calls"] = self._active_tool_calls
+        stats["workspaces"] = [
+            str(root or Path.cwd()) for root in self._workspaces.roots()
+        ]
+        if args.get("reset"):
+            registry.reset()
+        return stats
+
+    def metrics_gauges(self) -> Gauges:
+        """Get the server's point-in-time metrics for the metrics endpoint."""
+        return {
+            "mcpydoc_active_workers": (
+                "Running persistent introspection workers.",
+                active_worker_count(),
+            ),
+            "mcpydoc_interpreter_queue_depth": (
+                "Introspection calls waiting for an interpreter slot.",
+                queued_request_count(),
+            ),
+            "mcpydoc_tool_calls_in_flight": (
+                "Tool calls received and not yet answered.",
+                self._active_tool_calls,
+            ),
+            "mcpydoc_workspaces": (
+                "Open workspaces, each with its own analyzer and caches.",
+                len(self._workspaces.roots()),
+            ),
+        }
+
+    async def _get_package_docs(
+        self, args: Dict[str, Any], mcpydoc: Optional[MCPyDoc] = None
+    ) -> Dict[str, Any]:
         """Get package documentation."""
+        mcpydoc = mcpydoc or self.mcpydoc
         package_name = args.get("package_name")
         module_path = args.get("module_path")
         version = args.get("version")
+        detail = args.get("detail", DEFAULT_DETAIL)
 
         if not package_name:
             raise ValueError("package_name is required")
 
         # Validate inputs
-        validate_package_name(package_name)
-        if module_path:
-            validate_symbol_path(module_path)
-        validate_version(version)
+        with span("validate"):
+            validate_package_name(package_name)
+            if module_path:
+                validate_symbol_path(module_path)
+            validate_version(version)
+            validate_detail(detail)
 
         # Audit log the operation
         audit_log(
@@ -457,10 +866,11 @@ class MCPServer:
             package_name=package_name,
             module_path=module_path,
             version=version,
+            detail=detail,
         )
 
-        result = await self.mcpydoc.get_module_documentation(
-            package_name, module_path, version
+        result = await mcpydoc.get_module_documentation(
+            package_name, module_path, version, detail
         )
 
         response_data = {
@@ -548,10 +958,120 @@ class MCPServer:
             "suggested_next_steps": result.suggested_next_steps,
             "alternative_paths": result.alternative_paths,
         }
-        return response_data
+        return project_response(response_data, detail)
+
+    async def _get_symbols_docs(
+        self, args: Dict[str, Any], mcpydoc: Optional[MCPyDoc] = None
+    ) -> Dict[str, Any]:
+        """Get documentation for several symbols of a package."""
+        mcpydoc = mcpydoc or self.mcpydoc
+        package_name = args.get("package_name")
+        symbol_paths = args.get("symbol_paths")
+        version = args.get("version")
+        detail = args.get("detail", DEFAULT_DETAIL)
+
+        if not package_name:
+            raise ValueError("package_name is required")
+        if not isinstance(symbol_paths, list) or not symbol_paths:
+            raise ValueError("symbol_paths must be a non-empty list")
+
+        # Validate inputs
+        with span("validate"):
+            validate_package_name(package_name)
+            if len(symbol_paths) > MAX_BATCH_SYMBOLS:
+                raise ValidationError(
+                    f"Too many symbol paths: {len(symbol_paths)} > {MAX_BATCH_SYMBOLS}"
+                )
+            for symbol_path in symbol_paths:
+                validate_symbol_path(symbol_path)
+            validate_version(version)
+            validate_detail(detail)
+
+        # Audit log the operation
+        audit_log(
+            "mcp_get_symbols_docs",
+            package_name=package_name,
+            symbol_paths=",".join(symbol_paths),
+            version=version,
+            detail=detail,
+        )
+
+        result = await mcpydoc.get_symbols_documentation(
+            package_name, symbol_paths, version, detail
+        )
+
+        response_data = {
+            "package": {
+                "name": result.package.name,
+                "version": result.package.version,
+            },
+            "symbols": [
+                {
+                    "name": item.symbol.name,
+                    "qualified_name": item.symbol.qualname,
+                    "kind": item.symbol.kind,
+                    "module": item.symbol.module,
+                    "signature": item.symbol.signature,
+                    "documentation": {
+                        "description": item.documentation.description,
+                        "long_description": item.documentation.long_description,
+                        "parameters": [
+                            {
+                                "name": param.get("name"),
+                                "type": param.get("type"),
+                                "description": param.get("description"),
+                                "default": param.get("default"),
+                                "optional": param.get("is_optional"),
+                            }
+                            for param in item.documentation.params
+                        ],
+                        "returns": (
+                            {
+                                "type": item.documentation.returns.get("type"),
+                                "description": item.documentation.returns.get(
+                                    "description"
+                                ),
+                            }
+                            if item.documentation.returns
+                            else None
+                        ),
+                    },
+                    "type_hints": item.type_hints,
+                    "parent_class": item.parent_class,
+                    "methods": (
+                        [
+                            {
+                                "name": m.name,
+                                "signature": m.signature,
+                                "doc_preview": m.doc_preview,
+                            }
+                            for m in item.symbol.methods
+                        ]
+                        if item.symbol.methods
+                        else None
+                    ),
+                }
+                for item in result.symbols
+            ],
+            "not_found": result.not_found,
+            "suggested_next_steps": (
+                [
+                    f"Use search_symbols to find the correct names for: {', '.join(result.not_found)}",
+                    f"Use get_source_code for implementations if documentation isn't sufficient",
+                ]
+                if result.not_found
+                else [
+                    f"Use get_source_code for implementations if documentation isn't sufficient",
+                ]
+            ),
+        }
+        return project_response(response_data, detail)
 
-    async def _search_symbols(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def _search_symbols(
+        self, args: Dict[str, Any], mcpydoc: Optional[MCPyDoc] = None
+    ) -> Dict[str, Any]:
         """Search for symbols in a package."""
+        mcpydoc = mcpydoc or self.mcpydoc
         package_name = args.get("package_name")
         pattern = args.get("pattern")
         version = args.get("version")
@@ -559,11 +1079,30 @@ class MCPServer:
         if not package_name:
             raise ValueError("package_name is required")
 
+        limit = args.get("limit", DEFAULT_SEARCH_PAGE_SIZE)
+        cursor = args.get("cursor")
+        detail = args.get("detail", DEFAULT_DETAIL)
+
         # Validate inputs
-        validate_package_name(package_name)
-        if pattern and len(pattern) > 100:
-            raise ValidationError(f"Search pattern too long: {len(pattern)} > 100")
-        validate_version(version)
+        with span("validate"):
+            validate_package_name(package_name)
+            if pattern and len(pattern) > 100:
+                raise ValidationError(f"Search pattern too long: {len(pattern)} > 100")
+            validate_version(version)
+            validate_detail(detail)
+            if (
+                isinstance(limit, bool)
+                or not isinstance(limit, int)
+                or not 1 <= limit <= MAX_SEARCH_PAGE_SIZE
+            ):
+                raise ValidationError(
+                    f"limit must be an integer between 1 and {MAX_SEARCH_PAGE_SIZE}"
+                )
+            offset = (
+                decode_search_cursor(cursor, package_name, pattern, version)
+                if cursor
+                else 0
+            )
 
         # Audit log the operation
         audit_log(
@@ -571,18 +1110,30 @@ class MCPServer:
             package_name=package_name,
             pattern=pattern,
             version=version,
+            limit=limit,
+            offset=offset,
+            detail=detail,
         )
 
-        results = await self.mcpydoc.search_package_symbols(
-            package_name, pattern, version
+        page = await mcpydoc.search_package_symbols_page(
+            package_name, pattern, version, offset, limit, detail
+        )
+        results = page.results
+        next_cursor = (
+            encode_search_cursor(page.next_offset, package_name, pattern, version)
+            if page.next_offset is not None
+            else None
         )
 
-        return {
+        response_data = {
             "query": {
                 "package": package_name,
                 "pattern": pattern,
-                "total_results": len(results),
+                "total_results": page.total,
+                "offset": page.offset,
+                "returned_results": len(results),
             },
+            "next_cursor": next_cursor,
             "symbols": [
                 {
                     "name": result.symbol.name,
@@ -608,8 +1159,9 @@ class MCPServer:
                     ),
                     "type_hints": result.type_hints,
                     "parent_class": result.parent_class,
+                    "decorators": result.symbol.decorators,
                 }
-                for result in results[:50]  # Limit results for performance
+                for result in results
             ],
             "suggested_next_steps": (
                 [
@@ -618,6 +1170,11 @@ class MCPServer:
                     f"Use get_source_code only if method documentation isn't sufficient",
                     f"Try different search patterns if you didn't find what you're looking for",
                 ]
+                + (
+                    [f"Pass next_cursor as cursor to see the remaining results"]
+                    if next_cursor
+                    else []
+                )
                 if results
                 else [
                     f"Try analyze_structure to see the full package organization first",
@@ -626,9 +1183,13 @@ class MCPServer:
                 ]
             ),
         }
+        return project_response(response_data, detail)
 
-    async def _get_source_code(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def _get_source_code(
+        self, args: Dict[str, Any], mcpydoc: Optional[MCPyDoc] = None
+    ) -> Dict[str, Any]:
         """Get source code for a symbol."""
+        mcpydoc = mcpydoc or self.mcpydoc
         package_name = args.get("package_name")
         symbol_name = args.get("symbol_name")
         version = args.get("version")
@@ -637,9 +1198,10 @@ class MCPServer:
             raise ValueError("package_name and symbol_name are required")
 
         # Validate inputs
-        validate_package_name(package_name)
-        validate_symbol_path(symbol_name)
-        validate_version(version)
+        with span("validate"):
+            validate_package_name(package_name)
+            validate_symbol_path(symbol_name)
+            validate_version(version)
 
         # Audit log the operation
         audit_log(
@@ -649,7 +1211,7 @@ class MCPServer:
             version=version,
         )
 
-        result = await self.mcpydoc.get_source_code(package_name, symbol_name, version)
+        result = await mcpydoc.get_source_code(package_name, symbol_name, version)
 
         return {
             "symbol": {
@@ -705,24 +1267,35 @@ class MCPServer:
             "type_hints": result.type_hints,
         }
 
-    async def _analyze_structure(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def _analyze_structure(
+        self, args: Dict[str, Any], mcpydoc: Optional[MCPyDoc] = None
+    ) -> Dict[str, Any]:
         """Analyze package structure."""
+        mcpydoc = mcpydoc or self.mcpydoc
         package_name = args.get("package_name")
         version = args.get("version")
+        detail = args.get("detail", DEFAULT_DETAIL)
 
         if not package_name:
             raise ValueError("package_name is required")
 
         # Validate inputs
-        validate_package_name(package_name)
-        validate_version(version)
+        with span("validate"):
+            validate_package_name(package_name)
+            validate_version(version)
+            validate_detail(detail)
 
         # Audit log the operation
-        audit_log("mcp_analyze_structure", package_name=package_name, version=version)
+        audit_log(
+            "mcp_analyze_structure",
+            package_name=package_name,
+            version=version,
+            detail=detail,
+        )
 
-        result = await self.mcpydoc.analyze_package_structure(package_name, version)
+        result = await mcpydoc.analyze_package_structure(package_name, version, detail)
 
-        return {
+        response_data = {
             "package": {
                 "name": result.package.name,
                 "version": result.package.version,
@@ -788,6 +1361,7 @@ class MCPServer:
             ],
             "suggested_next_steps": result.suggested_next_steps,
         }
+        return project_response(response_data, detail)
 
     async def handle_request(self, request_data: str) -> Optional[str]:
         """Handle incoming JSON-RPC request or response.
@@ -821,6 +1395,10 @@ class MCPServer:
                 # Client is ready, request roots immediately so they're likely
                 # available before the first tool call
                 self._ensure_roots_requested()
+                if "roots" not in self._client_capabilities:
+                    # The workspace is already known; otherwise pre-indexing
+                    # starts once the roots arrive
+                    self._start_prewarm()
                 # This is a notification, so no response needed
                 return None
             elif method == "notifications/roots/list_changed":
@@ -831,7 +1409,18 @@ class MCPServer:
             elif method == "tools/list":
                 result = await self._handle_tools_list(params)
             elif method == "tools/call":
-                result = await self._handle_tools_call(params)
+                self._begin_tool_call()
+                try:
+                    async with self._get_tool_semaphore():
+                        # The deadline and the timing spans follow the call
+                        # into analyzer threads
+                        with request_timings() as timings:
+                            with deadline_scope(self._request_timeout):
+                                result = await self._handle_tools_call(params)
+                    if response_timings_enabled():
+                        result["_meta"] = {"timings": timings}
+                finally:
+                    self._end_tool_call()
             else:
                 error = self._create_error(-32601, f"Method not found: {method}")
                 return json.dumps(self._create_response(request_id, error=error))
@@ -843,6 +1432,72 @@ class MCPServer:
             error = self._create_error(-32603, "Internal error", str(e))
             return json.dumps(self._create_response(request_id, error=error))
 
+    def _get_tool_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent tool calls (created lazily
+        so it binds to the running event loop)."""
+        if self._tool_semaphore is None:
+            self._tool_semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._tool_semaphore
+
+    def _get_idle_event(self) -> asyncio.Event:
+        """Get the event set while no tool call is running (created lazily
+        so it binds to the running event loop)."""
+        if self._idle_event is None:
+            self._idle_event = asyncio.Event()
+            if self._active_tool_calls == 0:
+                self._idle_event.set()
+        return self._idle_event
+
+    @property
+    def active_tool_calls(self) -> int:
+        """Number of tool calls received and not yet answered."""
+        return self._active_tool_calls
+
+    def _begin_tool_call(self) -> None:
+        self._active_tool_calls += 1
+        self._get_idle_event().clear()
+
+    def _end_tool_call(self) -> None:
+        self._active_tool_calls -= 1
+        if self._active_tool_calls == 0:
+            self._get_idle_event().set()
+
+    async def _wait_until_idle(self) -> None:
+        """Wait until no tool call is running."""
+        await self._get_idle_event().wait()
+
+    def _write_message(self, message: str) -> None:
+        """Write one JSON-RPC message to the client.
+
+        Only called from the event loop thread, so messages never interleave.
+        """
+        print(message, flush=True)
+
+    async def _process_line(self, line: str) -> None:
+        """Handle one incoming message and write its response, if any."""
+        try:
+            # Handle request (may return None if it was a response to our request)
+            response = await self.handle_request(line)
+        except Exception as e:
+            self.logger.exception(f"Error in stdio loop: {e}")
+            error = self._create_error(-32603, "Internal error", str(e))
+            response = json.dumps(self._create_response(None, error=error))
+
+        # Only send response if this was a client request (not a response to us)
+        if response is not None:
+            self._write_message(response)
+
+    def _dispatch(self, line: str) -> asyncio.Task:
+        """Start handling a message as a concurrent task.
+
+        Responses are written as soon as each request completes, so they may
+        arrive out of order; clients match them by JSON-RPC id.
+        """
+        task = asyncio.ensure_future(self._process_line(line))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
     async def run_stdio(self):
         """Run MCP server using stdio transport."""
         self.logger.info("Starting MCPyDoc MCP server on stdio")
@@ -860,12 +1515,7 @@ class MCPServer:
                 if not line:
                     continue
 
-                # Handle request (may return None if it was a response to our request)
-                response = await self.handle_request(line)
-
-                # Only send response if this was a client request (not a response to us)
-                if response is not None:
-                    print(response, flush=True)
+                self._dispatch(line)
 
             except KeyboardInterrupt:
                 break
@@ -873,7 +1523,15 @@ class MCPServer:
                 self.logger.exception(f"Error in stdio loop: {e}")
                 error = self._create_error(-32603, "Internal error", str(e))
                 response = json.dumps(self._create_response(None, error=error))
-                print(response, flush=True)
+                self._write_message(response)
+
+        # Let in-flight requests finish before shutting down
+        if self._prewarmer is not None:
+            self._prewarmer.shutdown()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._owns_workspaces:
+            self._workspaces.shutdown()
 
         self.logger.info("MCPyDoc MCP server stopped")
 
@@ -881,8 +1539,38 @@ class MCPServer:
 async def main():
     """Main entry point for the MCP server."""
     logging.basicConfig(level=logging.INFO)
-    server = MCPServer()
-    await server.run_stdio()
+
+    # Opt-in HTTP transport serving many clients from one process
+    from .http_transport import HTTPTransport, http_host, http_port
+
+    transport = None
+    http = http_port()
+    if http is not None:
+        transport = HTTPTransport()
+        gauges = transport.metrics_gauges
+    else:
+        server = MCPServer()
+        gauges = server.metrics_gauges
+
+    # Opt-in Prometheus endpoint on localhost
+    exporter = None
+    port = metrics_port()
+    if port is not None:
+        try:
+            exporter = await start_metrics_server(gauges, port, metrics_host())
+        except OSError as e:
+            logging.getLogger(__name__).warning(
+                f"Could not start the metrics endpoint on port {port}: {e}"
+            )
+
+    try:
+        if transport is not None and http is not None:
+            await transport.serve(http, http_host())
+        else:
+            await server.run_stdio()
+    finally:
+        if exporter is not None:
+            await exporter.cleanup()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,219 @@
+"""In-memory timing and counter metrics for MCPyDoc.
+
+Code paths worth watching are wrapped in ``span("name")``. Each span adds its
+duration to a process-wide histogram and, while a tool call is being timed
+(see request_timings), to that call's own breakdown, which can be returned in
+the response's ``_meta.timings``. Counters track cache hits and misses,
+subprocess launches, timeouts and similar events.
+
+The request breakdown lives in a context variable, so spans recorded on
+analyzer threads (which run in a copy of the caller's context, see
+MCPyDoc._run_blocking) are attributed to the right call. Recording is a lock
+plus a few additions, cheap enough to leave on permanently.
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds of the histogram buckets, in seconds
+BUCKET_BOUNDS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Counter name and sorted (label, value) pairs
+CounterKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# Spans of the tool call being timed, as (name, seconds)
+_request_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar(
+    "mcpydoc_request_spans", default=None
+)
+
+
+def response_timings_enabled() -> bool:
+    """Check whether tool responses carry ``_meta.timings`` (MCPYDOC_RESPONSE_TIMINGS)."""
+    value = os.environ.get("MCPYDOC_RESPONSE_TIMINGS", "0")
+    return value.lower() not in ("0", "false", "no", "off")
+
+
+class Histogram:
+    """Distribution of durations over fixed buckets."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # One count per bucket bound, plus one for longer durations
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        """Add one duration."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+
+    def copy(self) -> "Histogram":
+        """Get an independent copy of the histogram."""
+        copy = Histogram()
+        copy.count, copy.total, copy.max = self.count, self.total, self.max
+        copy.buckets = list(self.buckets)
+        return copy
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        if self.count == 0:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the histogram in milliseconds."""
+        p50, p95 = self.quantile(0.5), self.quantile(0.95)
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0,
+            "p50_ms": None if p50 is None else round(p50 * 1000, 3),
+            "p95_ms": None if p95 is None else round(p95 * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class MetricsRegistry:
+    """Process-wide span histograms and event counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[CounterKey, int] = {}
+        self.started = time.time()
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration in the named histogram."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name: str, amount: int = 1, **labels: str) -> None:
+        """Add to the named counter (one series per combination of labels)."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def histograms(self) -> Dict[str, Histogram]:
+        """Get a copy of every histogram, by span name."""
+        with self._lock:
+            return {name: h.copy() for name, h in self._histograms.items()}
+
+    def counters(self) -> Dict[CounterKey, int]:
+        """Get the current value of every counter series."""
+        with self._lock:
+            return dict(self._counters)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get all metrics as a JSON-serializable dictionary."""
+        return {
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "spans": {
+                name: histogram.to_dict()
+                for name, histogram in sorted(self.histograms().items())
+            },
+            "counters": {
+                _format_counter(key): value
+                for key, value in sorted(self.counters().items())
+            },
+        }
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+
+def _format_counter(key: CounterKey) -> str:
+    """Format a counter series as ``name`` or ``name{label=value,...}``."""
+    name, labels = key
+    if not labels:
+        return name
+    return f"{name}{{{','.join(f'{k}={v}' for k, v in labels)}}}"
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block as the named span.
+
+    Args:
+        name: Span name, e.g. ``subprocess.run_script``
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        registry.observe(name, elapsed)
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append((name, elapsed))
+
+
+def increment(name: str, amount: int = 1, **labels: str) -> None:
+    """Add to a counter of the process-wide registry.
+
+    Args:
+        name: Counter name, e.g. ``cache.introspection.hit``
+        amount: Value to add
+        **labels: Labels of the series, e.g. ``package="numpy"``; keep their
+            values to a small set
+    """
+    registry.increment(name, amount, **labels)
+
+
+@contextmanager
+def request_timings() -> Iterator[Dict[str, Dict[str, float]]]:
+    """Collect the spans recorded while handling one tool call.
+
+    Yields:
+        Dictionary filled on exit with ``{span name: {"count", "ms"}}``
+    """
+    spans: List[Tuple[str, float]] = []
+    timings: Dict[str, Dict[str, float]] = {}
+    token = _request_spans.set(spans)
+    try:
+        yield timings
+    finally:
+        _request_spans.reset(token)
+        # Analyzer threads may still append after a deadline; copy first
+        for name, seconds in list(spans):
+            entry = timings.setdefault(name, {"count": 0, "ms": 0.0})
+            entry["count"] += 1
+            entry["ms"] = round(entry["ms"] + seconds * 1000, 3)
@@ -0,0 +1,189 @@
+"""Prometheus endpoint for MCPyDoc metrics.
+
+Opt-in: with MCPYDOC_METRICS_PORT set, the server also listens on
+``http://127.0.0.1:<port>/metrics`` and serves the timing histograms and
+counters of metrics.py, plus gauges of the running server, in the Prometheus
+text exposition format. The endpoint binds to localhost unless
+MCPYDOC_METRICS_HOST says otherwise; it has no authentication.
+
+Metric families:
+
+- ``mcpydoc_tool_duration_seconds{tool}``: tool call latency histograms
+- ``mcpydoc_span_duration_seconds{span}``: latency of the steps inside calls
+- ``mcpydoc_cache_lookups_total{cache,result}`` and
+  ``mcpydoc_cache_hit_ratio{cache}``: cache effectiveness
+- ``mcpydoc_subprocess_timeouts_total{package}``: introspection timeouts
+- ``mcpydoc_<counter>_total``: every other counter, dots turned into
+  underscores
+- gauges supplied by the server (workers, queue depth, calls in flight)
+"""
+
+import logging
+import os
+import re
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .metrics import BUCKET_BOUNDS, Histogram, MetricsRegistry, registry
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_HOST = "127.0.0.1"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Gauge name -> (help text, value)
+Gauges = Dict[str, Tuple[str, float]]
+
+# Sorted (label, value) pairs of a sample
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def metrics_port() -> Optional[int]:
+    """Get the port of the metrics endpoint (MCPYDOC_METRICS_PORT), or None."""
+    value = os.environ.get("MCPYDOC_METRICS_PORT")
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid MCPYDOC_METRICS_PORT: {value!r}")
+        return None
+
+
+def metrics_host() -> str:
+    """Get the bind address of the metrics endpoint (MCPYDOC_METRICS_HOST)."""
+    return os.environ.get("MCPYDOC_METRICS_HOST", DEFAULT_METRICS_HOST)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs: Labels) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _histogram_family(
+    name: str, help_text: str, label: str, histograms: Dict[str, Histogram]
+) -> List[str]:
+    if not histograms:
+        return []
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for value, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(BUCKET_BOUNDS, histogram.buckets):
+            cumulative += count
+            labels = _labels(((label, value), ("le", repr(bound))))
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _labels(((label, value), ("le", "+Inf")))
+        lines.append(f"{name}_bucket{labels} {histogram.count}")
+        labels = _labels(((label, value),))
+        lines.append(f"{name}_sum{labels} {histogram.total}")
+        lines.append(f"{name}_count{labels} {histogram.count}")
+    return lines
+
+
+def render_metrics(
+    metrics: MetricsRegistry = registry, gauges: Optional[Gauges] = None
+) -> str:
+    """Render metrics in the Prometheus text exposition format.
+
+    Args:
+        metrics: Registry to render
+        gauges: Point-in-time values of the running server
+
+    Returns:
+        Exposition text, ending with a newline
+    """
+    histograms = metrics.histograms()
+    tools = {
+        n[len("tool.") :]: h for n, h in histograms.items() if n.startswith("tool.")
+    }
+    spans = {n: h for n, h in histograms.items() if not n.startswith("tool.")}
+    lines = _histogram_family(
+        "mcpydoc_tool_duration_seconds", "Tool call latency.", "tool", tools
+    )
+    lines += _histogram_family(
+        "mcpydoc_span_duration_seconds",
+        "Latency of steps inside tool calls.",
+        "span",
+        spans,
+    )
+
+    # Counter families: name -> (help text, [(labels, value)])
+    families: Dict[str, Tuple[str, List[Tuple[Labels, int]]]] = {}
+    cache_results: Dict[str, Dict[str, int]] = {}
+    for (name, labels), value in sorted(metrics.counters().items()):
+        match = re.fullmatch(r"cache\.(\w+)\.(hit|miss)", name)
+        if match:
+            cache, result = match.groups()
+            family = "mcpydoc_cache_lookups_total"
+            help_text = "Cache lookups by cache and result."
+            labels = (("cache", cache), ("result", result)) + labels
+            cache_results.setdefault(cache, {})[result] = value
+        else:
+            family = f"mcpydoc_{_metric_name(name)}_total"
+            help_text = f"Count of {name} events."
+        families.setdefault(family, (help_text, []))[1].append((labels, value))
+    for family, (help_text, samples) in families.items():
+        lines += [f"# HELP {family} {help_text}", f"# TYPE {family} counter"]
+        lines += [f"{family}{_labels(labels)} {value}" for labels, value in samples]
+
+    if cache_results:
+        name = "mcpydoc_cache_hit_ratio"
+        lines += [
+            f"# HELP {name} Share of cache lookups that were hits.",
+            f"# TYPE {name} gauge",
+        ]
+        for cache, results in sorted(cache_results.items()):
+            lookups = results.get("hit", 0) + results.get("miss", 0)
+            ratio = results.get("hit", 0) / lookups if lookups else 0.0
+            lines.append(f"{name}{_labels((('cache', cache),))} {ratio}")
+
+    for name, (help_text, level) in sorted((gauges or {}).items()):
+        lines += [
+            f"# HELP {name} {help_text}",
+            f"# TYPE {name} gauge",
+            f"{name} {level}",
+        ]
+
+    return "\n".join(lines) + "\n"
+
+
+async def start_metrics_server(
+    gauges: Callable[[], Gauges], port: int, host: str = DEFAULT_METRICS_HOST
+) -> "web.AppRunner":
+    """Serve ``/metrics`` over HTTP on the running event loop.
+
+    Args:
+        gauges: Called on every scrape for the server's current gauges
+        port: Port to listen on (0 picks a free one)
+        host: Address to bind
+
+    Returns:
+        The running AppRunner; call its cleanup() to stop serving
+    """
+    # Imported here so that servers without the endpoint never load aiohttp
+    from aiohttp import web
+
+    async def handle_metrics(request: "web.Request") -> "web.Response":
+        body = render_metrics(gauges=gauges()).encode("utf-8")
+        return web.Response(body=body, headers={"Content-Type": CONTENT_TYPE})
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    logger.info(f"Serving Prometheus metrics at http://{host}:{port}/metrics")
+    return runner
@@ -44,6 +44,9 @@ class SymbolInfo(BaseModel):
     methods: Optional[List[MethodSummary]] = Field(
         None, description="List of methods (for classes)"
     )
+    decorators: Optional[List[str]] = Field(
+        None, description="Decorators applied to the definition"
+    )
 
 
 class DocumentationInfo(BaseModel):
@@ -76,6 +79,21 @@ class SymbolSearchResult(BaseModel):
     )
 
 
+class SymbolSearchPage(BaseModel):
+    """One page of symbol search results."""
+
+    model_config = ConfigDict(frozen=True)
+
+    results: List[SymbolSearchResult] = Field(
+        default_factory=list, description="Symbols in this page, most relevant first"
+    )
+    total: int = Field(..., description="Total number of matching symbols")
+    offset: int = Field(0, description="Position of the first result in the page")
+    next_offset: Optional[int] = Field(
+        None, description="Offset of the next page, None if this is the last page"
+    )
+
+
 class PackageStructure(BaseModel):
     """Package structure analysis result."""
 
@@ -134,6 +152,20 @@ class ModuleDocumentationResult(BaseModel):
     )
 
 
+class BatchDocumentationResult(BaseModel):
+    """Result of documentation retrieval for several symbols at once."""
+
+    model_config = ConfigDict(frozen=True)
+
+    package: PackageInfo = Field(..., description="Package information")
+    symbols: List[SymbolSearchResult] = Field(
+        default_factory=list, description="Resolved symbols, in request order"
+    )
+    not_found: List[str] = Field(
+        default_factory=list, description="Symbol paths that could not be resolved"
+    )
+
+
 class EnhancedError(BaseModel):
     """Enhanced error information for better AI agent guidance."""
 
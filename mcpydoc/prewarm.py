@@ -0,0 +1,219 @@
+"""Background pre-indexing of a project's dependencies for MCPyDoc.
+
+The first ``analyze_structure`` or ``search_symbols`` call for a package pays
+for locating it, collecting its symbols and reading its docstring, which takes
+10-40 seconds for heavy packages. Once the client's workspace is known, the
+server reads the project's direct dependencies and warms those caches in the
+background, one package at a time. Interactive tool calls always go first:
+
+- the work runs on its own thread, so it never occupies a request thread,
+- every step waits until no tool call is running,
+- introspection runs at background priority, so it queues behind interactive
+  calls for the project's interpreters and leaves one of them free (see
+  worker_pool.background_priority).
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .deadline import deadline_scope
+from .exceptions import MCPyDocError, SecurityError
+from .security import validate_package_name
+from .server import MCPyDoc
+from .worker_pool import background_priority
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the number of dependencies warmed per workspace
+MAX_PREWARM_PACKAGES = 25
+
+# Time budget of each warming step (package info, symbols, docstring)
+PREWARM_STEP_TIMEOUT_SECONDS = 60
+
+# Distribution name at the start of a PEP 508 requirement string
+_REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def prewarm_enabled() -> bool:
+    """Check whether dependency pre-indexing is enabled (MCPYDOC_PREWARM)."""
+    value = os.environ.get("MCPYDOC_PREWARM", "1")
+    return value.lower() not in ("0", "false", "no", "off")
+
+
+def _read_toml(path: Path) -> Dict[str, Any]:
+    """Parse a TOML file, returning an empty table if it cannot be read."""
+    if not path.is_file():
+        return {}
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not parse {path}: {e}")
+        return {}
+
+
+def _import_name(distribution: str) -> str:
+    """Guess the import name of a distribution (``typing-extensions`` ->
+    ``typing_extensions``)."""
+    return re.sub(r"[-.]+", "_", distribution).lower()
+
+
+def direct_dependencies(project_root: Path) -> List[str]:
+    """Get the import names of a project's direct dependencies.
+
+    Reads PEP 621 ``[project] dependencies`` and Poetry's
+    ``[tool.poetry.dependencies]`` from pyproject.toml, and ``[packages]``
+    from a Pipfile. Lockfiles (uv.lock, poetry.lock) are not consulted: they
+    list the whole transitive closure rather than what the project imports.
+
+    Args:
+        project_root: Project root (see find_project_root)
+
+    Returns:
+        Import names in declaration order, without duplicates or the project
+        itself
+    """
+    pyproject = _read_toml(project_root / "pyproject.toml")
+    project = pyproject.get("project", {})
+    poetry = pyproject.get("tool", {}).get("poetry", {})
+    pipfile = _read_toml(project_root / "Pipfile")
+
+    distributions = []
+    for requirement in project.get("dependencies", []):
+        match = _REQUIREMENT_NAME.match(requirement)
+        if match:
+            distributions.append(match.group(1))
+    distributions.extend(
+        name for name in poetry.get("dependencies", {}) if name.lower() != "python"
+    )
+    distributions.extend(pipfile.get("packages", {}))
+
+    own_names = {
+        _import_name(name)
+        for name in (project.get("name"), poetry.get("name"))
+        if isinstance(name, str)
+    }
+    names: List[str] = []
+    for distribution in distributions:
+        name = _import_name(distribution)
+        if name in own_names or name in names:
+            continue
+        try:
+            validate_package_name(name)
+        except SecurityError:
+            continue
+        names.append(name)
+    return names
+
+
+class DependencyPrewarmer:
+    """Warms analyzer caches for a project's dependencies in the background."""
+
+    def __init__(
+        self,
+        mcpydoc: MCPyDoc,
+        wait_until_idle: Callable[[], Awaitable[Any]],
+        max_packages: int = MAX_PREWARM_PACKAGES,
+    ) -> None:
+        """Initialize the prewarmer.
+
+        Args:
+            mcpydoc: Server whose analyzer and docstring caches are warmed
+            wait_until_idle: Coroutine function returning once no tool call is
+                running; awaited before every warming step
+            max_packages: Maximum number of dependencies warmed per project
+        """
+        self._mcpydoc = mcpydoc
+        self._wait_until_idle = wait_until_idle
+        self._max_packages = max_packages
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="mcpydoc-prewarm"
+        )
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.warmed: List[str] = []
+
+    def start(self, project_root: Path) -> Optional["asyncio.Task[None]"]:
+        """Start warming a project's dependencies, replacing any earlier run.
+
+        Args:
+            project_root: Project root to read dependencies from
+
+        Returns:
+            The background task, or None if there is nothing to warm
+        """
+        self.cancel()
+        packages = direct_dependencies(project_root)[: self._max_packages]
+        if not packages:
+            logger.debug(f"No dependencies to pre-index at {project_root}")
+            return None
+
+        logger.info(
+            f"Pre-indexing {len(packages)} dependencies of {project_root} "
+            f"in the background"
+        )
+        self._task = asyncio.ensure_future(self._run(packages))
+        return self._task
+
+    def cancel(self) -> None:
+        """Stop warming after the step currently running."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def shutdown(self) -> None:
+        """Cancel warming and release the background thread."""
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    async def _run(self, packages: List[str]) -> None:
+        """Warm each package in turn, yielding to tool calls between steps."""
+        loop = asyncio.get_running_loop()
+        self.warmed = []
+        for distribution in packages:
+            # Dependencies are declared by distribution name ("pyyaml" -> "yaml")
+            package_name = await loop.run_in_executor(
+                self._executor, self._mcpydoc.analyzer.resolve_import_name, distribution
+            )
+            for step in (self._warm_info, self._warm_symbols, self._warm_docstring):
+                await self._wait_until_idle()
+                try:
+                    await loop.run_in_executor(
+                        self._executor, self._run_step, step, package_name
+                    )
+                except (MCPyDocError, ImportError) as e:
+                    logger.debug(f"Skipping pre-indexing of {package_name}: {e}")
+                    break
+                except Exception as e:
+                    logger.warning(f"Pre-indexing of {package_name} failed: {e}")
+                    break
+            else:
+                self.warmed.append(package_name)
+        logger.info(f"Pre-indexed {len(self.warmed)}/{len(packages)} dependencies")
+
+    def _run_step(self, step: Callable[[str], None], package_name: str) -> None:
+        """Run one warming step on the background thread."""
+        with background_priority(), deadline_scope(PREWARM_STEP_TIMEOUT_SECONDS):
+            step(package_name)
+
+    def _warm_info(self, package_name: str) -> None:
+        self._mcpydoc.analyzer.get_package_info(package_name)
+
+    def _warm_symbols(self, package_name: str) -> None:
+        # Builds the search index and parses docstrings as analyze_structure would
+        for symbol in self._mcpydoc.analyzer.search_symbols(package_name):
+            self._mcpydoc.doc_parser.parse_docstring(symbol.docstring)
+
+    def _warm_docstring(self, package_name: str) -> None:
+        docstring = self._mcpydoc.analyzer.get_package_docstring(package_name)
+        self._mcpydoc.doc_parser.parse_docstring(docstring)
@@ -0,0 +1,273 @@
+"""In-memory symbol search index for MCPyDoc.
+
+Symbol search used to re-walk every module of a package for each pattern and
+keep whatever contained the pattern as a substring. This module indexes a
+package's full symbol set once and answers any number of patterns from it:
+
+- a trigram index over dotted symbol paths for substring and typo-tolerant
+  candidate lookup,
+- a sorted token list for prefix matching on camelCase / snake_case parts
+  (``HTTPClientError`` -> ``http``, ``client``, ``error``),
+- acronyms of those tokens (``gsd`` -> ``get_symbols_docs``).
+
+Candidates are ranked by match quality, then by symbol kind and path length.
+"""
+
+import bisect
+import heapq
+import re
+from typing import (
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from .models import SymbolInfo
+
+T = TypeVar("T")
+
+# Splits identifiers into words: "HTTPClientError2" -> HTTP, Client, Error, 2
+_TOKEN_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# Minimum share of a pattern's trigrams a path must contain to count as a fuzzy hit
+MIN_TRIGRAM_SIMILARITY = 0.5
+
+# Relevance scores for each kind of match (higher is better)
+SCORE_EXACT_NAME = 100
+SCORE_NAME_PREFIX = 90
+SCORE_PATH_SUFFIX = 85
+SCORE_NAME_TOKENS = 75
+SCORE_NAME_SUBSTRING = 70
+SCORE_PATH_SUBSTRING = 60
+SCORE_PATH_TOKENS = 55
+SCORE_ACRONYM = 50
+SCORE_FUZZY = 40
+
+# Tie-breaker: prefer the symbols agents usually look for
+KIND_PRIORITY = {"class": 0, "function": 1, "method": 2, "module": 3}
+
+
+def split_identifier(text: str) -> List[str]:
+    """Split an identifier or dotted path into lowercase word tokens.
+
+    Args:
+        text: Identifier, dotted path or free-form search pattern
+
+    Returns:
+        Lowercase tokens in order of appearance
+    """
+    return [token.lower() for token in _TOKEN_PATTERN.findall(text)]
+
+
+def trigrams(text: str) -> Set[str]:
+    """Get the set of character trigrams of a (lowercase) string."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def symbol_path(package_name: str, symbol: SymbolInfo) -> str:
+    """Get the dotted path of a symbol relative to its package.
+
+    This is the path accepted by get_symbol_info, e.g. ``core.Engine.run``.
+    """
+    module_suffix = symbol.module[len(package_name) :].lstrip(".")
+    if symbol.kind == "module" or not symbol.module.startswith(package_name):
+        return symbol.qualname
+    return f"{module_suffix}.{symbol.qualname}" if module_suffix else symbol.qualname
+
+
+def _tokens_match(pattern_tokens: List[str], tokens: List[str]) -> bool:
+    """Check that every pattern token is a prefix of a distinct later token."""
+    position = 0
+    for pattern_token in pattern_tokens:
+        while position < len(tokens) and not tokens[position].startswith(pattern_token):
+            position += 1
+        if position == len(tokens):
+            return False
+        position += 1
+    return True
+
+
+class _Entry:
+    """Precomputed search keys of one indexed symbol."""
+
+    __slots__ = ("name", "path", "name_tokens", "path_tokens", "acronym", "rank")
+
+    def __init__(self, name: str, path: str, kind: str, position: int) -> None:
+        self.name = name.lower()
+        self.path = path.lower()
+        self.name_tokens = split_identifier(name)
+        self.path_tokens = split_identifier(path)
+        self.acronym = "".join(token[0] for token in self.name_tokens)
+        self.rank = (KIND_PRIORITY.get(kind, len(KIND_PRIORITY)), len(path), position)
+
+
+class SymbolSearchIndex(Generic[T]):
+    """Ranked search over one package's symbol set."""
+
+    def __init__(self, items: Iterable[Tuple[T, str, str, str]]) -> None:
+        """Build the index.
+
+        Args:
+            items: (symbol, name, dotted path, kind) tuples; symbols are returned
+                by search() unchanged, in relevance order
+        """
+        self.symbols: List[T] = []
+        self._entries: List[_Entry] = []
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._tokens: Dict[str, Set[int]] = {}
+        self._acronyms: Dict[str, Set[int]] = {}
+
+        for position, (symbol, name, path, kind) in enumerate(items):
+            entry = _Entry(name, path, kind, position)
+            self.symbols.append(symbol)
+            self._entries.append(entry)
+            for trigram in trigrams(entry.path):
+                self._trigrams.setdefault(trigram, set()).add(position)
+            for token in entry.path_tokens:
+                self._tokens.setdefault(token, set()).add(position)
+            if entry.acronym:
+                self._acronyms.setdefault(entry.acronym, set()).add(position)
+
+        self._sorted_tokens = sorted(self._tokens)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _tokens_with_prefix(self, prefix: str) -> Set[int]:
+        """Get positions of symbols having a path token starting with prefix."""
+        positions: Set[int] = set()
+        start = bisect.bisect_left(self._sorted_tokens, prefix)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            positions |= self._tokens[token]
+        return positions
+
+    def _candidates(self, query: str, query_tokens: List[str]) -> Set[int]:
+        """Collect positions that may match, without scanning every symbol."""
+        if len(query) < 3:
+            # Too short for trigrams; the index is still cheap to scan
+            return set(range(len(self._entries)))
+
+        candidates: Set[int] = set()
+        for trigram in trigrams(query):
+            candidates |= self._trigrams.get(trigram, set())
+        for token in query_tokens:
+            candidates |= self._tokens_with_prefix(token)
+        for acronym, positions in self._acronyms.items():
+            if acronym.startswith(query):
+                candidates |= positions
+        return candidates
+
+    def _score(
+        self,
+        entry: _Entry,
+        query: str,
+        query_tokens: List[str],
+        query_trigrams: Set[str],
+    ) -> Optional[float]:
+        """Score how well a symbol matches the query (None if it does not)."""
+        if entry.name == query:
+            return SCORE_EXACT_NAME
+        if entry.name.startswith(query):
+            # Shorter completions of the prefix rank first
+            return SCORE_NAME_PREFIX + len(query) / len(entry.name)
+        if entry.path == query or entry.path.endswith("." + query):
+            return SCORE_PATH_SUFFIX
+        if query_tokens and _tokens_match(query_tokens, entry.name_tokens):
+            return SCORE_NAME_TOKENS
+        if query in entry.name:
+            return SCORE_NAME_SUBSTRING
+        if query in entry.path:
+            return SCORE_PATH_SUBSTRING
+        if query_tokens and _tokens_match(query_tokens, entry.path_tokens):
+            return SCORE_PATH_TOKENS
+        if len(query) >= 2 and entry.acronym.startswith(query):
+            return SCORE_ACRONYM
+        if query_trigrams:
+            shared = len(query_trigrams & trigrams(entry.path))
+            similarity = shared / len(query_trigrams)
+            if similarity >= MIN_TRIGRAM_SIMILARITY:
+                return SCORE_FUZZY * similarity
+        return None
+
+    def search(
+        self, pattern: Optional[str], limit: Optional[int] = None, offset: int = 0
+    ) -> List[T]:
+        """Find symbols matching a pattern, most relevant first.
+
+        Every symbol whose path contains the pattern (case-insensitively) is
+        returned, plus token and acronym matches ranked below them. Only if
+        there are none of these are typo-tolerant matches returned.
+
+        Args:
+            pattern: Search pattern; if empty, all symbols in index order
+            limit: Optional maximum number of results
+            offset: Number of leading results to skip
+
+        Returns:
+            Matching symbols ordered by relevance
+        """
+        return self.search_page(pattern, limit, offset)[0]
+
+    def search_page(
+        self, pattern: Optional[str], limit: Optional[int] = None, offset: int = 0
+    ) -> Tuple[List[T], int]:
+        """Find one page of symbols matching a pattern.
+
+        Only the requested page is fully ordered, so paging through a large
+        result set does not sort every match for each page.
+
+        Args:
+            pattern: Search pattern; if empty, all symbols in index order
+            limit: Optional maximum number of results
+            offset: Number of leading results to skip
+
+        Returns:
+            Tuple of (matching symbols ordered by relevance, total match count)
+        """
+        end = offset + limit if limit is not None else None
+        query = (pattern or "").strip().lower()
+        if not query:
+            return self.symbols[offset:end], len(self.symbols)
+
+        query_tokens = split_identifier(pattern or "")
+        query_trigrams = trigrams(query)
+
+        scored: List[Tuple[float, Tuple[int, int, int], int]] = []
+        fuzzy: List[Tuple[float, Tuple[int, int, int], int]] = []
+        for position in self._candidates(query, query_tokens):
+            entry = self._entries[position]
+            score = self._score(entry, query, query_tokens, query_trigrams)
+            if score is None:
+                continue
+            # Near misses such as Class19_4 for Class59_4 would otherwise
+            # crowd out and inflate the count of real matches
+            (fuzzy if score <= SCORE_FUZZY else scored).append(
+                (-score, entry.rank, position)
+            )
+        if not scored:
+            scored = fuzzy
+
+        if end is not None and end < len(scored):
+            ranked = heapq.nsmallest(end, scored)
+        else:
+            ranked = sorted(scored)
+        return [self.symbols[position] for _, _, position in ranked[offset:end]], len(
+            scored
+        )
+
+
+def index_symbols(
+    package_name: str, symbols: Iterable[SymbolInfo]
+) -> SymbolSearchIndex[SymbolInfo]:
+    """Build an index over SymbolInfo objects of a package."""
+    return SymbolSearchIndex(
+        (symbol, symbol.name, symbol_path(package_name, symbol), symbol.kind)
+        for symbol in symbols
+    )
@@ -2,12 +2,12 @@
 
 import logging
 import re
-import signal
 import subprocess
 import sys
+import threading
 from functools import wraps
 from pathlib import Path
-from typing import Any, Callable, List, Optional, TypeVar, Union
+from typing import Any, Callable, List, Optional, TypeVar, Union, cast
 
 try:
     import resource
@@ -21,9 +21,19 @@ logger = logging.getLogger(__name__)
 MAX_PACKAGE_NAME_LENGTH = 100
 MAX_SYMBOL_PATH_LENGTH = 200
 MAX_VERSION_LENGTH = 50
+MAX_ROOT_PATH_LENGTH = 4096
+MAX_BATCH_SYMBOLS = 50
+MAX_SEARCH_PAGE_SIZE = 200
+MAX_SCAN_SYMBOLS = 20000
 MAX_RECURSION_DEPTH = 50
 MAX_MEMORY_MB = 512
 MAX_EXECUTION_TIME_SECONDS = 30
+MAX_CONCURRENT_REQUESTS = 8
+MAX_REQUEST_TIME_SECONDS = 60
+
+# Response detail levels, least to most detailed
+DETAIL_LEVELS = ("signature", "summary", "full")
+DEFAULT_DETAIL = "full"
 
 # Regex patterns for validation
 PACKAGE_NAME_PATTERN = re.compile(r"^[a-zA-Z][a-zA-Z0-9_.-]*$")
@@ -44,6 +54,8 @@ PACKAGE_BLACKLIST = {
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+from .deadline import check_deadline, deadline_scope
+
 # Import security exceptions from the main exceptions module
 from .exceptions import (
     PackageSecurityError,
@@ -133,6 +145,64 @@ def validate_version(version: Optional[str]) -> None:
         raise ValidationError(f"Invalid version format: {sanitize_string(version)}")
 
 
+def validate_root(root: Any, client_roots: List[str], base: Optional[Path]) -> Path:
+    """Validate a workspace root passed to a tool.
+
+    Args:
+        root: Directory path, absolute or relative to base
+        client_roots: Roots reported by the client; if any, root must lie
+            within one of them
+        base: Directory relative paths are resolved against (the current
+            directory if None)
+
+    Returns:
+        The resolved directory
+
+    Raises:
+        ValidationError: If validation fails
+    """
+    if not isinstance(root, str):
+        raise ValidationError(f"Root must be string, got {type(root)}")
+
+    if len(root) > MAX_ROOT_PATH_LENGTH:
+        raise ValidationError(
+            f"Root path too long: {len(root)} > {MAX_ROOT_PATH_LENGTH}"
+        )
+
+    try:
+        path = Path(root).expanduser()
+        if base is not None and not path.is_absolute():
+            path = base / path
+        path = path.resolve()
+    except (OSError, RuntimeError, ValueError):
+        raise ValidationError(f"Invalid root path: {sanitize_string(root)}")
+    if not path.is_dir():
+        raise ValidationError(f"Root is not a directory: {sanitize_string(root)}")
+
+    allowed = [Path(client_root).resolve() for client_root in client_roots]
+    if allowed and not any(path == a or a in path.parents for a in allowed):
+        raise ValidationError(
+            f"Root is outside the client's workspace roots: {sanitize_string(root)}"
+        )
+    return path
+
+
+def validate_detail(detail: str) -> None:
+    """Validate a response detail level.
+
+    Args:
+        detail: One of DETAIL_LEVELS
+
+    Raises:
+        ValidationError: If validation fails
+    """
+    if detail not in DETAIL_LEVELS:
+        raise ValidationError(
+            f"detail must be one of {', '.join(DETAIL_LEVELS)}, "
+            f"got {sanitize_string(str(detail))}"
+        )
+
+
 def validate_symbol_path(symbol_path: str) -> None:
     """Validate a symbol path.
 
@@ -205,68 +275,81 @@ def validate_file_path(file_path: Union[str, Path]) -> Path:
     return path
 
 
-def timeout(seconds: int = MAX_EXECUTION_TIME_SECONDS):
+def timeout(seconds: int = MAX_EXECUTION_TIME_SECONDS) -> Callable[[F], F]:
     """Decorator to add timeout protection to functions.
 
+    The call runs under a deadline (see mcpydoc.deadline) that also bounds
+    nested timed calls and subprocess introspection. Enforcement is
+    cooperative: long-running loops call check_deadline(). A call that
+    completes after its deadline still returns its result rather than
+    discarding the finished work. This works on any thread, unlike a SIGALRM
+    handler.
+
     Args:
         seconds: Timeout in seconds
     """
 
     def decorator(func: F) -> F:
         @wraps(func)
-        def wrapper(*args, **kwargs):
-            def timeout_handler(signum, frame):
-                raise ResourceLimitError(
-                    f"Function {func.__name__} timed out after {seconds} seconds"
-                )
-
-            # Set up timeout (Unix only)
-            if hasattr(signal, "SIGALRM"):
-                old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(seconds)
-
-                try:
-                    result = func(*args, **kwargs)
-                finally:
-                    signal.alarm(0)
-                    signal.signal(signal.SIGALRM, old_handler)
-
-                return result
-            else:
-                # Windows doesn't support SIGALRM, just run without timeout
-                logger.warning("Timeout not supported on this platform")
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            operation = f"Function {func.__name__}"
+            check_deadline(operation)
+            with deadline_scope(seconds):
                 return func(*args, **kwargs)
 
-        return wrapper
+        return cast(F, wrapper)
 
     return decorator
 
 
-def memory_limit(max_memory_mb: int = MAX_MEMORY_MB):
+def memory_limit(max_memory_mb: int = MAX_MEMORY_MB) -> Callable[[F], F]:
     """Decorator to add memory limit protection to functions.
 
+    The limit is an RLIMIT_AS on the whole process, so it is only imposed
+    while the calling thread is the only one running. That makes it a no-op
+    in the MCP server, which always runs tool calls on executor threads
+    beside the event loop; there, memory is bounded by the introspection
+    workers' budget (MCPYDOC_WORKSPACE_MEMORY_MB) instead. It still applies
+    to single-threaded library use of the analyzer.
+
     Args:
         max_memory_mb: Maximum memory in MB
     """
 
     def decorator(func: F) -> F:
         @wraps(func)
-        def wrapper(*args, **kwargs):
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # The limit is process-wide, so never impose it while other
+            # threads (e.g. the analyzer thread pool) share the address space
+            if threading.active_count() > 1:
+                logger.debug(
+                    f"Memory limit for {func.__name__} not enforced with other threads running"
+                )
+                return func(*args, **kwargs)
+
             # Set memory limit (Unix only)
+            old_limits = None
             if resource and hasattr(resource, "RLIMIT_AS"):
                 try:
                     max_memory_bytes = max_memory_mb * 1024 * 1024
+                    old_limits = resource.getrlimit(resource.RLIMIT_AS)
+                    # Only lower the soft limit so it can be restored afterwards
                     resource.setrlimit(
-                        resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes)
+                        resource.RLIMIT_AS, (max_memory_bytes, old_limits[1])
                     )
                 except (OSError, ValueError) as e:
+                    old_limits = None
                     logger.warning(f"Could not set memory limit: {e}")
             else:
                 logger.warning("Memory limits not supported on this platform")
 
-            return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if old_limits is not None:
+                    resource.setrlimit(resource.RLIMIT_AS, old_limits)
 
-        return wrapper
+        return cast(F, wrapper)
 
     return decorator
 
@@ -322,17 +405,19 @@ class SecurityContext:
         self.max_memory_mb = max_memory_mb
         self.max_time_seconds = max_time_seconds
         self.old_limits = {}
+        self._deadline = deadline_scope(max_time_seconds)
 
     def __enter__(self):
+        self._deadline.__enter__()
+
         # Set resource limits
         if resource and hasattr(resource, "RLIMIT_AS"):
             try:
                 old_limit = resource.getrlimit(resource.RLIMIT_AS)
                 self.old_limits["memory"] = old_limit
                 max_memory_bytes = self.max_memory_mb * 1024 * 1024
-                resource.setrlimit(
-                    resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes)
-                )
+                # Keep the hard limit so the soft limit can be restored on exit
+                resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, old_limit[1]))
             except (OSError, ValueError) as e:
                 logger.warning(f"Could not set memory limit: {e}")
 
@@ -345,6 +430,7 @@ class SecurityContext:
                 resource.setrlimit(resource.RLIMIT_AS, self.old_limits["memory"])
             except (OSError, ValueError) as e:
                 logger.warning(f"Could not restore memory limit: {e}")
+        self._deadline.__exit__(exc_type, exc_val, exc_tb)
 
 
 def audit_log(operation: str, **kwargs):
@@ -1,38 +1,183 @@
 """Core MCP server implementation for Python package documentation."""
 
-from typing import List, Optional
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 
 from .analyzer import PackageAnalyzer
+from .deadline import remaining_time
 from .documentation import DocumentationParser
 from .exceptions import (
+    ResourceLimitError,
     SourceCodeUnavailableError,
 )
+from .metrics import increment, span
 from .models import (
+    BatchDocumentationResult,
+    DocumentationInfo,
     ModuleDocumentationResult,
     PackageStructure,
     SourceCodeResult,
+    SymbolInfo,
+    SymbolSearchPage,
     SymbolSearchResult,
 )
+from .security import DEFAULT_DETAIL, MAX_CONCURRENT_REQUESTS
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Default number of symbols per search_symbols page
+DEFAULT_SEARCH_PAGE_SIZE = 50
 
 
 class MCPyDoc:
     """MCP server for Python package documentation."""
 
-    def __init__(self, python_paths: Optional[List[str]] = None) -> None:
+    def __init__(
+        self,
+        python_paths: Optional[List[str]] = None,
+        max_workers: int = MAX_CONCURRENT_REQUESTS,
+        working_directory: Optional[Path] = None,
+    ) -> None:
         """Initialize the MCP server.
 
         Args:
             python_paths: List of paths to Python environments to search for packages.
                         If None, uses the current environment.
+            max_workers: Number of threads running blocking analyzer calls.
+            working_directory: Workspace the analyzer detects package managers
+                        in. If None, uses get_working_directory().
         """
-        self.analyzer = PackageAnalyzer(python_paths=python_paths)
+        self.analyzer = PackageAnalyzer(
+            python_paths=python_paths, working_directory=working_directory
+        )
         self.doc_parser = DocumentationParser()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mcpydoc-analyzer"
+        )
+        self._max_workers = max_workers
+        # Calls given up on at their deadline whose threads are still running
+        self._abandoned_calls = 0
+        self._abandoned_lock = threading.Lock()
+
+    @property
+    def abandoned_calls(self) -> int:
+        """Analyzer threads still busy with calls whose request timed out."""
+        with self._abandoned_lock:
+            return self._abandoned_calls
+
+    def _release_abandoned(self, _: Any) -> None:
+        with self._abandoned_lock:
+            self._abandoned_calls -= 1
+
+    async def _run_blocking(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking analyzer call without stalling the event loop.
+
+        Once the request's budget is spent the caller stops waiting, but a
+        thread cannot be interrupted: it keeps its slot of the max_workers
+        pool until the call returns. The call runs under the same deadline,
+        so it gives the slot back at its next check_deadline() or when its
+        subprocess times out; only a step that never checks (e.g. a hanging
+        import) holds it longer. Such calls are counted in abandoned_calls
+        and the ``analyzer.abandoned_calls`` counter, and a warning is logged
+        while they occupy every slot.
+
+        Args:
+            func: Synchronous callable (imports, subprocess introspection)
+            *args: Positional arguments for func
+
+        Returns:
+            The callable's return value
+
+        Raises:
+            ResourceLimitError: If the current request deadline passes first
+        """
+        context = contextvars.copy_context()
+        call = self._executor.submit(functools.partial(context.run, func, *args))
+        future = asyncio.wrap_future(call)
+
+        name = getattr(func, "__name__", "Analyzer call")
+        budget = remaining_time()
+        with span(f"analyzer.{name}"):
+            if budget is None:
+                return await future
+            try:
+                return await asyncio.wait_for(future, budget)
+            except asyncio.TimeoutError:
+                if not call.done():
+                    self._abandon(name, call)
+                raise ResourceLimitError(f"{name} exceeded the request time budget")
+
+    def _abandon(self, name: str, call: "Future[Any]") -> None:
+        """Account for a timed-out call whose thread is still running."""
+        with self._abandoned_lock:
+            self._abandoned_calls += 1
+            abandoned = self._abandoned_calls
+        call.add_done_callback(self._release_abandoned)
+        increment("analyzer.abandoned_calls")
+        if abandoned >= self._max_workers:
+            logger.warning(
+                f"All {self._max_workers} analyzer threads are busy with timed-out "
+                f"calls (latest: {name}); new calls queue until one returns"
+            )
+
+    async def wait_until_ready(self) -> None:
+        """Wait for Python environment detection to finish.
+
+        Detection runs in the background from startup (and after workspace
+        changes), so the server can answer the handshake right away; tool
+        calls await it here instead of holding an analyzer thread.
+
+        Raises:
+            ResourceLimitError: If the current request deadline passes first
+        """
+        ready = asyncio.wrap_future(self.analyzer.environments_ready)
+        budget = remaining_time()
+        try:
+            await asyncio.wait_for(asyncio.shield(ready), budget)
+        except asyncio.TimeoutError:
+            raise ResourceLimitError(
+                "Python environment detection exceeded the request time budget"
+            )
+
+    def shutdown(self) -> None:
+        """Release the analyzer thread pool."""
+        self._executor.shutdown(wait=False)
+
+    def _documentation(
+        self, docstring: Optional[str], detail: str = DEFAULT_DETAIL
+    ) -> DocumentationInfo:
+        """Document a docstring as far as a detail level needs.
+
+        Docstrings are only fully parsed at "full" detail; "summary" takes the
+        first paragraph and "signature" skips documentation altogether.
+        """
+        if detail == "signature":
+            return DocumentationInfo()
+        with span("docstring.parse"):
+            if detail == "summary":
+                return self.doc_parser.summarize_docstring(docstring)
+            return self.doc_parser.parse_docstring(docstring)
+
+    def _type_hints(self, symbol: SymbolInfo, detail: str) -> Dict[str, str]:
+        """Get type hints, which only "full" detail responses include."""
+        if detail != DEFAULT_DETAIL:
+            return {}
+        return self.analyzer.get_type_hints_safe(symbol)
 
     async def get_module_documentation(
         self,
         package_name: str,
         module_path: Optional[str] = None,
         version: Optional[str] = None,
+        detail: str = DEFAULT_DETAIL,
     ) -> ModuleDocumentationResult:
         """Get comprehensive documentation for a Python module/class.
 
@@ -40,6 +185,8 @@ class MCPyDoc:
             package_name: Name of the package containing the module
             module_path: Optional dot-separated path to specific module/class
             version: Optional specific version to use
+            detail: "signature", "summary" or "full"; lower levels skip
+                reading source, parsing docstrings and summarizing methods
 
         Returns:
             ModuleDocumentationResult containing package and symbol documentation
@@ -49,12 +196,16 @@ class MCPyDoc:
             ImportError: If module cannot be imported
             SymbolNotFoundError: If symbol cannot be found
         """
-        package_info = self.analyzer.get_package_info(package_name, version)
+        package_info = await self._run_blocking(
+            self.analyzer.get_package_info, package_name, version
+        )
 
         if module_path:
-            symbol_info = self.analyzer.get_symbol_info(package_name, module_path)
-            documentation = self.doc_parser.parse_docstring(symbol_info.docstring)
-            type_hints = self.analyzer.get_type_hints_safe(symbol_info)
+            symbol_info = await self._run_blocking(
+                self.analyzer.get_symbol_info, package_name, module_path, detail
+            )
+            documentation = self._documentation(symbol_info.docstring, detail)
+            type_hints = self._type_hints(symbol_info, detail)
 
             symbol_result = SymbolSearchResult(
                 symbol=symbol_info,
@@ -100,8 +251,12 @@ class MCPyDoc:
         else:
             # Return package-level documentation
             # Use get_package_docstring which uses subprocess introspection
-            docstring = self.analyzer.get_package_docstring(package_name, version)
-            documentation = self.doc_parser.parse_docstring(docstring)
+            documentation = None
+            if detail != "signature":
+                docstring = await self._run_blocking(
+                    self.analyzer.get_package_docstring, package_name, version
+                )
+                documentation = self._documentation(docstring, detail)
 
             # Suggest starting points for package exploration
             suggested_next_steps = [
@@ -117,6 +272,61 @@ class MCPyDoc:
                 alternative_paths=[],
             )
 
+    async def get_symbols_documentation(
+        self,
+        package_name: str,
+        symbol_paths: List[str],
+        version: Optional[str] = None,
+        detail: str = DEFAULT_DETAIL,
+    ) -> BatchDocumentationResult:
+        """Get documentation for several symbols of a package in one call.
+
+        Args:
+            package_name: Name of the package containing the symbols
+            symbol_paths: Dot-separated paths to the symbols
+            version: Optional specific version to use
+            detail: "signature", "summary" or "full" (see get_module_documentation)
+
+        Returns:
+            BatchDocumentationResult with resolved symbols in request order
+            and the paths that could not be resolved
+
+        Raises:
+            PackageNotFoundError: If package not found
+            ValidationError: If input validation fails
+        """
+        package_info = await self._run_blocking(
+            self.analyzer.get_package_info, package_name, version
+        )
+        symbols = await self._run_blocking(
+            self.analyzer.get_symbols_info, package_name, symbol_paths, detail
+        )
+
+        results = []
+        not_found = []
+        for symbol_path in dict.fromkeys(symbol_paths):
+            symbol_info = symbols.get(symbol_path)
+            if symbol_info is None:
+                not_found.append(symbol_path)
+                continue
+
+            parent_class = None
+            if symbol_info.kind == "method" and "." in symbol_info.qualname:
+                parent_class = symbol_info.qualname.split(".")[-2]
+
+            results.append(
+                SymbolSearchResult(
+                    symbol=symbol_info,
+                    documentation=self._documentation(symbol_info.docstring, detail),
+                    type_hints=self._type_hints(symbol_info, detail),
+                    parent_class=parent_class,
+                )
+            )
+
+        return BatchDocumentationResult(
+            package=package_info, symbols=results, not_found=not_found
+        )
+
     async def search_package_symbols(
         self,
         package_name: str,
@@ -131,47 +341,83 @@ class MCPyDoc:
             version: Optional specific version to use
 
         Returns:
-            List of SymbolSearchResult objects matching the criteria
+            List of SymbolSearchResult objects matching the criteria, ranked by
+            relevance (exact name, prefix, token, substring, fuzzy)
 
         Raises:
             PackageNotFoundError: If package not found
             ImportError: If package cannot be imported
         """
-        symbols = self.analyzer.search_symbols(package_name, search_pattern, version)
-        results = []
+        symbols = await self._run_blocking(
+            self.analyzer.search_symbols, package_name, search_pattern, version
+        )
+        return [self._symbol_search_result(symbol) for symbol in symbols]
 
-        for symbol in symbols:
-            documentation = self.doc_parser.parse_docstring(symbol.docstring)
-            type_hints = self.analyzer.get_type_hints_safe(symbol)
+    async def search_package_symbols_page(
+        self,
+        package_name: str,
+        search_pattern: Optional[str] = None,
+        version: Optional[str] = None,
+        offset: int = 0,
+        limit: int = DEFAULT_SEARCH_PAGE_SIZE,
+        detail: str = DEFAULT_DETAIL,
+    ) -> SymbolSearchPage:
+        """Search for one page of symbols in a package.
 
-            # Determine parent class for methods
-            parent_class = None
-            if symbol.kind == "method" and "." in symbol.qualname:
-                parent_class = symbol.qualname.split(".")[-2]
+        Docstrings are parsed only for the symbols in the returned page, so
+        the cost of a page does not grow with the number of matches.
+
+        Args:
+            package_name: Name of the package to search
+            search_pattern: Optional pattern to filter symbols
+            version: Optional specific version to use
+            offset: Number of leading results to skip
+            limit: Maximum number of results in the page
+            detail: "signature" skips docstring parsing, "summary" only takes
+                each docstring's first paragraph
 
-            result = SymbolSearchResult(
+        Returns:
+            SymbolSearchPage with the ranked results and paging information
+
+        Raises:
+            PackageNotFoundError: If package not found
+            ImportError: If package cannot be imported
+        """
+        symbols, total = await self._run_blocking(
+            self.analyzer.search_symbols_page,
+            package_name,
+            search_pattern,
+            version,
+            offset,
+            limit,
+        )
+        next_offset = offset + len(symbols)
+        return SymbolSearchPage(
+            results=[self._symbol_search_result(symbol, detail) for symbol in symbols],
+            total=total,
+            offset=offset,
+            next_offset=next_offset if next_offset < total else None,
+        )
+
+    def _symbol_search_result(
+        self, symbol: SymbolInfo, detail: str = DEFAULT_DETAIL
+    ) -> SymbolSearchResult:
+        """Parse the documentation of a search hit."""
+        documentation = self._documentation(symbol.docstring, detail)
+        type_hints = self._type_hints(symbol, detail)
+
+        # Determine parent class for methods
+        parent_class = None
+        if symbol.kind == "method" and "." in symbol.qualname:
+            parent_class = symbol.qualname.split(".")[-2]
+
+        with span("models.search_result"):
+            return SymbolSearchResult(
                 symbol=symbol,
                 documentation=documentation,
                 type_hints=type_hints,
                 parent_class=parent_class,
             )
-            results.append(result)
-
-        # Sort results with exact matches first, then partial matches
-        def sort_key(result):
-            if search_pattern:
-                name = result.symbol.name.lower()
-                pattern = search_pattern.lower()
-                if name == pattern:
-                    return 0  # Exact match - highest priority
-                elif pattern in name:
-                    return 1  # Partial match - medium priority
-                else:
-                    return 2  # Other matches - lowest priority
-            return 0  # No pattern, maintain original order
-
-        results.sort(key=sort_key)
-        return results
 
     async def get_source_code(
         self,
@@ -195,7 +441,9 @@ class MCPyDoc:
             SymbolNotFoundError: If symbol cannot be found
             SourceCodeUnavailableError: If source code is not available
         """
-        symbol_info = self.analyzer.get_symbol_info(package_name, symbol_name)
+        symbol_info = await self._run_blocking(
+            self.analyzer.get_symbol_info, package_name, symbol_name
+        )
 
         if not symbol_info.source:
             raise SourceCodeUnavailableError(
@@ -217,12 +465,15 @@ class MCPyDoc:
         self,
         package_name: str,
         version: Optional[str] = None,
+        detail: str = DEFAULT_DETAIL,
     ) -> PackageStructure:
         """Discover package structure and available modules.
 
         Args:
             package_name: Name of the package to analyze
             version: Optional specific version to use
+            detail: "signature" skips docstrings (including the package's),
+                "summary" only takes each docstring's first paragraph
 
         Returns:
             PackageStructure containing package metadata and symbol structure
@@ -231,8 +482,10 @@ class MCPyDoc:
             PackageNotFoundError: If package not found
             ImportError: If package cannot be imported
         """
-        package_info = self.analyzer.get_package_info(package_name, version)
-        symbols = self.analyzer.search_symbols(package_name)
+        package_info = await self._run_blocking(
+            self.analyzer.get_package_info, package_name, version
+        )
+        symbols = await self._run_blocking(self.analyzer.search_symbols, package_name)
 
         # Group symbols by kind
         modules = []
@@ -241,14 +494,15 @@ class MCPyDoc:
         other = []
 
         for symbol in symbols:
-            documentation = self.doc_parser.parse_docstring(symbol.docstring)
-            type_hints = self.analyzer.get_type_hints_safe(symbol)
-
-            result = SymbolSearchResult(
-                symbol=symbol,
-                documentation=documentation,
-                type_hints=type_hints,
-            )
+            documentation = self._documentation(symbol.docstring, detail)
+            type_hints = self._type_hints(symbol, detail)
+
+            with span("models.search_result"):
+                result = SymbolSearchResult(
+                    symbol=symbol,
+                    documentation=documentation,
+                    type_hints=type_hints,
+                )
 
             if symbol.kind == "module":
                 modules.append(result)
@@ -260,8 +514,12 @@ class MCPyDoc:
                 other.append(result)
 
         # Get package-level documentation using subprocess introspection
-        docstring = self.analyzer.get_package_docstring(package_name, version)
-        package_documentation = self.doc_parser.parse_docstring(docstring)
+        package_documentation = DocumentationInfo()
+        if detail != "signature":
+            docstring = await self._run_blocking(
+                self.analyzer.get_package_docstring, package_name, version
+            )
+            package_documentation = self._documentation(docstring, detail)
 
         # Generate suggested next steps based on what was found
         suggested_next_steps = []
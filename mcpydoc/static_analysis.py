@@ -0,0 +1,558 @@
+"""Static (AST-based) symbol extraction for MCPyDoc.
+
+Import-based symbol search runs ``import_module`` on a package and every
+submodule, which is slow for heavy packages, executes their import-time side
+effects and can exceed the search timeout. This module parses the ``.py``
+files of an installed package directly instead, collecting classes,
+functions, methods, signatures, decorators and docstrings without importing
+anything. Names a package re-exports from its private modules (``from
+._impl import Client`` in ``__init__.py``) are followed to their definitions.
+Import-based introspection remains the fallback for C extensions and
+dynamically created attributes.
+
+Extracted symbols use the same dictionary shape as SEARCH_SYMBOLS_SCRIPT.
+"""
+
+import ast
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .deadline import check_deadline
+from .security import MAX_SCAN_SYMBOLS
+
+logger = logging.getLogger(__name__)
+
+# Safety limits for pathological packages
+MAX_SOURCE_FILE_BYTES = 2 * 1024 * 1024
+
+# Suffixes of compiled extension modules (never parsed, listed as modules only)
+EXTENSION_SUFFIXES = (".so", ".pyd")
+
+# Longest chain of ``from .x import name`` re-exports followed to a definition
+MAX_REEXPORT_DEPTH = 8
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+def find_package_source(package_name: str, location: Optional[Path]) -> Optional[Path]:
+    """Locate the source of an installed package.
+
+    Args:
+        package_name: Import name of the package
+        location: PackageInfo.location (site-packages directory for installed
+            distributions, the package directory for standard library modules)
+
+    Returns:
+        Path to the package directory or single-module ``.py`` file, or None
+    """
+    if location is None:
+        return None
+
+    import_name = package_name.replace("-", "_")
+    top_level = import_name.split(".")[0]
+    candidates = [
+        location / import_name.replace(".", "/"),
+        location / f"{import_name.replace('.', '/')}.py",
+    ]
+    if location.name == top_level:
+        # Standard library packages report their own directory as location
+        candidates.append(location)
+
+    for candidate in candidates:
+        if candidate.is_dir() and any(candidate.glob("*.py")):
+            return candidate
+        if candidate.is_file() and candidate.suffix == ".py":
+            return candidate
+    return None
+
+
+def _iter_modules(
+    package_name: str, source: Path
+) -> Iterator[Tuple[str, Optional[Path]]]:
+    """Yield (dotted module name, file) pairs for a package's modules.
+
+    Extension modules are yielded with a None file. Private modules and
+    directories that are not regular packages are skipped, matching what
+    ``pkgutil.iter_modules`` would discover.
+    """
+    if source.is_file():
+        yield package_name, source
+        return
+
+    init_file = source / "__init__.py"
+    yield package_name, init_file if init_file.exists() else None
+
+    try:
+        entries = sorted(source.iterdir())
+    except OSError as e:
+        logger.debug(f"Could not list {source}: {e}")
+        return
+
+    for entry in entries:
+        name = entry.name
+        if name.startswith((".", "_")):
+            continue
+        if entry.is_dir():
+            if (entry / "__init__.py").exists():
+                yield from _iter_modules(f"{package_name}.{name}", entry)
+        elif entry.suffix == ".py":
+            yield f"{package_name}.{entry.stem}", entry
+        elif entry.suffix in EXTENSION_SUFFIXES:
+            yield f"{package_name}.{name.split('.')[0]}", None
+
+
+def _format_arguments(node: FunctionNode, drop_first: bool = False) -> str:
+    """Render a function's parameter list like ``str(inspect.signature(...))``."""
+    args = node.args
+    if drop_first:
+        args = ast.arguments(
+            posonlyargs=list(args.posonlyargs),
+            args=list(args.args),
+            vararg=args.vararg,
+            kwonlyargs=args.kwonlyargs,
+            kw_defaults=args.kw_defaults,
+            kwarg=args.kwarg,
+            defaults=list(args.defaults),
+        )
+        positional = args.posonlyargs or args.args
+        if positional:
+            positional.pop(0)
+            # Defaults align with the end of the positional parameters
+            total = len(args.posonlyargs) + len(args.args)
+            del args.defaults[: max(0, len(args.defaults) - total)]
+
+    signature = f"({ast.unparse(args)})"
+    if node.returns is not None and not drop_first:
+        signature += f" -> {ast.unparse(node.returns)}"
+    return signature
+
+
+def _decorators(node: Union[FunctionNode, ast.ClassDef]) -> List[str]:
+    """Render a definition's decorators as source strings."""
+    return [ast.unparse(decorator) for decorator in node.decorator_list]
+
+
+def _symbol(
+    name: str,
+    qualname: str,
+    kind: str,
+    module: str,
+    path: str,
+    docstring: Optional[str],
+    signature: Optional[str],
+    decorators: List[str],
+    file: Path,
+    lineno: int,
+) -> Dict[str, Any]:
+    """Build a symbol dictionary in the SEARCH_SYMBOLS_SCRIPT shape."""
+    return {
+        "name": name,
+        "qualname": qualname,
+        "kind": kind,
+        "module": module,
+        "docstring": docstring,
+        "signature": signature,
+        "path": path,
+        "decorators": decorators or None,
+        "file": str(file),
+        "lineno": lineno,
+    }
+
+
+def _top_level(body: List[ast.stmt]) -> Iterator[ast.stmt]:
+    """Yield a module's statements, including those in top-level ``if`` and
+    ``try`` blocks (e.g. optional speedups imported with a fallback)."""
+    for node in body:
+        yield node
+        if isinstance(node, ast.If):
+            yield from _top_level(node.body)
+            yield from _top_level(node.orelse)
+        elif isinstance(node, ast.Try):
+            yield from _top_level(node.body)
+            for handler in node.handlers:
+                yield from _top_level(handler.body)
+            yield from _top_level(node.orelse)
+
+
+def _assigned_names(node: ast.stmt) -> List[str]:
+    """Get the plain names an assignment statement binds."""
+    if isinstance(node, ast.Assign):
+        targets = node.targets
+    elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+        targets = [node.target]
+    else:
+        return []
+    return [target.id for target in targets if isinstance(target, ast.Name)]
+
+
+def _dunder_all(tree: ast.Module) -> Optional[List[str]]:
+    """Read a module's literal ``__all__``, if it has one."""
+    for node in _top_level(tree.body):
+        if "__all__" in _assigned_names(node) and isinstance(
+            getattr(node, "value", None), (ast.List, ast.Tuple)
+        ):
+            return [
+                element.value
+                for element in node.value.elts  # type: ignore[attr-defined]
+                if isinstance(element, ast.Constant) and isinstance(element.value, str)
+            ]
+    return None
+
+
+def _is_private(package_name: str, module_name: str) -> bool:
+    """Whether a module of the package is skipped by _iter_modules."""
+    suffix = module_name[len(package_name) :].lstrip(".")
+    return any(part.startswith("_") for part in suffix.split(".") if part)
+
+
+# Resolved name: (defining module, its file, the definition or None for names
+# import-based search does not list, such as constants and modules)
+Definition = Tuple[str, Path, Optional[Union[FunctionNode, ast.ClassDef]]]
+
+# Name imported by ``from ... import``: (source module, or None if outside the
+# package; name in the source module)
+Imported = Tuple[Optional[str], str]
+
+# A module's top-level definitions, imported names and ``import *`` sources
+Scope = Tuple[Dict[str, Definition], Dict[str, Imported], List[str]]
+
+
+class _PackageSource:
+    """Parsed modules of one package, private ones included, for following
+    re-exports to their definitions during one extraction."""
+
+    def __init__(self, package_name: str, source: Path) -> None:
+        self.package_name = package_name
+        self.source = source
+        self._files: Dict[str, Optional[Path]] = {}
+        self._trees: Dict[Path, Optional[ast.Module]] = {}
+        self._scopes: Dict[str, Scope] = {}
+
+    def parse(self, file: Path) -> Optional[ast.Module]:
+        """Parse a source file once (None if unreadable or oversized)."""
+        if file not in self._trees:
+            tree = None
+            try:
+                if file.stat().st_size > MAX_SOURCE_FILE_BYTES:
+                    logger.debug(f"Skipping oversized source file {file}")
+                else:
+                    tree = ast.parse(file.read_bytes(), filename=str(file))
+            except (OSError, SyntaxError, ValueError) as e:
+                logger.debug(f"Could not parse {file}: {e}")
+            self._trees[file] = tree
+        return self._trees[file]
+
+    def module_file(self, module_name: str) -> Optional[Path]:
+        """Locate the source file of a module of the package."""
+        if module_name not in self._files:
+            file = None
+            if self.source.is_file():
+                if module_name == self.package_name:
+                    file = self.source
+            else:
+                parts = module_name.split(".")[len(self.package_name.split(".")) :]
+                relative = Path(*parts)
+                for candidate in (
+                    self.source / relative / "__init__.py",
+                    self.source / f"{relative}.py",
+                ):
+                    if candidate.is_file():
+                        file = candidate
+                        break
+            self._files[module_name] = file
+        return self._files[module_name]
+
+    def import_target(
+        self, module_name: str, file: Path, node: ast.ImportFrom
+    ) -> Optional[str]:
+        """Get the module a ``from ... import`` reads, if within the package."""
+        if node.level:
+            base = module_name.split(".")
+            if file.name != "__init__.py":
+                base = base[:-1]
+            base = base[: len(base) - (node.level - 1)]
+            target = ".".join(base + ([node.module] if node.module else []))
+        else:
+            target = node.module or ""
+        if target == self.package_name or target.startswith(f"{self.package_name}."):
+            return target
+        return None
+
+    def _scope(self, module_name: str) -> Scope:
+        """Get a module's top-level names and its ``import *`` sources."""
+        if module_name in self._scopes:
+            return self._scopes[module_name]
+
+        bindings: Dict[str, Definition] = {}
+        imports: Dict[str, Imported] = {}
+        stars: List[str] = []
+        file = self.module_file(module_name)
+        tree = self.parse(file) if file is not None else None
+        if file is not None and tree is not None:
+            for node in _top_level(tree.body):
+                if isinstance(
+                    node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+                ):
+                    bindings.setdefault(node.name, (module_name, file, node))
+                elif isinstance(node, ast.Import):
+                    for alias in node.names:
+                        name = alias.asname or alias.name.split(".")[0]
+                        bindings.setdefault(name, (module_name, file, None))
+                elif isinstance(node, ast.ImportFrom):
+                    target = self.import_target(module_name, file, node)
+                    for alias in node.names:
+                        if alias.name == "*":
+                            if target is not None:
+                                stars.append(target)
+                        else:
+                            imports.setdefault(
+                                alias.asname or alias.name, (target, alias.name)
+                            )
+                else:
+                    for name in _assigned_names(node):
+                        bindings.setdefault(name, (module_name, file, None))
+        self._scopes[module_name] = (bindings, imports, stars)
+        return self._scopes[module_name]
+
+    def resolve(
+        self, module_name: str, name: str, depth: int = 0
+    ) -> Optional[Definition]:
+        """Find where a name bound in a module is defined, following ``from .x
+        import name`` chains into private modules.
+
+        Returns:
+            The definition, or None if it cannot be found statically
+            (extension modules, module ``__getattr__``, names created at
+            runtime)
+        """
+        if depth > MAX_REEXPORT_DEPTH:
+            return None
+        bindings, imports, stars = self._scope(module_name)
+        if name in bindings:
+            return bindings[name]
+        if name in imports:
+            target, original = imports[name]
+            if target is None:
+                # Defined outside the package, which searches leave out
+                return module_name, self.source, None
+            submodule = f"{target}.{original}"
+            submodule_file = self.module_file(submodule)
+            if submodule_file is not None:
+                return submodule, submodule_file, None
+            return self.resolve(target, original, depth + 1)
+
+        for target in stars:
+            definition = self.resolve(target, name, depth + 1)
+            if definition is not None:
+                return definition
+
+        # ``__all__`` may name submodules that ``import *`` loads
+        submodule = f"{module_name}.{name}"
+        submodule_file = self.module_file(submodule)
+        if submodule_file is not None:
+            return submodule, submodule_file, None
+        return None
+
+    def reexported_names(
+        self, module_name: str, file: Path, tree: ast.Module
+    ) -> List[str]:
+        """List the public names a module imports from elsewhere in the
+        package or exports through ``__all__`` without defining them."""
+        defined = {
+            node.name
+            for node in tree.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        }
+        names: Dict[str, None] = {}
+        for node in _top_level(tree.body):
+            if not isinstance(node, ast.ImportFrom):
+                continue
+            if self.import_target(module_name, file, node) is None:
+                continue
+            for alias in node.names:
+                if alias.name != "*":
+                    names[alias.asname or alias.name] = None
+        for name in _dunder_all(tree) or []:
+            names[name] = None
+        return [n for n in names if not n.startswith("_") and n not in defined]
+
+
+def _definition_symbols(
+    node: Union[FunctionNode, ast.ClassDef], module_name: str, path: str, file: Path
+) -> List[Dict[str, Any]]:
+    """Build the symbols of one function, or of one class and its methods."""
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return [
+            _symbol(
+                name=node.name,
+                qualname=node.name,
+                kind="function",
+                module=module_name,
+                path=path,
+                docstring=ast.get_docstring(node),
+                signature=_format_arguments(node),
+                decorators=_decorators(node),
+                file=file,
+                lineno=node.lineno,
+            )
+        ]
+
+    methods = [
+        child
+        for child in node.body
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+    ]
+    init = next((m for m in methods if m.name == "__init__"), None)
+    symbols = [
+        _symbol(
+            name=node.name,
+            qualname=node.name,
+            kind="class",
+            module=module_name,
+            path=path,
+            docstring=ast.get_docstring(node),
+            signature=_format_arguments(init, drop_first=True) if init else None,
+            decorators=_decorators(node),
+            file=file,
+            lineno=node.lineno,
+        )
+    ]
+    for method in methods:
+        if method.name.startswith("_"):
+            continue
+        qualname = f"{node.name}.{method.name}"
+        symbols.append(
+            _symbol(
+                name=method.name,
+                qualname=qualname,
+                kind="method",
+                module=module_name,
+                path=f"{path}.{method.name}",
+                docstring=ast.get_docstring(method),
+                signature=_format_arguments(method),
+                decorators=_decorators(method),
+                file=file,
+                lineno=method.lineno,
+            )
+        )
+    return symbols
+
+
+def _extract_module(
+    package: _PackageSource,
+    module_name: str,
+    prefix: str,
+    file: Path,
+    unresolved: List[str],
+) -> List[Dict[str, Any]]:
+    """Extract the public symbols (and their methods) of one file.
+
+    Besides the file's own top-level definitions, names it re-exports from
+    private modules of the package (``from ._impl import Client``,
+    ``__all__``) are listed under this module, as import-based search does.
+    Re-exports that cannot be resolved statically are appended to
+    ``unresolved``.
+    """
+    tree = package.parse(file)
+    if tree is None:
+        return []
+
+    symbols = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if not node.name.startswith("_"):
+                symbols.extend(
+                    _definition_symbols(node, module_name, f"{prefix}{node.name}", file)
+                )
+
+    for name in package.reexported_names(module_name, file, tree):
+        definition = package.resolve(module_name, name)
+        if definition is None:
+            unresolved.append(f"{prefix}{name}")
+            continue
+        defining_module, defining_file, defining_node = definition
+        # Definitions in public modules are listed with those modules already
+        if defining_node is not None and _is_private(
+            package.package_name, defining_module
+        ):
+            symbols.extend(
+                _definition_symbols(
+                    defining_node, defining_module, f"{prefix}{name}", defining_file
+                )
+            )
+    return symbols
+
+
+def _module_docstring(package: _PackageSource, file: Optional[Path]) -> Optional[str]:
+    """Get a module's docstring from its (shared) parse tree."""
+    tree = package.parse(file) if file is not None else None
+    return ast.get_docstring(tree) if tree is not None else None
+
+
+def extract_symbols(
+    package_name: str,
+    source: Path,
+    pattern: Optional[str] = None,
+    unresolved: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Extract symbols from a package's source files without importing it.
+
+    Args:
+        package_name: Import name of the package
+        source: Package directory or single-module file (see find_package_source)
+        pattern: Optional case-insensitive substring to match against the
+            dotted symbol path, as in SEARCH_SYMBOLS_SCRIPT
+        unresolved: Optional list that receives the dotted paths of public
+            names the package re-exports but whose definitions static
+            analysis cannot find; callers fall back to import-based search
+            when it is not empty
+
+    Returns:
+        List of symbol dictionaries in the SEARCH_SYMBOLS_SCRIPT shape, plus
+        ``decorators``, ``file`` and ``lineno`` keys
+    """
+    pattern_lower = pattern.lower() if pattern else None
+    results: List[Dict[str, Any]] = []
+    package = _PackageSource(package_name, source)
+    if unresolved is None:
+        unresolved = []
+
+    for module_name, file in _iter_modules(package_name, source):
+        check_deadline(f"Static extraction of {package_name}")
+        suffix = module_name[len(package_name) :].lstrip(".")
+        prefix = f"{suffix}." if suffix else ""
+
+        candidates = []
+        if suffix:
+            candidates.append(
+                _symbol(
+                    name=suffix.split(".")[-1],
+                    qualname=suffix,
+                    kind="module",
+                    module=module_name,
+                    path=suffix,
+                    docstring=_module_docstring(package, file),
+                    signature=None,
+                    decorators=[],
+                    file=file or source,
+                    lineno=0,
+                )
+            )
+        if file is not None:
+            candidates.extend(
+                _extract_module(package, module_name, prefix, file, unresolved)
+            )
+
+        for symbol in candidates:
+            if pattern_lower and pattern_lower not in symbol["path"].lower():
+                continue
+            results.append(symbol)
+            if len(results) >= MAX_SCAN_SYMBOLS:
+                logger.warning(
+                    f"Static extraction for {package_name} stopped at "
+                    f"{MAX_SCAN_SYMBOLS} symbols"
+                )
+                return results
+
+    return results
@@ -4,36 +4,669 @@ This module provides introspection capabilities by running Python code in the
 project's own environment via package managers (uv, poetry, pipenv). This solves:
 1. Python version mismatch issues (C extensions)
 2. Workspace/monorepo package boundary handling
+
+Scripts are executed by a persistent worker per project root (see
+worker_pool.py) so interpreter startup and package imports are paid once,
+with a one-shot subprocess as the fallback. Package-manager runners such as
+``uv run python`` are resolved once to the interpreter they start, which is
+then invoked directly (see resolve_interpreter).
 """
 
 import json
 import logging
+import os
 import shutil
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .deadline import check_deadline, remaining_time
+from .metrics import increment, span
+from .security import DEFAULT_DETAIL, DETAIL_LEVELS, MAX_SCAN_SYMBOLS
+from .symbol_index import (
+    LOCKFILE_NAMES,
+    PersistentSymbolIndex,
+    filter_symbols,
+    get_persistent_index,
+    lockfile_hash,
+)
+from .worker_pool import (
+    SlotTimeoutExpired,
+    WorkerError,
+    checkout_worker,
+    persistent_workers_enabled,
+    project_slot,
+    restart_workers,
+    run_process,
+    shutdown_workers,
+)
 
 logger = logging.getLogger(__name__)
 
 # Cache for package manager detection per directory
 _package_manager_cache: Dict[str, Optional[Tuple[List[str], Path]]] = {}
 
-# Cache for introspection results (with simple TTL via dictionary size limit)
-_introspection_cache: Dict[str, Any] = {}
-_CACHE_SIZE_LIMIT = 100
+# Cache for introspection results, least recently used first. Entries carry
+# an environment fingerprint and are revalidated on every read.
+_introspection_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+_CACHE_SIZE_LIMIT = 2048
+_cache_lock = threading.Lock()
+
+# Failed lookups, least recently used first. Entries expire after
+# negative_cache_ttl() seconds or as soon as their environment changes.
+_failure_cache: "OrderedDict[str, _FailureEntry]" = OrderedDict()
+_FAILURE_CACHE_SIZE_LIMIT = 512
+_failure_cache_lock = threading.Lock()
+NEGATIVE_CACHE_TTL_SECONDS = 30.0
+
+# Exception types (as reported by the scripts) that mean "does not exist"
+NOT_FOUND_ERROR_TYPES = (
+    "PackageNotFoundError",
+    "ModuleNotFoundError",
+    "AttributeError",
+)
+
+# Concrete interpreters behind package-manager runners, keyed by project root
+# and runner, each stored with the lockfile hash it was resolved for
+_interpreter_cache: Dict[str, Tuple[str, str]] = {}
+_interpreter_cache_lock = threading.Lock()
+_interpreter_resolution_enabled = os.environ.get(
+    "MCPYDOC_RESOLVE_INTERPRETER", "1"
+).lower() not in ("0", "false", "no", "off")
+
+RESOLVE_INTERPRETER_SCRIPT = "import sys; print(sys.executable)"
 
+# Persistent index entry holding the package-level docstring
+PACKAGE_DOCSTRING_KEY = ":package_docstring"
+
+
+# (path, mtime_ns, size) of every file and directory a result was read from
+Fingerprint = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
+
+def _file_stat(path: str) -> Tuple[str, Optional[int], Optional[int]]:
+    """Get the (path, mtime_ns, size) fingerprint of one file or directory."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    return (path, stat.st_mtime_ns, stat.st_size)
 
-def _add_to_cache(key: str, value: Any) -> None:
-    """Add item to cache with size limit."""
-    if len(_introspection_cache) >= _CACHE_SIZE_LIMIT:
-        # Simple FIFO eviction
-        _introspection_cache.pop(next(iter(_introspection_cache)))
-    _introspection_cache[key] = value
+
+def _fingerprint(*paths: Optional[str]) -> Fingerprint:
+    """Fingerprint the files a result depends on (missing paths are skipped)."""
+    return tuple(_file_stat(path) for path in paths if path)
+
+
+def _fingerprint_is_current(fingerprint: Any) -> bool:
+    """Check a (possibly JSON round-tripped) fingerprint against the filesystem.
+
+    Costs one stat call per path, independent of package size.
+    """
+    return all(_file_stat(stat[0]) == tuple(stat) for stat in fingerprint or ())
+
+
+class CacheEntry:
+    """A cached result and the environment it was computed in.
+
+    Shared by the introspection caches here and the analyzer's search indexes.
+    """
+
+    __slots__ = ("value", "project_root", "lock_hash", "fingerprint")
+
+    def __init__(
+        self,
+        value: Any,
+        project_root: Optional[Path],
+        lock_hash: str,
+        fingerprint: Fingerprint,
+    ) -> None:
+        self.value = value
+        self.project_root = project_root
+        self.lock_hash = lock_hash
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def create(
+        cls, value: Any, project_root: Optional[Path], *paths: Optional[str]
+    ) -> "CacheEntry":
+        """Record a result with the current lockfile hash and file stats.
+
+        Args:
+            value: Result to cache
+            project_root: Project root whose lockfiles the result depends on
+            *paths: Files and directories the result was read from
+
+        Returns:
+            The cache entry
+        """
+        return cls(
+            value,
+            project_root,
+            lockfile_hash(project_root) if project_root is not None else "",
+            _fingerprint(*paths),
+        )
+
+    def is_valid(self) -> bool:
+        """Check that lockfiles, dist-info directory and sources are unchanged."""
+        if self.project_root is not None:
+            # lockfile_hash is itself cached by lockfile stats
+            if lockfile_hash(self.project_root) != self.lock_hash:
+                return False
+        return _fingerprint_is_current(self.fingerprint)
+
+
+def _changed_at(entry: CacheEntry) -> float:
+    """Get when the files a stale entry depends on last changed.
+
+    Deleted files count as changed when their directory last changed.
+    """
+    # (path, whether it existed when the entry was cached)
+    paths = [(stat[0], stat[1] is not None) for stat in entry.fingerprint or ()]
+    if entry.project_root is not None:
+        paths.extend((str(entry.project_root / name), False) for name in LOCKFILE_NAMES)
+    changed_at = 0.0
+    for path, existed in paths:
+        candidates = [path, os.path.dirname(path)] if existed else [path]
+        for candidate in candidates:
+            try:
+                stat = os.stat(candidate)
+            except OSError:
+                continue
+            # ctime also covers files installed with preserved mtimes
+            changed_at = max(changed_at, stat.st_mtime, stat.st_ctime)
+            break
+    return changed_at
+
+
+def _dist_info_path(package_name: str, project_root: Path) -> Optional[str]:
+    """Get the dist-info directory of a package from its cached metadata."""
+    with _cache_lock:
+        entry = _introspection_cache.get(f"pkg_info:{package_name}:{project_root}")
+    if entry is None or not isinstance(entry.value, dict):
+        return None
+    return entry.value.get("dist_info")
+
+
+def _add_to_cache(
+    key: str,
+    value: Any,
+    project_root: Optional[Path] = None,
+    fingerprint: Fingerprint = (),
+) -> None:
+    """Add item to cache with its environment fingerprint.
+
+    Args:
+        key: Cache key
+        value: Introspection result
+        project_root: Project root whose lockfiles the result depends on
+        fingerprint: Fingerprint of the dist-info directory and source files
+            the result was read from
+    """
+    entry = CacheEntry(
+        value,
+        project_root,
+        lockfile_hash(project_root) if project_root is not None else "",
+        fingerprint,
+    )
+    with _cache_lock:
+        _introspection_cache[key] = entry
+        _introspection_cache.move_to_end(key)
+        while len(_introspection_cache) > _CACHE_SIZE_LIMIT:
+            _introspection_cache.popitem(last=False)
 
 
 def _get_from_cache(key: str) -> Optional[Any]:
-    """Get item from cache."""
-    return _introspection_cache.get(key)
+    """Get item from cache, dropping it if its environment changed."""
+    with _cache_lock:
+        entry = _introspection_cache.get(key)
+        if entry is None:
+            increment("cache.introspection.miss")
+            return None
+        _introspection_cache.move_to_end(key)
+
+    if entry.is_valid():
+        increment("cache.introspection.hit")
+        return entry.value
+
+    increment("cache.introspection.miss")
+    logger.debug(f"Cached introspection result {key} is stale")
+    with _cache_lock:
+        if _introspection_cache.get(key) is entry:
+            del _introspection_cache[key]
+    if entry.project_root is not None:
+        # Warm workers started before the change still hold the old modules
+        restart_workers(entry.project_root, _changed_at(entry))
+    return None
+
+
+def _result_fingerprint(data: Dict[str, Any], *paths: Optional[str]) -> Fingerprint:
+    """Get the fingerprint recorded in a result, recording it on first use.
+
+    The fingerprint travels with the result into the persistent index, so
+    stored entries are validated against the same file stats.
+    """
+    if data.get("fingerprint") is not None:
+        return tuple(tuple(stat) for stat in data["fingerprint"])
+    fingerprint = _fingerprint(*paths)
+    data["fingerprint"] = fingerprint
+    return fingerprint
+
+
+def _symbol_fingerprint(
+    package_name: str, project_root: Path, data: Dict[str, Any]
+) -> Fingerprint:
+    """Fingerprint a symbol (or docstring) result: its file and dist-info."""
+    return _result_fingerprint(
+        data, data.get("file"), _dist_info_path(package_name, project_root)
+    )
+
+
+def _symbol_cache_key(
+    package_name: str,
+    symbol_path: str,
+    project_root: Path,
+    detail: str = DEFAULT_DETAIL,
+) -> str:
+    """Get the cache key of a symbol lookup at a detail level."""
+    key = f"symbol:{package_name}:{symbol_path}:{project_root}"
+    return key if detail == DEFAULT_DETAIL else f"{key}:{detail}"
+
+
+def _get_symbol_from_cache(
+    package_name: str, symbol_path: str, project_root: Path, detail: str
+) -> Optional[Dict[str, Any]]:
+    """Get a cached symbol at the requested or any higher detail level."""
+    for level in DETAIL_LEVELS[DETAIL_LEVELS.index(detail) :]:
+        cached = _get_from_cache(
+            _symbol_cache_key(package_name, symbol_path, project_root, level)
+        )
+        if cached is not None:
+            return cached
+    return None
+
+
+def _stored_if_current(stored: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Discard a persistent index payload whose source files changed since."""
+    if stored is not None and not _fingerprint_is_current(stored.get("fingerprint")):
+        return None
+    return stored
+
+
+def negative_cache_ttl() -> float:
+    """Get how long failed lookups are remembered (MCPYDOC_NEGATIVE_CACHE_TTL)."""
+    try:
+        ttl = float(
+            os.environ.get("MCPYDOC_NEGATIVE_CACHE_TTL", NEGATIVE_CACHE_TTL_SECONDS)
+        )
+    except ValueError:
+        ttl = NEGATIVE_CACHE_TTL_SECONDS
+    return max(0.0, ttl)
+
+
+class IntrospectionFailure:
+    """A failed lookup and the resolution path it failed on.
+
+    Attributes:
+        path: Resolution path that failed ("subprocess" or "direct")
+        kind: "not_found", "error" or "timeout"
+        message: Error message of the failure
+    """
+
+    __slots__ = ("path", "kind", "message")
+
+    def __init__(self, path: str, kind: str, message: str) -> None:
+        self.path = path
+        self.kind = kind
+        self.message = message
+
+
+class _FailureEntry(CacheEntry):
+    """A cached failure, which additionally expires after a short TTL."""
+
+    __slots__ = ("expires",)
+
+    def __init__(
+        self,
+        value: IntrospectionFailure,
+        project_root: Optional[Path],
+        lock_hash: str,
+        fingerprint: Fingerprint,
+        expires: float,
+    ) -> None:
+        super().__init__(value, project_root, lock_hash, fingerprint)
+        self.expires = expires
+
+
+def record_failure(
+    key: str,
+    path: str,
+    kind: str,
+    message: str,
+    project_root: Optional[Path] = None,
+    paths: Iterable[Optional[str]] = (),
+) -> None:
+    """Remember a failed lookup so it is not retried for negative_cache_ttl().
+
+    Args:
+        key: Cache key of the lookup
+        path: Resolution path that failed ("subprocess" or "direct")
+        kind: "not_found", "error" or "timeout"
+        message: Error message of the failure
+        project_root: Project root whose lockfiles the failure depends on
+        paths: Files and directories whose change may fix the failure, e.g.
+            the site-packages directories a missing package was looked up in
+    """
+    ttl = negative_cache_ttl()
+    if ttl <= 0:
+        return
+
+    entry = _FailureEntry(
+        IntrospectionFailure(path, kind, message),
+        project_root,
+        lockfile_hash(project_root) if project_root is not None else "",
+        _fingerprint(*paths),
+        time.monotonic() + ttl,
+    )
+    with _failure_cache_lock:
+        _failure_cache[key] = entry
+        _failure_cache.move_to_end(key)
+        while len(_failure_cache) > _FAILURE_CACHE_SIZE_LIMIT:
+            _failure_cache.popitem(last=False)
+
+
+def get_failure(key: str) -> Optional[IntrospectionFailure]:
+    """Get a remembered failure of a lookup, if it is still current.
+
+    Args:
+        key: Cache key of the lookup
+
+    Returns:
+        The failure, or None if the lookup has not failed recently or its
+        environment changed since
+    """
+    with _failure_cache_lock:
+        entry = _failure_cache.get(key)
+        if entry is None:
+            return None
+        _failure_cache.move_to_end(key)
+
+    expired = time.monotonic() >= entry.expires
+    if not expired and entry.is_valid():
+        increment("cache.negative.hit")
+        failure: IntrospectionFailure = entry.value
+        return failure
+
+    with _failure_cache_lock:
+        if _failure_cache.get(key) is entry:
+            del _failure_cache[key]
+    if not expired and entry.project_root is not None:
+        # Warm workers may still hold the modules the lookup failed on
+        restart_workers(entry.project_root, _changed_at(entry))
+    return None
+
+
+def _script_error(result: subprocess.CompletedProcess) -> Dict[str, Any]:
+    """Get the error a failed introspection script reported."""
+    try:
+        data = json.loads(result.stdout)
+    except (TypeError, ValueError):
+        data = None
+    if isinstance(data, dict) and "error" in data:
+        return data
+    stderr = result.stderr if isinstance(result.stderr, str) else ""
+    return {"error": stderr.strip() or f"exit code {result.returncode}"}
+
+
+def _record_script_failure(
+    key: str, project_root: Path, error: Dict[str, Any], *paths: Optional[str]
+) -> None:
+    """Remember a lookup the project's interpreter could not answer."""
+    kind = "not_found" if error.get("type") in NOT_FOUND_ERROR_TYPES else "error"
+    record_failure(
+        key, "subprocess", kind, str(error.get("error", "")), project_root, paths
+    )
+
+
+def _record_timeout(
+    key: str,
+    project_root: Path,
+    error: subprocess.TimeoutExpired,
+    budget: Optional[float],
+    timeout: float,
+) -> None:
+    """Remember a script timeout, unless something else cut the script short.
+
+    Waiting for a busy project's slot, or running with less than the full
+    timeout because the request deadline was near, says nothing about how
+    long the lookup itself takes.
+
+    Args:
+        key: Failure cache key of the lookup
+        project_root: Project root the script ran in
+        error: The timeout raised
+        budget: Time the script was given (None if it had no time limit)
+        timeout: The lookup's usual timeout
+    """
+    if isinstance(error, SlotTimeoutExpired):
+        return
+    if budget is not None and budget < timeout:
+        return
+    record_failure(
+        key, "subprocess", "timeout", f"Timed out after {timeout}s", project_root
+    )
+
+
+def _persistent_key(
+    package_name: str, project_root: Path
+) -> Optional[Tuple[PersistentSymbolIndex, str, str, str]]:
+    """Resolve the persistent index key for a package without spawning anything.
+
+    Only uses package metadata that is already known (in memory or on disk),
+    so looking up the key never costs an interpreter launch.
+
+    Returns:
+        Tuple of (index, distribution name, version, lockfile hash), or None
+        if the index is disabled or the package version is not known yet
+    """
+    index = get_persistent_index()
+    if index is None:
+        return None
+
+    lock_hash = lockfile_hash(project_root)
+    pkg_data = _get_from_cache(f"pkg_info:{package_name}:{project_root}")
+    if pkg_data is None:
+        pkg_data = _stored_if_current(
+            index.get_package(project_root, package_name, lock_hash)
+        )
+    if not pkg_data or not pkg_data.get("version"):
+        return None
+
+    return index, pkg_data["name"], pkg_data["version"], lock_hash
+
+
+def _run_script(
+    runner: List[str],
+    project_root: Path,
+    script: str,
+    timeout: float,
+    package_name: Optional[str] = None,
+    preload: bool = True,
+) -> subprocess.CompletedProcess:
+    """Run an introspection script in the project's environment.
+
+    Uses an idle persistent worker of the project when enabled, falling back
+    to a one-shot subprocess if the worker cannot be started or crashes. At
+    most max_interpreters_per_project() scripts run per project at once;
+    further calls wait for a slot within their timeout.
+
+    Args:
+        runner: Command prefix that starts the project's Python interpreter
+        project_root: Project root to run in
+        script: Python source to execute
+        timeout: Timeout in seconds, shortened to the current request deadline
+        package_name: Package the script is about, for metrics and preloading
+        preload: Whether zygote workers should import the package first
+            (False for scripts that only read metadata)
+
+    Returns:
+        CompletedProcess with exit code, stdout and stderr
+
+    Raises:
+        subprocess.TimeoutExpired: If the script did not finish in time
+        FileNotFoundError: If the runner command does not exist
+        ResourceLimitError: If the request deadline has already passed
+    """
+    check_deadline("Subprocess introspection")
+    timeout = remaining_time(timeout)
+    deadline = time.monotonic() + timeout
+    preload_name = package_name if preload else None
+
+    increment("subprocess.scripts")
+    try:
+        # Queue for one of the project's interpreter slots
+        with span("subprocess.run_script"), project_slot(project_root, timeout):
+            interpreter = resolve_interpreter(
+                runner, project_root, deadline - time.monotonic()
+            )
+            try:
+                return _run_in_environment(
+                    interpreter,
+                    project_root,
+                    script,
+                    deadline - time.monotonic(),
+                    preload_name,
+                )
+            except FileNotFoundError:
+                if interpreter == runner:
+                    raise
+                logger.warning(
+                    f"Resolved interpreter {interpreter[0]} is gone, "
+                    f"using {' '.join(runner)} at {project_root}"
+                )
+                _forget_interpreter(runner, project_root)
+                return _run_in_environment(
+                    runner,
+                    project_root,
+                    script,
+                    max(0.0, deadline - time.monotonic()),
+                    preload_name,
+                )
+    except SlotTimeoutExpired:
+        increment("subprocess.slot_timeouts")
+        raise
+    except subprocess.TimeoutExpired:
+        increment("subprocess.timeouts", package=package_name or "unknown")
+        raise
+
+
+def _run_in_environment(
+    runner: List[str],
+    project_root: Path,
+    script: str,
+    timeout: float,
+    package_name: Optional[str] = None,
+) -> subprocess.CompletedProcess:
+    """Run a script through a persistent worker or a one-shot subprocess."""
+    if persistent_workers_enabled():
+        preload = None
+        if package_name is not None:
+            preload = PRELOAD_SCRIPT.format(package_name=package_name)
+        try:
+            with checkout_worker(runner, project_root) as worker:
+                return worker.execute(script, timeout, preload)
+        except WorkerError as e:
+            logger.warning(
+                f"Persistent worker unavailable at {project_root} ({e}), "
+                f"falling back to one-shot subprocess"
+            )
+
+    return run_process(runner + ["-c", script], project_root, timeout)
+
+
+def set_interpreter_resolution(enabled: bool) -> None:
+    """Enable or disable resolving package-manager runners to interpreters.
+
+    Args:
+        enabled: Whether to run the resolved interpreter directly
+    """
+    global _interpreter_resolution_enabled
+    _interpreter_resolution_enabled = enabled
+    with _interpreter_cache_lock:
+        _interpreter_cache.clear()
+
+
+def _interpreter_key(runner: List[str], project_root: Path) -> str:
+    """Key of a resolved interpreter in the cache."""
+    return f"{project_root}:{' '.join(runner)}"
+
+
+def _forget_interpreter(runner: List[str], project_root: Path) -> None:
+    """Drop a cached interpreter so the next call resolves it again."""
+    with _interpreter_cache_lock:
+        _interpreter_cache.pop(_interpreter_key(runner, project_root), None)
+
+
+def _is_executable(path: str) -> bool:
+    """Check that a path is an existing executable file."""
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def resolve_interpreter(
+    runner: List[str], project_root: Path, timeout: float
+) -> List[str]:
+    """Resolve a package-manager runner to the project's interpreter.
+
+    ``uv run python`` and ``poetry run python`` pay the package manager's
+    startup and environment checks on every call. The interpreter they start
+    is resolved once and then run directly. The result is cached per project
+    and runner, and re-resolved when the project's lockfiles change or the
+    interpreter disappears.
+
+    Args:
+        runner: Command prefix that starts the project's Python interpreter
+        project_root: Project root to run in
+        timeout: Timeout in seconds for the resolution call
+
+    Returns:
+        ``[interpreter path]``, or the runner itself if resolution is disabled,
+        unnecessary or failed
+    """
+    if not _interpreter_resolution_enabled or len(runner) == 1:
+        return runner
+
+    key = _interpreter_key(runner, project_root)
+    lock_hash = lockfile_hash(project_root)
+    with _interpreter_cache_lock:
+        cached = _interpreter_cache.get(key)
+    if cached is not None and cached[0] == lock_hash and _is_executable(cached[1]):
+        return [cached[1]]
+
+    try:
+        result = run_process(
+            runner + ["-c", RESOLVE_INTERPRETER_SCRIPT], project_root, timeout
+        )
+    except (subprocess.TimeoutExpired, OSError) as e:
+        logger.warning(f"Could not resolve interpreter of {' '.join(runner)}: {e}")
+        return runner
+
+    lines = (result.stdout or "").strip().splitlines()
+    executable = lines[-1].strip() if lines else ""
+    if result.returncode != 0 or not _is_executable(executable):
+        logger.warning(
+            f"Could not resolve interpreter of {' '.join(runner)} at {project_root}"
+        )
+        return runner
+
+    logger.info(f"Resolved {' '.join(runner)} at {project_root} to {executable}")
+    with _interpreter_cache_lock:
+        _interpreter_cache[key] = (lock_hash, executable)
+    return [executable]
 
 
 def _is_command_available(command: str) -> bool:
@@ -41,7 +674,7 @@ def _is_command_available(command: str) -> bool:
     return shutil.which(command) is not None
 
 
-def _find_project_root(start_dir: Path) -> Optional[Path]:
+def find_project_root(start_dir: Path) -> Optional[Path]:
     """Find the project root by searching for package manager files in parent directories.
 
     Args:
@@ -73,6 +706,7 @@ def _find_project_root(start_dir: Path) -> Optional[Path]:
     return None
 
 
+@span("subprocess.detect_package_manager")
 def detect_package_manager(directory: Path) -> Optional[Tuple[List[str], Path]]:
     """Detect which package manager to use for a directory.
 
@@ -92,7 +726,7 @@ def detect_package_manager(directory: Path) -> Optional[Tuple[List[str], Path]]:
         return _package_manager_cache[cache_key]
 
     # Find project root by searching parent directories
-    project_root = _find_project_root(directory)
+    project_root = find_project_root(directory)
     if project_root is None:
         logger.debug(f"No project root found starting from {directory}")
         _package_manager_cache[cache_key] = None
@@ -172,15 +806,134 @@ def detect_package_manager(directory: Path) -> Optional[Tuple[List[str], Path]]:
     return result
 
 
+# Shared by every script: accept distribution names as well as import names
+_IMPORT_NAME_RESOLVER = """
+import importlib.util
+import os
+import re
+import sys
+import types
+from importlib import metadata
+
+# Survives across scripts run by the same persistent worker
+_worker_state = sys.modules.setdefault("_mcpydoc_state", types.ModuleType("_mcpydoc_state"))
+
+
+def top_level_names(dist):
+    # top_level.txt, else the top-level entries of RECORD
+    names = (dist.read_text("top_level.txt") or "").split()
+    if not names:
+        for file in dist.files or []:
+            first = file.parts[0] if file.parts else ""
+            if first in ("..", "__pycache__") or first.endswith((".dist-info", ".egg-info", ".data")):
+                continue
+            if len(file.parts) > 1:
+                name = first
+            elif first.endswith(".py"):
+                name = first[:-3]
+            elif first.endswith((".so", ".pyd")):
+                name = first.split(".")[0]
+            else:
+                continue
+            if name.isidentifier() and name not in names:
+                names.append(name)
+    return names
+
+
+def resolve_import_name(package_name):
+    # "PyYAML" -> "yaml"; importable names are returned unchanged
+    try:
+        if importlib.util.find_spec(package_name) is not None:
+            return package_name
+    except (ImportError, ValueError):
+        pass
+    try:
+        dist = metadata.distribution(package_name)
+    except metadata.PackageNotFoundError:
+        return package_name
+    names = top_level_names(dist)
+    normalized = re.sub(r"[-_.]+", "_", dist.metadata["Name"] or package_name).lower()
+    for name in names:
+        if name.lower() == normalized:
+            return name
+    public = [name for name in names if not name.startswith("_")]
+    return (public or names or [package_name])[0]
+
+
+def path_stamp():
+    # Installing or removing a distribution changes its directory's mtime
+    stamp = []
+    for entry in sys.path:
+        try:
+            stamp.append((entry, os.stat(entry or ".").st_mtime_ns))
+        except OSError:
+            continue
+    return tuple(stamp)
+
+
+def packages_distributions():
+    # Top-level import name -> distribution names; kept while sys.path is
+    # unchanged as it reads the metadata of every installed distribution
+    stamp = path_stamp()
+    memo = getattr(_worker_state, "packages_distributions", None)
+    if memo is not None and memo[0] == stamp:
+        return memo[1]
+    if hasattr(metadata, "packages_distributions"):
+        providers = metadata.packages_distributions()
+    else:
+        # Python 3.9
+        providers = dict()
+        for dist in metadata.distributions():
+            for name in top_level_names(dist):
+                providers.setdefault(name, []).append(dist.metadata["Name"])
+    _worker_state.packages_distributions = (stamp, providers)
+    return providers
+
+
+def find_distribution(package_name):
+    # "yaml" -> the PyYAML distribution
+    try:
+        return metadata.distribution(package_name)
+    except metadata.PackageNotFoundError:
+        providers = packages_distributions().get(package_name.split(".")[0], [])
+        if not providers:
+            raise
+        return metadata.distribution(providers[0])
+"""
+
+
+# Imports a package in a zygote worker before scripts about it are forked,
+# which also inherit the distribution map built here
+PRELOAD_SCRIPT = _IMPORT_NAME_RESOLVER + """
+packages_distributions()
+importlib.import_module(resolve_import_name({package_name!r}))
+"""
+
+
 # Introspection script for package info
-PACKAGE_INFO_SCRIPT = """
+PACKAGE_INFO_SCRIPT = _IMPORT_NAME_RESOLVER + """
 import json
 import sys
-from importlib import metadata
 from pathlib import Path
 
 package_name = {package_name!r}
 
+
+def metadata_directory(dist):
+    # The .dist-info/.egg-info directory, located through public API only
+    base = Path(dist.locate_file(""))
+    stem = re.sub(r"[-_.]+", "_", dist.metadata["Name"])
+    for name in (stem, stem.lower()):
+        for suffix in (".dist-info", ".egg-info"):
+            candidate = base / f"{{name}}-{{dist.version}}{{suffix}}"
+            if candidate.is_dir():
+                return str(candidate)
+    for file in dist.files or []:
+        if file.parts and file.parts[0].endswith((".dist-info", ".egg-info")):
+            return str(Path(dist.locate_file(file.parts[0])))
+    return None
+
+
 try:
     # Check if it's a built-in module
     if package_name in sys.builtin_module_names:
@@ -195,35 +948,38 @@ try:
         }}
     else:
         # Try to get package metadata
-        dist = metadata.distribution(package_name)
+        dist = find_distribution(package_name)
         result = {{
             "name": dist.metadata["Name"],
+            "import_name": resolve_import_name(package_name),
             "version": dist.metadata["Version"],
             "summary": dist.metadata.get("Summary"),
             "author": dist.metadata.get("Author"),
             "license": dist.metadata.get("License"),
             "location": str(Path(dist.locate_file(""))),
+            "dist_info": metadata_directory(dist),
             "is_builtin": False
         }}
     print(json.dumps(result))
 except Exception as e:
     error = {{"error": str(e), "type": type(e).__name__}}
+    # Directories searched, so the server notices when the package is installed
+    error["search_path"] = [path for path in sys.path if path and Path(path).is_dir()]
     print(json.dumps(error))
     sys.exit(1)
 """
 
 
-# Introspection script for symbol info
-SYMBOL_INFO_SCRIPT = """
+# Shared resolver used by the single and batched symbol scripts
+_SYMBOL_RESOLVER = _IMPORT_NAME_RESOLVER + """
 import json
 import sys
 import inspect
 from importlib import import_module
 
-package_name = {package_name!r}
-symbol_path = {symbol_path!r}
 
-try:
+def describe_symbol(package_name, symbol_path, detail="full"):
+    # detail: "signature" < "summary" (+ docstring, methods) < "full" (+ source)
     # Import the module
     if "." in symbol_path:
         parts = symbol_path.split(".")
@@ -267,29 +1023,32 @@ try:
     
     # Get source code
     source = None
-    try:
-        source = inspect.getsource(obj)
-    except (TypeError, OSError, AttributeError):
-        pass
+    if detail == "full":
+        try:
+            source = inspect.getsource(obj)
+        except (TypeError, OSError, AttributeError):
+            pass
     
     # Get docstring - try to resolve inherited docstrings for methods
-    docstring = getattr(obj, "__doc__", None)
-    if docstring is None and kind in ("method", "function") and hasattr(obj, "__func__"):
-        # Try to get from wrapped function
-        docstring = getattr(obj.__func__, "__doc__", None)
-    if docstring is None and kind in ("method", "function"):
-        # Try to resolve from parent class via MRO
-        method_name = getattr(obj, "__name__", None)
-        if method_name:
-            for cls in inspect.getmro(type(obj)) if hasattr(type(obj), "__mro__") else []:
-                parent_method = getattr(cls, method_name, None)
-                if parent_method and getattr(parent_method, "__doc__", None):
-                    docstring = parent_method.__doc__
-                    break
+    docstring = None
+    if detail != "signature":
+        docstring = getattr(obj, "__doc__", None)
+        if docstring is None and kind in ("method", "function") and hasattr(obj, "__func__"):
+            # Try to get from wrapped function
+            docstring = getattr(obj.__func__, "__doc__", None)
+        if docstring is None and kind in ("method", "function"):
+            # Try to resolve from parent class via MRO
+            method_name = getattr(obj, "__name__", None)
+            if method_name:
+                for cls in inspect.getmro(type(obj)) if hasattr(type(obj), "__mro__") else []:
+                    parent_method = getattr(cls, method_name, None)
+                    if parent_method and getattr(parent_method, "__doc__", None):
+                        docstring = parent_method.__doc__
+                        break
     
     # For classes, include a summary of methods
     methods = None
-    if kind == "class":
+    if kind == "class" and detail != "signature":
         methods = []
         for name, method in inspect.getmembers(obj, predicate=lambda x: inspect.isfunction(x) or inspect.ismethod(x)):
             if name.startswith("_") and not name.startswith("__"):
@@ -321,7 +1080,15 @@ try:
         # Limit to 30 methods to avoid huge responses
         methods = methods[:30]
     
-    result = {{
+    # Source file, for cache invalidation in the server
+    try:
+        file = inspect.getsourcefile(obj)
+    except TypeError:
+        file = None
+    if file is None:
+        file = getattr(sys.modules.get(getattr(obj, "__module__", None) or ""), "__file__", None)
+
+    return {{
         "name": getattr(obj, "__name__", str(obj)),
         "qualname": getattr(obj, "__qualname__", symbol_path),
         "kind": kind,
@@ -329,23 +1096,56 @@ try:
         "docstring": docstring,
         "signature": signature,
         "source": source,
-        "methods": methods
+        "methods": methods,
+        "file": file,
+        "detail": detail
     }}
-    print(json.dumps(result))
+"""
+
+
+# Introspection script for symbol info
+SYMBOL_INFO_SCRIPT = _SYMBOL_RESOLVER + """
+package_name = resolve_import_name({package_name!r})
+symbol_path = {symbol_path!r}
+detail = {detail!r}
+
+try:
+    print(json.dumps(describe_symbol(package_name, symbol_path, detail)))
 except Exception as e:
     error = {{"error": str(e), "type": type(e).__name__}}
+    error["file"] = getattr(sys.modules.get(package_name), "__file__", None)
     print(json.dumps(error))
     sys.exit(1)
 """
 
 
+# Introspection script resolving many symbols in one interpreter
+BATCH_SYMBOL_INFO_SCRIPT = _SYMBOL_RESOLVER + """
+package_name = resolve_import_name({package_name!r})
+symbol_paths = {symbol_paths!r}
+detail = {detail!r}
+
+results = {{}}
+for symbol_path in symbol_paths:
+    try:
+        results[symbol_path] = describe_symbol(package_name, symbol_path, detail)
+    except Exception as e:
+        results[symbol_path] = {{
+            "error": str(e),
+            "type": type(e).__name__,
+            "file": getattr(sys.modules.get(package_name), "__file__", None),
+        }}
+print(json.dumps({{"symbols": results}}))
+"""
+
+
 # Introspection script for package-level docstring
-PACKAGE_DOCSTRING_SCRIPT = """
+PACKAGE_DOCSTRING_SCRIPT = _IMPORT_NAME_RESOLVER + """
 import json
 import sys
 from importlib import import_module
 
-package_name = {package_name!r}
+package_name = resolve_import_name({package_name!r})
 
 try:
     module = import_module(package_name)
@@ -363,15 +1163,16 @@ except Exception as e:
 
 
 # Introspection script for searching symbols
-SEARCH_SYMBOLS_SCRIPT = """
+SEARCH_SYMBOLS_SCRIPT = _IMPORT_NAME_RESOLVER + """
 import json
 import sys
 import inspect
 from importlib import import_module
 import pkgutil
 
-package_name = {package_name!r}
+package_name = resolve_import_name({package_name!r})
 pattern = {pattern!r}
+max_symbols = {max_symbols!r}
 
 try:
     package = import_module(package_name)
@@ -426,20 +1227,21 @@ try:
                 "kind": kind,
                 "module": getattr(obj, "__module__", package_name),
                 "docstring": getattr(obj, "__doc__", None),
-                "signature": signature
+                "signature": signature,
+                "path": full_name
             }})
             
             # Limit results
-            if len(results) >= 1000:
+            if len(results) >= max_symbols:
                 return
     
     # Scan main package
     scan_module(package)
     
     # Discover and scan submodules
-    if hasattr(package, "__path__") and len(results) < 1000:
+    if hasattr(package, "__path__") and len(results) < max_symbols:
         for importer, modname, ispkg in pkgutil.iter_modules(package.__path__, prefix=f"{{package_name}}."):
-            if len(results) >= 1000:
+            if len(results) >= max_symbols:
                 break
             try:
                 submod = import_module(modname)
@@ -448,7 +1250,12 @@ try:
             except Exception:
                 continue
     
-    print(json.dumps({{"symbols": results, "count": len(results)}}))
+    print(json.dumps({{
+        "symbols": results,
+        "count": len(results),
+        "truncated": len(results) >= max_symbols,
+        "package_file": getattr(package, "__file__", None)
+    }}))
 except Exception as e:
     error = {{"error": str(e), "type": type(e).__name__}}
     print(json.dumps(error))
@@ -482,25 +1289,55 @@ def introspect_package_info(
         logger.debug(f"Using cached package info for {package_name}")
         return cached
 
+    index = get_persistent_index()
+    lock_hash = lockfile_hash(project_root) if index else ""
+    if index:
+        stored = _stored_if_current(
+            index.get_package(project_root, package_name, lock_hash)
+        )
+        if stored is not None:
+            increment("cache.persistent_index.hit")
+            logger.debug(f"Using persistent index for {package_name} package info")
+            _add_to_cache(
+                cache_key,
+                stored,
+                project_root,
+                _result_fingerprint(stored, stored.get("dist_info")),
+            )
+            return stored
+
+    failure = get_failure(cache_key)
+    if failure is not None:
+        logger.debug(
+            f"Skipping subprocess introspection for {package_name}: "
+            f"failed recently ({failure.kind})"
+        )
+        return None
+
     script = PACKAGE_INFO_SCRIPT.format(package_name=package_name)
+    budget = remaining_time(timeout)
 
     try:
         logger.info(
             f"Running subprocess introspection for package {package_name} at {project_root}"
         )
-        result = subprocess.run(
-            runner + ["-c", script],
-            capture_output=True,
-            text=True,
-            cwd=project_root,
-            timeout=timeout,
+        result = _run_script(
+            runner, project_root, script, timeout, package_name, preload=False
         )
 
         if result.returncode == 0:
-            data = json.loads(result.stdout)
+            with span("subprocess.parse_output"):
+                data = json.loads(result.stdout)
             if "error" not in data:
                 logger.info(f"Successfully introspected {package_name} via subprocess")
-                _add_to_cache(cache_key, data)
+                _add_to_cache(
+                    cache_key,
+                    data,
+                    project_root,
+                    _result_fingerprint(data, data.get("dist_info")),
+                )
+                if index:
+                    index.put_package(project_root, package_name, lock_hash, data)
                 return data
             else:
                 logger.warning(f"Subprocess introspection error: {data.get('error')}")
@@ -508,9 +1345,17 @@ def introspect_package_info(
             logger.warning(
                 f"Subprocess introspection failed (exit {result.returncode}): {result.stderr}"
             )
-    except subprocess.TimeoutExpired:
+            data = _script_error(result)
+        _record_script_failure(
+            cache_key, project_root, data, *data.get("search_path") or ()
+        )
+    except subprocess.TimeoutExpired as e:
         logger.warning(f"Subprocess introspection timeout for {package_name}")
-    except (json.JSONDecodeError, FileNotFoundError) as e:
+        _record_timeout(cache_key, project_root, e, budget, timeout)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Subprocess introspection failed: {e}")
+        _record_script_failure(cache_key, project_root, {"error": str(e)})
+    except FileNotFoundError as e:
         logger.warning(f"Subprocess introspection failed: {e}")
 
     return None
@@ -521,6 +1366,7 @@ def introspect_symbol(
     symbol_path: str,
     working_dir: Path,
     timeout: int = 20,
+    detail: str = DEFAULT_DETAIL,
 ) -> Optional[Dict[str, Any]]:
     """Get symbol info via subprocess introspection.
 
@@ -529,6 +1375,8 @@ def introspect_symbol(
         symbol_path: Dot-separated path to symbol
         working_dir: Starting directory for project detection
         timeout: Timeout in seconds
+        detail: One of DETAIL_LEVELS; the script skips reading source below
+            "full" and docstrings and method summaries at "signature"
 
     Returns:
         Dictionary with symbol info, or None if subprocess fails
@@ -538,34 +1386,67 @@ def introspect_symbol(
         return None
 
     runner, project_root = pm_result
-    cache_key = f"symbol:{package_name}:{symbol_path}:{project_root}"
+    # Failures do not depend on the detail level
+    failure_key = _symbol_cache_key(package_name, symbol_path, project_root)
+    cache_key = _symbol_cache_key(package_name, symbol_path, project_root, detail)
 
-    cached = _get_from_cache(cache_key)
+    cached = _get_symbol_from_cache(package_name, symbol_path, project_root, detail)
     if cached is not None:
         logger.debug(f"Using cached symbol info for {package_name}.{symbol_path}")
         return cached
 
+    index_key = _persistent_key(package_name, project_root)
+    if index_key:
+        index, dist_name, version, lock_hash = index_key
+        stored = _stored_if_current(
+            index.get_symbol(project_root, dist_name, version, lock_hash, symbol_path)
+        )
+        if stored is not None:
+            increment("cache.persistent_index.hit")
+            logger.debug(f"Using persistent index for {package_name}.{symbol_path}")
+            _add_to_cache(
+                failure_key,
+                stored,
+                project_root,
+                _symbol_fingerprint(package_name, project_root, stored),
+            )
+            return stored
+
+    failure = get_failure(failure_key)
+    if failure is not None:
+        logger.debug(
+            f"Skipping subprocess introspection for {package_name}.{symbol_path}: "
+            f"failed recently ({failure.kind})"
+        )
+        return None
+
     script = SYMBOL_INFO_SCRIPT.format(
-        package_name=package_name, symbol_path=symbol_path
+        package_name=package_name, symbol_path=symbol_path, detail=detail
     )
+    budget = remaining_time(timeout)
 
     try:
         logger.info(
             f"Running subprocess introspection for symbol {package_name}.{symbol_path}"
         )
-        result = subprocess.run(
-            runner + ["-c", script],
-            capture_output=True,
-            text=True,
-            cwd=project_root,
-            timeout=timeout,
-        )
+        result = _run_script(runner, project_root, script, timeout, package_name)
 
         if result.returncode == 0:
-            data = json.loads(result.stdout)
+            with span("subprocess.parse_output"):
+                data = json.loads(result.stdout)
             if "error" not in data:
                 logger.info(f"Successfully introspected symbol via subprocess")
-                _add_to_cache(cache_key, data)
+                _add_to_cache(
+                    cache_key,
+                    data,
+                    project_root,
+                    _symbol_fingerprint(package_name, project_root, data),
+                )
+                # The persistent index only holds complete results
+                if index_key and detail == DEFAULT_DETAIL:
+                    index.put_symbol(
+                        project_root, dist_name, version, lock_hash, symbol_path, data
+                    )
                 return data
             else:
                 logger.debug(
@@ -573,14 +1454,147 @@ def introspect_symbol(
                 )
         else:
             logger.debug(f"Subprocess symbol introspection failed: {result.stderr}")
-    except subprocess.TimeoutExpired:
+            data = _script_error(result)
+        _record_script_failure(
+            failure_key,
+            project_root,
+            data,
+            data.get("file"),
+            _dist_info_path(package_name, project_root),
+        )
+    except subprocess.TimeoutExpired as e:
         logger.warning(f"Subprocess symbol introspection timeout")
-    except (json.JSONDecodeError, FileNotFoundError) as e:
+        _record_timeout(failure_key, project_root, e, budget, timeout)
+    except json.JSONDecodeError as e:
+        logger.debug(f"Subprocess symbol introspection failed: {e}")
+        _record_script_failure(failure_key, project_root, {"error": str(e)})
+    except FileNotFoundError as e:
         logger.debug(f"Subprocess symbol introspection failed: {e}")
 
     return None
 
 
+def introspect_symbols(
+    package_name: str,
+    symbol_paths: List[str],
+    working_dir: Path,
+    timeout: int = 30,
+    detail: str = DEFAULT_DETAIL,
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Get info for several symbols in a single subprocess round-trip.
+
+    Args:
+        package_name: Name of the package
+        symbol_paths: Dot-separated paths to the symbols
+        working_dir: Starting directory for project detection
+        timeout: Timeout in seconds for the whole batch
+        detail: One of DETAIL_LEVELS (see introspect_symbol)
+
+    Returns:
+        Dictionary mapping each resolved symbol path to its symbol info
+        (unresolved paths are omitted), or None if subprocess fails
+    """
+    pm_result = detect_package_manager(working_dir)
+    if not pm_result:
+        return None
+
+    runner, project_root = pm_result
+    index_key = _persistent_key(package_name, project_root)
+    results: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    for symbol_path in symbol_paths:
+        cache_key = _symbol_cache_key(package_name, symbol_path, project_root)
+        cached = _get_symbol_from_cache(package_name, symbol_path, project_root, detail)
+        if cached is None and index_key:
+            index, dist_name, version, lock_hash = index_key
+            cached = _stored_if_current(
+                index.get_symbol(
+                    project_root, dist_name, version, lock_hash, symbol_path
+                )
+            )
+            if cached is not None:
+                _add_to_cache(
+                    cache_key,
+                    cached,
+                    project_root,
+                    _symbol_fingerprint(package_name, project_root, cached),
+                )
+        if cached is not None:
+            results[symbol_path] = cached
+        elif get_failure(cache_key) is not None:
+            logger.debug(f"Skipping {package_name}.{symbol_path}: failed recently")
+        elif symbol_path not in missing:
+            missing.append(symbol_path)
+
+    if not missing:
+        logger.debug(f"Using cached symbol info for {len(results)} symbols")
+        return results
+
+    script = BATCH_SYMBOL_INFO_SCRIPT.format(
+        package_name=package_name, symbol_paths=missing, detail=detail
+    )
+    budget = remaining_time(timeout)
+
+    try:
+        logger.info(
+            f"Running batched subprocess introspection for {len(missing)} "
+            f"symbols in {package_name}"
+        )
+        result = _run_script(runner, project_root, script, timeout, package_name)
+
+        if result.returncode == 0:
+            with span("subprocess.parse_output"):
+                data = json.loads(result.stdout)
+            for symbol_path, symbol_data in data.get("symbols", {}).items():
+                if "error" in symbol_data:
+                    logger.debug(
+                        f"Subprocess symbol introspection error for "
+                        f"{symbol_path}: {symbol_data.get('error')}"
+                    )
+                    _record_script_failure(
+                        _symbol_cache_key(package_name, symbol_path, project_root),
+                        project_root,
+                        symbol_data,
+                        symbol_data.get("file"),
+                        _dist_info_path(package_name, project_root),
+                    )
+                    continue
+                _add_to_cache(
+                    _symbol_cache_key(package_name, symbol_path, project_root, detail),
+                    symbol_data,
+                    project_root,
+                    _symbol_fingerprint(package_name, project_root, symbol_data),
+                )
+                if index_key and detail == DEFAULT_DETAIL:
+                    index.put_symbol(
+                        project_root,
+                        dist_name,
+                        version,
+                        lock_hash,
+                        symbol_path,
+                        symbol_data,
+                    )
+                results[symbol_path] = symbol_data
+            return results
+        else:
+            logger.debug(f"Batched symbol introspection failed: {result.stderr}")
+    except subprocess.TimeoutExpired as e:
+        logger.warning(f"Batched symbol introspection timeout for {package_name}")
+        # Single lookups of these symbols fall back straight to direct import
+        for symbol_path in missing:
+            _record_timeout(
+                _symbol_cache_key(package_name, symbol_path, project_root),
+                project_root,
+                e,
+                budget,
+                timeout,
+            )
+    except (json.JSONDecodeError, FileNotFoundError) as e:
+        logger.debug(f"Batched symbol introspection failed: {e}")
+
+    return None
+
+
 def search_symbols_subprocess(
     package_name: str,
     pattern: Optional[str],
@@ -610,28 +1624,65 @@ def search_symbols_subprocess(
         logger.debug(f"Using cached search results for {package_name}")
         return cached
 
+    # A stored full scan answers any pattern unless it was truncated
+    index_key = _persistent_key(package_name, project_root)
+    if index_key:
+        index, dist_name, version, lock_hash = index_key
+        stored = _stored_if_current(
+            index.get_symbol_set(project_root, dist_name, version, lock_hash)
+        )
+        if stored is not None and (not pattern or not stored.get("truncated")):
+            symbols = filter_symbols(stored.get("symbols", []), pattern)
+            increment("cache.persistent_index.hit")
+            logger.debug(f"Using persistent index for {package_name} symbols")
+            _add_to_cache(
+                cache_key,
+                symbols,
+                project_root,
+                _result_fingerprint(
+                    stored,
+                    stored.get("package_file"),
+                    _dist_info_path(package_name, project_root),
+                ),
+            )
+            return symbols
+
     script = SEARCH_SYMBOLS_SCRIPT.format(
-        package_name=package_name, pattern=pattern or ""
+        package_name=package_name,
+        pattern=pattern or "",
+        max_symbols=MAX_SCAN_SYMBOLS,
     )
 
     try:
         logger.info(f"Running subprocess search for {package_name} at {project_root}")
-        result = subprocess.run(
-            runner + ["-c", script],
-            capture_output=True,
-            text=True,
-            cwd=project_root,
-            timeout=timeout,
-        )
+        result = _run_script(runner, project_root, script, timeout, package_name)
 
         if result.returncode == 0:
-            data = json.loads(result.stdout)
+            with span("subprocess.parse_output"):
+                data = json.loads(result.stdout)
             if "error" not in data:
                 symbols = data.get("symbols", [])
                 logger.info(
                     f"Successfully searched symbols via subprocess: {len(symbols)} found"
                 )
-                _add_to_cache(cache_key, symbols)
+                fingerprint = _fingerprint(
+                    data.get("package_file"),
+                    _dist_info_path(package_name, project_root),
+                )
+                _add_to_cache(cache_key, symbols, project_root, fingerprint)
+                if index_key and not pattern:
+                    index.put_symbol_set(
+                        project_root,
+                        dist_name,
+                        version,
+                        lock_hash,
+                        {
+                            "symbols": symbols,
+                            "truncated": data.get("truncated", False),
+                            "package_file": data.get("package_file"),
+                            "fingerprint": fingerprint,
+                        },
+                    )
                 return symbols
             else:
                 logger.warning(f"Subprocess search error: {data.get('error')}")
@@ -670,25 +1721,53 @@ def introspect_package_docstring(
         logger.debug(f"Using cached docstring for {package_name}")
         return cached
 
+    index_key = _persistent_key(package_name, project_root)
+    if index_key:
+        index, dist_name, version, lock_hash = index_key
+        stored = _stored_if_current(
+            index.get_symbol(
+                project_root, dist_name, version, lock_hash, PACKAGE_DOCSTRING_KEY
+            )
+        )
+        if stored is not None:
+            increment("cache.persistent_index.hit")
+            logger.debug(f"Using persistent index for {package_name} docstring")
+            _add_to_cache(
+                cache_key,
+                stored,
+                project_root,
+                _symbol_fingerprint(package_name, project_root, stored),
+            )
+            return stored
+
     script = PACKAGE_DOCSTRING_SCRIPT.format(package_name=package_name)
 
     try:
         logger.info(f"Running subprocess docstring introspection for {package_name}")
-        result = subprocess.run(
-            runner + ["-c", script],
-            capture_output=True,
-            text=True,
-            cwd=project_root,
-            timeout=timeout,
-        )
+        result = _run_script(runner, project_root, script, timeout, package_name)
 
         if result.returncode == 0:
-            data = json.loads(result.stdout)
+            with span("subprocess.parse_output"):
+                data = json.loads(result.stdout)
             if "error" not in data:
                 logger.info(
                     f"Successfully got docstring for {package_name} via subprocess"
                 )
-                _add_to_cache(cache_key, data)
+                _add_to_cache(
+                    cache_key,
+                    data,
+                    project_root,
+                    _symbol_fingerprint(package_name, project_root, data),
+                )
+                if index_key:
+                    index.put_symbol(
+                        project_root,
+                        dist_name,
+                        version,
+                        lock_hash,
+                        PACKAGE_DOCSTRING_KEY,
+                        data,
+                    )
                 return data
             else:
                 logger.debug(
@@ -706,6 +1785,40 @@ def introspect_package_docstring(
 
 _client_working_directory: Optional[Path] = None
 
+# Workspace of the HTTP session being served (see http_transport.py); takes
+# precedence over the process-wide client root for code running on its behalf
+_workspace_directory: ContextVar[Optional[Path]] = ContextVar(
+    "mcpydoc_workspace_directory", default=None
+)
+
+
+def client_working_directory() -> Optional[Path]:
+    """Get the workspace root provided by the MCP client, if any.
+
+    Returns:
+        The current workspace scope's root, else the root set with
+        set_working_directory(), else None
+    """
+    return _workspace_directory.get() or _client_working_directory
+
+
+@contextmanager
+def workspace_scope(path: Optional[Path]) -> Iterator[None]:
+    """Treat a directory as the client's workspace within a block.
+
+    Unlike set_working_directory(), this only affects the current context
+    (and threads started with a copy of it), so sessions of one server can
+    work in different workspaces at the same time.
+
+    Args:
+        path: Workspace root, or None to use the process-wide client root
+    """
+    token = _workspace_directory.set(path)
+    try:
+        yield
+    finally:
+        _workspace_directory.reset(token)
+
 
 def set_working_directory(path: Optional[str]) -> None:
     """Set the working directory from MCP client roots.
@@ -746,8 +1859,9 @@ def get_working_directory() -> Path:
     import os
 
     # 1. Check if client roots were set (from MCP roots capability)
-    if _client_working_directory is not None:
-        return _client_working_directory
+    client_root = client_working_directory()
+    if client_root is not None:
+        return client_root
 
     # 2. Check PWD environment variable
     pwd = os.environ.get("PWD")
@@ -777,8 +1891,9 @@ def refresh_working_directory() -> Path:
     import os
 
     # 1. Check if client roots were set (from MCP roots capability)
-    if _client_working_directory is not None:
-        return _client_working_directory
+    client_root = client_working_directory()
+    if client_root is not None:
+        return client_root
 
     # 2. Check PWD environment variable
     pwd = os.environ.get("PWD")
@@ -792,10 +1907,15 @@ def refresh_working_directory() -> Path:
 
 
 def clear_cache() -> None:
-    """Clear all caches."""
+    """Clear all caches and stop persistent workers holding warm imports."""
     global _package_manager_cache, _introspection_cache
     _package_manager_cache.clear()
     _introspection_cache.clear()
+    with _failure_cache_lock:
+        _failure_cache.clear()
+    with _interpreter_cache_lock:
+        _interpreter_cache.clear()
+    shutdown_workers()
     logger.info("Cleared subprocess introspection caches")
 
 
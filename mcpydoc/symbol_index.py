@@ -0,0 +1,330 @@
+"""Persistent on-disk symbol index for MCPyDoc.
+
+Editors restart MCP servers constantly, which throws away every in-process
+cache. This module stores introspection results in a SQLite database under
+``~/.cache/mcpydoc`` so repeat sessions can answer ``search_symbols`` and
+``analyze_structure`` without importing the target package at all.
+
+Entries are keyed by project root, distribution name, version and a hash of
+the project's lockfile, so ``uv sync`` / ``poetry lock`` naturally produce a
+fresh key instead of serving stale results.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Files whose content identifies the installed dependency set of a project
+LOCKFILE_NAMES = ["uv.lock", "poetry.lock", "Pipfile.lock", "pyproject.toml"]
+
+# Bump when the stored payload format changes
+SCHEMA_VERSION = 3
+
+# Cache of lockfile hashes keyed by project root, validated by file stats
+_lockfile_hash_cache: Dict[str, Tuple[Tuple, str]] = {}
+
+
+def get_cache_dir() -> Path:
+    """Get the directory holding MCPyDoc's persistent caches.
+
+    Priority order:
+    1. MCPYDOC_CACHE_DIR environment variable
+    2. $XDG_CACHE_HOME/mcpydoc
+    3. ~/.cache/mcpydoc
+
+    Returns:
+        Path to the cache directory (not necessarily existing yet)
+    """
+    override = os.environ.get("MCPYDOC_CACHE_DIR")
+    if override:
+        return Path(os.path.expanduser(override))
+
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache:
+        return Path(xdg_cache) / "mcpydoc"
+
+    return Path.home() / ".cache" / "mcpydoc"
+
+
+def persistent_index_enabled() -> bool:
+    """Check whether the persistent index is enabled (MCPYDOC_PERSISTENT_INDEX)."""
+    return os.environ.get("MCPYDOC_PERSISTENT_INDEX", "1").lower() not in (
+        "0",
+        "false",
+        "no",
+        "off",
+    )
+
+
+def lockfile_hash(project_root: Path) -> str:
+    """Hash the lockfiles of a project.
+
+    The hash is recomputed only when a lockfile's size or mtime changes.
+
+    Args:
+        project_root: Project root directory
+
+    Returns:
+        Hex digest identifying the project's dependency set
+    """
+    stats = []
+    for name in LOCKFILE_NAMES:
+        try:
+            stat = (project_root / name).stat()
+            stats.append((name, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            continue
+    stats_key = tuple(stats)
+
+    cache_key = str(project_root)
+    cached = _lockfile_hash_cache.get(cache_key)
+    if cached is not None and cached[0] == stats_key:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    for name, _, _ in stats:
+        digest.update(name.encode())
+        try:
+            digest.update((project_root / name).read_bytes())
+        except OSError:
+            continue
+    result = digest.hexdigest()
+    _lockfile_hash_cache[cache_key] = (stats_key, result)
+    return result
+
+
+class PersistentSymbolIndex:
+    """SQLite-backed store of package metadata and symbols."""
+
+    def __init__(self, db_path: Path) -> None:
+        """Open (and create if needed) the index database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS packages (
+                    project_root TEXT NOT NULL,
+                    package TEXT NOT NULL,
+                    lock_hash TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (project_root, package, lock_hash)
+                )
+                """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS symbol_sets (
+                    project_root TEXT NOT NULL,
+                    distribution TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    lock_hash TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (project_root, distribution, version, lock_hash)
+                )
+                """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS symbols (
+                    project_root TEXT NOT NULL,
+                    distribution TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    lock_hash TEXT NOT NULL,
+                    symbol_path TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (
+                        project_root, distribution, version, lock_hash, symbol_path
+                    )
+                )
+                """)
+
+    def _fetch(self, query: str, params: Tuple) -> Optional[Any]:
+        """Run a lookup query and decode the JSON payload."""
+        try:
+            with self._lock:
+                row = self._conn.execute(query, params).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent index lookup failed: {e}")
+            return None
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def _store(self, prune: str, insert: str, params: Tuple) -> None:
+        """Insert an entry, logging (not raising) on failure.
+
+        Args:
+            prune: DELETE of the rows the entry supersedes (other lock hashes
+                or versions of the same project and package), which would
+                otherwise never be read again
+            insert: INSERT of the entry
+            params: Parameters of the INSERT; the DELETE takes as many of
+                them as it has placeholders
+        """
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(prune, params[: prune.count("?")])
+                self._conn.execute(insert, params)
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent index write failed: {e}")
+
+    def get_package(
+        self, project_root: Path, package: str, lock_hash: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get stored package metadata."""
+        return self._fetch(
+            "SELECT data FROM packages "
+            "WHERE project_root = ? AND package = ? AND lock_hash = ?",
+            (str(project_root), package, lock_hash),
+        )
+
+    def put_package(
+        self, project_root: Path, package: str, lock_hash: str, data: Dict[str, Any]
+    ) -> None:
+        """Store package metadata, replacing that of earlier lockfiles."""
+        self._store(
+            "DELETE FROM packages "
+            "WHERE project_root = ? AND package = ? AND lock_hash != ?",
+            "INSERT OR REPLACE INTO packages VALUES (?, ?, ?, ?)",
+            (str(project_root), package, lock_hash, json.dumps(data)),
+        )
+
+    def get_symbol_set(
+        self, project_root: Path, distribution: str, version: str, lock_hash: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get the stored full symbol scan of a distribution."""
+        return self._fetch(
+            "SELECT data FROM symbol_sets WHERE project_root = ? "
+            "AND distribution = ? AND version = ? AND lock_hash = ?",
+            (str(project_root), distribution, version, lock_hash),
+        )
+
+    def put_symbol_set(
+        self,
+        project_root: Path,
+        distribution: str,
+        version: str,
+        lock_hash: str,
+        data: Dict[str, Any],
+    ) -> None:
+        """Store the full symbol scan of a distribution, replacing scans of
+        other versions and lockfiles."""
+        self._store(
+            "DELETE FROM symbol_sets WHERE project_root = ? AND distribution = ? "
+            "AND NOT (version = ? AND lock_hash = ?)",
+            "INSERT OR REPLACE INTO symbol_sets VALUES (?, ?, ?, ?, ?)",
+            (str(project_root), distribution, version, lock_hash, json.dumps(data)),
+        )
+
+    def get_symbol(
+        self,
+        project_root: Path,
+        distribution: str,
+        version: str,
+        lock_hash: str,
+        symbol_path: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Get stored details of a single symbol."""
+        return self._fetch(
+            "SELECT data FROM symbols WHERE project_root = ? AND distribution = ? "
+            "AND version = ? AND lock_hash = ? AND symbol_path = ?",
+            (str(project_root), distribution, version, lock_hash, symbol_path),
+        )
+
+    def put_symbol(
+        self,
+        project_root: Path,
+        distribution: str,
+        version: str,
+        lock_hash: str,
+        symbol_path: str,
+        data: Dict[str, Any],
+    ) -> None:
+        """Store details of a single symbol, dropping the distribution's
+        symbols stored for other versions and lockfiles."""
+        self._store(
+            "DELETE FROM symbols WHERE project_root = ? AND distribution = ? "
+            "AND NOT (version = ? AND lock_hash = ?)",
+            "INSERT OR REPLACE INTO symbols VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                str(project_root),
+                distribution,
+                version,
+                lock_hash,
+                symbol_path,
+                json.dumps(data),
+            ),
+        )
+
+    def clear(self) -> None:
+        """Remove all stored entries."""
+        with self._lock, self._conn:
+            for table in ("packages", "symbol_sets", "symbols"):
+                self._conn.execute(f"DELETE FROM {table}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_index: Optional[PersistentSymbolIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_persistent_index() -> Optional[PersistentSymbolIndex]:
+    """Get the shared persistent index, opening it on first use.
+
+    Returns:
+        The index, or None if disabled or the database cannot be opened
+    """
+    global _index
+
+    if not persistent_index_enabled():
+        return None
+
+    db_path = get_cache_dir() / f"symbols-v{SCHEMA_VERSION}.sqlite3"
+    with _index_lock:
+        if _index is not None and _index.db_path == db_path:
+            return _index
+        if _index is not None:
+            _index.close()
+            _index = None
+        try:
+            _index = PersistentSymbolIndex(db_path)
+            logger.info(f"Opened persistent symbol index at {db_path}")
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Persistent symbol index unavailable ({db_path}): {e}")
+            return None
+        return _index
+
+
+def filter_symbols(
+    symbols: List[Dict[str, Any]], pattern: Optional[str]
+) -> List[Dict[str, Any]]:
+    """Apply the search pattern to a stored full symbol scan.
+
+    Uses the same case-insensitive substring match on the dotted path
+    as SEARCH_SYMBOLS_SCRIPT.
+    """
+    if not pattern:
+        return list(symbols)
+    pattern = pattern.lower()
+    return [
+        symbol
+        for symbol in symbols
+        if pattern in symbol.get("path", symbol.get("name", "")).lower()
+    ]
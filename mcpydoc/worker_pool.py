@@ -0,0 +1,745 @@
+"""Persistent introspection workers for MCPyDoc.
+
+Running ``uv run python -c <script>`` for every tool call pays interpreter
+startup, package manager resolution and the target package import each time.
+This module keeps one long-lived interpreter per project root instead. The
+worker executes introspection scripts sent over a line-delimited JSON protocol
+on stdin/stdout, so imported modules stay warm between calls. Workers that
+crash or time out are killed and transparently respawned on the next request.
+
+Each project root may run a limited number of interpreters at once (one-shot
+or persistent). Further requests queue for a slot until their timeout, and a
+project gets additional workers only while its existing ones are busy, so
+concurrent requests run in parallel without oversubscribing the machine.
+Background work (see prewarm.py) queues behind interactive requests and never
+takes a project's last free slot.
+
+In zygote mode (MCPYDOC_ZYGOTE_WORKERS=1, POSIX only) the worker imports each
+requested package once and runs every script in an ``os.fork()`` child that
+inherits the warm modules, answers and exits. Nothing a script imports or
+patches survives into the next request, as with one-shot subprocesses, while
+the expensive package import is still paid only once per worker.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Set
+
+from .metrics import increment, span
+
+logger = logging.getLogger(__name__)
+
+# Whether introspection should go through persistent workers at all
+_persistent_workers_enabled = os.environ.get(
+    "MCPYDOC_PERSISTENT_WORKERS", "1"
+).lower() not in ("0", "false", "no", "off")
+
+# Whether workers run each script in a forked child of a warm interpreter
+_zygote_workers_enabled = os.environ.get("MCPYDOC_ZYGOTE_WORKERS", "0").lower() not in (
+    "0",
+    "false",
+    "no",
+    "off",
+)
+
+# Maximum number of interpreters running introspection per project root
+MAX_INTERPRETERS_PER_PROJECT = 2
+
+# Worker executed inside the project's interpreter.
+#
+# The protocol channel is a private duplicate of fd 1; fd 1 itself is pointed at
+# stderr so that stray writes from imported packages cannot corrupt responses.
+# Each request is ``{"id": ..., "script": ...}`` and each response is
+# ``{"id": ..., "returncode": ..., "stdout": ..., "stderr": ...}``, mirroring
+# what ``subprocess.run`` returns for a one-shot ``python -c`` invocation.
+# Requests with ``"fork": true`` run the script in a forked child, after
+# running their ``"preload"`` script (if any) once in the worker itself.
+WORKER_SCRIPT = r"""
+import contextlib
+import io
+import json
+import os
+import sys
+import traceback
+
+_protocol = os.fdopen(os.dup(1), "w", encoding="utf-8")
+os.dup2(2, 1)
+sys.stdout = sys.stderr
+
+
+def _run(script):
+    out, err = io.StringIO(), io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            code = compile(script, "<mcpydoc-introspection>", "exec")
+            exec(code, {"__name__": "__mcpydoc__"})
+        except SystemExit as e:
+            if e.code is None:
+                returncode = 0
+            elif isinstance(e.code, int):
+                returncode = e.code
+            else:
+                returncode = 1
+        except BaseException:
+            traceback.print_exc()
+            returncode = 1
+    return returncode, out.getvalue(), err.getvalue()
+
+
+_preloaded = set()
+
+
+def _preload(script):
+    # Warm the worker itself; forked children inherit the imported modules
+    if script and script not in _preloaded:
+        _preloaded.add(script)
+        _run(script)
+
+
+def _run_forked(script):
+    if not hasattr(os, "fork"):
+        return _run(script)
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            with os.fdopen(write_fd, "w", encoding="utf-8") as result:
+                json.dump(_run(script), result)
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd, "r", encoding="utf-8") as result:
+        output = result.read()
+    _, status = os.waitpid(pid, 0)
+    try:
+        return tuple(json.loads(output))
+    except ValueError:
+        if hasattr(os, "waitstatus_to_exitcode"):
+            status = os.waitstatus_to_exitcode(status)
+        return 1, "", f"Introspection process exited abnormally ({status})"
+
+
+def _send(message):
+    _protocol.write(json.dumps(message) + "\n")
+    _protocol.flush()
+
+
+_send({"ready": True, "pid": os.getpid(), "executable": sys.executable})
+
+for line in sys.stdin:
+    line = line.strip()
+    if not line:
+        continue
+    try:
+        request = json.loads(line)
+    except ValueError:
+        continue
+    if request.get("fork"):
+        _preload(request.get("preload"))
+        returncode, stdout, stderr = _run_forked(request.get("script", ""))
+    else:
+        returncode, stdout, stderr = _run(request.get("script", ""))
+    _send(
+        {
+            "id": request.get("id"),
+            "returncode": returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+        }
+    )
+"""
+
+
+def _kill_process_tree(process: subprocess.Popen) -> None:
+    """Kill a child process and everything it started.
+
+    Runners like ``uv run python`` start the interpreter as a grandchild, so
+    killing only the direct child could leave a stuck interpreter behind.
+    Children are started in their own session (see _popen_kwargs) so the
+    whole process group can be killed at once.
+    """
+    if process.poll() is not None:
+        return
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except OSError:
+            pass
+    process.kill()
+
+
+def _popen_kwargs() -> Dict[str, Any]:
+    """Popen arguments that put a child in its own process group."""
+    return {"start_new_session": True} if os.name == "posix" else {}
+
+
+def run_process(
+    command: List[str], cwd: Path, timeout: Optional[float]
+) -> subprocess.CompletedProcess:
+    """Run a one-shot command, killing its whole process tree on timeout.
+
+    Args:
+        command: Command line to run
+        cwd: Working directory
+        timeout: Timeout in seconds
+
+    Returns:
+        CompletedProcess with exit code, stdout and stderr
+
+    Raises:
+        subprocess.TimeoutExpired: If the command did not finish in time
+        FileNotFoundError: If the command does not exist
+    """
+    increment("subprocess.one_shot")
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        text=True,
+        **_popen_kwargs(),
+    )
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _kill_process_tree(process)
+        process.communicate()
+        raise
+    except BaseException:
+        _kill_process_tree(process)
+        process.wait()
+        raise
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+class WorkerError(Exception):
+    """Raised when a persistent worker cannot serve a request."""
+
+
+class SlotTimeoutExpired(subprocess.TimeoutExpired):
+    """Raised when no interpreter slot of a project became free in time.
+
+    Unlike a plain TimeoutExpired, this says nothing about the script itself,
+    only that the project was busy.
+    """
+
+
+class IntrospectionWorker:
+    """A long-lived interpreter for one project root."""
+
+    def __init__(self, runner: List[str], project_root: Path) -> None:
+        """Initialize the worker (the process is spawned lazily).
+
+        Args:
+            runner: Command prefix that starts the project's Python interpreter
+            project_root: Project root the interpreter runs in
+        """
+        self.runner = list(runner)
+        self.project_root = project_root
+        self._process: Optional[subprocess.Popen] = None
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self.spawn_count = 0
+        self.executable: Optional[str] = None
+        # Wall-clock time of the last spawn, compared with file change times
+        self.started_at: Optional[float] = None
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether the worker process is currently running."""
+        return self._process is not None and self._process.poll() is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Process id of the running worker, if any."""
+        process = self._process
+        return process.pid if process is not None and process.poll() is None else None
+
+    @staticmethod
+    def _read_responses(
+        stdout: IO[str], responses: "queue.Queue[Optional[str]]"
+    ) -> None:
+        """Pump worker stdout lines into the response queue."""
+        try:
+            for line in stdout:
+                responses.put(line)
+        except (OSError, ValueError):
+            pass
+        # Signal EOF so waiting callers notice the crash immediately
+        responses.put(None)
+
+    @span("worker.spawn")
+    def _spawn(self, timeout: float) -> None:
+        """Start the worker process and wait for its ready handshake."""
+        self._responses = queue.Queue()
+        started_at = time.time()
+        logger.info(
+            f"Starting persistent introspection worker at {self.project_root}: "
+            f"{' '.join(self.runner)}"
+        )
+        try:
+            process = subprocess.Popen(
+                self.runner + ["-u", "-c", WORKER_SCRIPT],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.project_root,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+                **_popen_kwargs(),
+            )
+        except OSError as e:
+            raise WorkerError(f"Could not start worker: {e}")
+        assert process.stdin is not None and process.stdout is not None
+
+        self._process = process
+        self.started_at = started_at
+        self.spawn_count += 1
+        increment("worker.spawns")
+        threading.Thread(
+            target=self._read_responses,
+            args=(process.stdout, self._responses),
+            name=f"mcpydoc-worker-{process.pid}",
+            daemon=True,
+        ).start()
+
+        handshake = self._wait_for_line(timeout)
+        try:
+            ready = json.loads(handshake)
+        except ValueError:
+            self.stop()
+            raise WorkerError(f"Unexpected worker handshake: {handshake!r}")
+        if not ready.get("ready"):
+            self.stop()
+            raise WorkerError(f"Unexpected worker handshake: {handshake!r}")
+        self.executable = ready.get("executable")
+
+    def _wait_for_line(self, timeout: float) -> str:
+        """Wait for the next protocol line, killing the worker on failure."""
+        try:
+            line = self._responses.get(timeout=max(timeout, 0.001))
+        except queue.Empty:
+            self.stop()
+            raise subprocess.TimeoutExpired(self.runner, timeout)
+        if line is None:
+            self.stop()
+            raise WorkerError("Worker exited unexpectedly")
+        return line
+
+    def execute(
+        self, script: str, timeout: float, preload: Optional[str] = None
+    ) -> subprocess.CompletedProcess:
+        """Run an introspection script in the worker.
+
+        Args:
+            script: Python source to execute (same scripts as ``python -c``)
+            timeout: Timeout in seconds, including startup if the worker is cold
+            preload: Script importing the package the request is about; in
+                zygote mode the worker runs it once before forking
+
+        Returns:
+            CompletedProcess with the script's exit code, stdout and stderr
+
+        Raises:
+            subprocess.TimeoutExpired: If the worker did not answer in time
+                (the worker is killed and will be respawned on the next call)
+            WorkerError: If the worker could not be started or crashed
+        """
+        with self._lock:
+            deadline = time.monotonic() + timeout
+            if not self.is_alive:
+                self._spawn(timeout)
+            process = self._process
+            # Spawned with pipes for both, see _spawn
+            assert process is not None and process.stdin is not None
+
+            request_id = self._next_id
+            self._next_id += 1
+            request = {"id": request_id, "script": script}
+            if zygote_workers_enabled():
+                request.update(fork=True, preload=preload)
+            try:
+                process.stdin.write(json.dumps(request) + "\n")
+                process.stdin.flush()
+            except (OSError, ValueError) as e:
+                self.stop()
+                raise WorkerError(f"Could not send request to worker: {e}")
+
+            while True:
+                line = self._wait_for_line(deadline - time.monotonic())
+                try:
+                    response = json.loads(line)
+                except ValueError:
+                    logger.debug(f"Ignoring malformed worker output: {line!r}")
+                    continue
+                if response.get("id") == request_id:
+                    break
+
+            return subprocess.CompletedProcess(
+                self.runner,
+                response.get("returncode", 1),
+                response.get("stdout", ""),
+                response.get("stderr", ""),
+            )
+
+    def stop(self) -> None:
+        """Terminate the worker process if it is running."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            if process.stdin:
+                process.stdin.close()
+        except OSError:
+            pass
+        _kill_process_tree(process)
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Worker {process.pid} did not exit after kill")
+
+
+_workers: Dict[str, List[IntrospectionWorker]] = {}
+_busy_workers: Set[IntrospectionWorker] = set()
+_workers_lock = threading.Lock()
+
+# Per project root: workers started before this time hold stale modules
+_stale_before: Dict[str, float] = {}
+
+_project_slots: Dict[str, "_ProjectSlots"] = {}
+_project_slots_lock = threading.Lock()
+
+# Set while running background work, which yields interpreter slots
+_background: ContextVar[bool] = ContextVar("mcpydoc_background", default=False)
+
+
+def max_interpreters_per_project() -> int:
+    """Get the per-project interpreter limit (MCPYDOC_MAX_INTERPRETERS_PER_PROJECT)."""
+    try:
+        limit = int(
+            os.environ.get(
+                "MCPYDOC_MAX_INTERPRETERS_PER_PROJECT", MAX_INTERPRETERS_PER_PROJECT
+            )
+        )
+    except ValueError:
+        limit = MAX_INTERPRETERS_PER_PROJECT
+    return max(1, limit)
+
+
+class _ProjectSlots:
+    """Interpreter slots of one project root, handed to interactive work first."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_use = 0
+        self.waiting = 0  # Interactive callers queued for a slot
+        self.queued = 0  # All callers queued for a slot
+        self._condition = threading.Condition()
+
+    def _available(self, background: bool) -> bool:
+        if background:
+            # Never jump the queue, and keep a slot free for interactive calls
+            return self.waiting == 0 and self.in_use < max(1, self.limit - 1)
+        return self.in_use < self.limit
+
+    def acquire(self, timeout: Optional[float], background: bool) -> bool:
+        """Take a slot, waiting up to timeout seconds (None waits forever)."""
+        with self._condition:
+            self.queued += 1
+            if not background:
+                self.waiting += 1
+            try:
+                acquired = self._condition.wait_for(
+                    lambda: self._available(background),
+                    None if timeout is None else max(timeout, 0),
+                )
+                if acquired:
+                    self.in_use += 1
+            finally:
+                self.queued -= 1
+                if not background:
+                    self.waiting -= 1
+                    # Background callers may have been held back by this one
+                    self._condition.notify_all()
+            return acquired
+
+    def release(self) -> None:
+        """Return a slot."""
+        with self._condition:
+            self.in_use -= 1
+            self._condition.notify_all()
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Run a block as background work that yields to interactive requests.
+
+    Introspection started in the block waits while interactive calls queue
+    for the project's interpreters and leaves one slot free for them.
+    """
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+@contextmanager
+def project_slot(project_root: Path, timeout: Optional[float]) -> Iterator[None]:
+    """Hold one of a project's interpreter slots, queueing until one is free.
+
+    Args:
+        project_root: Project root the interpreter runs in
+        timeout: Maximum time in seconds to wait for a slot (None waits forever)
+
+    Raises:
+        SlotTimeoutExpired: If no slot became free in time
+    """
+    key = str(project_root)
+    with _project_slots_lock:
+        slots = _project_slots.get(key)
+        if slots is None:
+            slots = _ProjectSlots(max_interpreters_per_project())
+            _project_slots[key] = slots
+
+    acquired = slots.acquire(timeout, _background.get())
+    if not acquired:
+        logger.warning(f"Timed out waiting for an interpreter slot at {project_root}")
+        # acquire() only gives up when there is a timeout
+        raise SlotTimeoutExpired(f"introspection at {project_root}", timeout or 0.0)
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+def set_persistent_workers(enabled: bool) -> None:
+    """Enable or disable persistent workers.
+
+    Disabling shuts down any running workers; introspection then falls back to
+    one subprocess per call.
+
+    Args:
+        enabled: Whether to use persistent workers
+    """
+    global _persistent_workers_enabled
+    _persistent_workers_enabled = enabled
+    if not enabled:
+        shutdown_workers()
+
+
+def persistent_workers_enabled() -> bool:
+    """Check whether persistent workers are enabled."""
+    return _persistent_workers_enabled
+
+
+def set_zygote_workers(enabled: bool) -> None:
+    """Enable or disable zygote mode for persistent workers.
+
+    Running workers are stopped, so that no worker keeps modules imported by
+    scripts that ran in it before forking was enabled.
+
+    Args:
+        enabled: Whether to run each script in a forked child of the worker
+    """
+    global _zygote_workers_enabled
+    if enabled != _zygote_workers_enabled:
+        _zygote_workers_enabled = enabled
+        shutdown_workers()
+
+
+def zygote_workers_enabled() -> bool:
+    """Check whether workers run scripts in forked children (zygote mode)."""
+    return _zygote_workers_enabled
+
+
+def _worker_key(runner: List[str], project_root: Path) -> str:
+    """Key of a project's workers in the pool."""
+    return f"{project_root}:{' '.join(runner)}"
+
+
+def get_worker(runner: List[str], project_root: Path) -> IntrospectionWorker:
+    """Get (or create) the primary persistent worker for a project root.
+
+    Args:
+        runner: Command prefix that starts the project's Python interpreter
+        project_root: Project root the worker runs in
+
+    Returns:
+        The first worker for this project root and runner
+    """
+    key = _worker_key(runner, project_root)
+    with _workers_lock:
+        workers = _workers.setdefault(key, [])
+        if not workers:
+            workers.append(IntrospectionWorker(runner, project_root))
+        return workers[0]
+
+
+@contextmanager
+def checkout_worker(
+    runner: List[str], project_root: Path
+) -> Iterator[IntrospectionWorker]:
+    """Borrow an idle worker for a project root, creating one if all are busy.
+
+    Callers hold a project_slot while borrowing, which bounds the number of
+    workers per project.
+
+    Args:
+        runner: Command prefix that starts the project's Python interpreter
+        project_root: Project root the worker runs in
+
+    Yields:
+        A worker reserved for the caller until the block exits
+    """
+    key = _worker_key(runner, project_root)
+    with _workers_lock:
+        workers = _workers.setdefault(key, [])
+        worker = next((w for w in workers if w not in _busy_workers), None)
+        if worker is None:
+            worker = IntrospectionWorker(runner, project_root)
+            workers.append(worker)
+        _busy_workers.add(worker)
+        stale = _is_stale(worker)
+    if stale:
+        logger.info(f"Restarting worker at {project_root}: its environment changed")
+        worker.stop()
+    try:
+        yield worker
+    finally:
+        with _workers_lock:
+            _busy_workers.discard(worker)
+
+
+def queued_request_count() -> int:
+    """Number of introspection calls waiting for an interpreter slot."""
+    with _project_slots_lock:
+        return sum(slots.queued for slots in _project_slots.values())
+
+
+def active_worker_count() -> int:
+    """Number of worker processes currently running."""
+    with _workers_lock:
+        return sum(
+            1 for workers in _workers.values() for worker in workers if worker.is_alive
+        )
+
+
+def _resident_memory(pid: str) -> int:
+    """Resident set size of a process in bytes (0 where /proc is unavailable)."""
+    try:
+        with open(f"/proc/{pid}/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def worker_memory(project_root: Optional[Path] = None) -> int:
+    """Resident memory of running workers, in bytes.
+
+    Only measured where /proc is available (Linux); 0 elsewhere.
+
+    Args:
+        project_root: Only count this project's workers (what stopping them
+            would free); all workers if None
+    """
+    with _workers_lock:
+        pids = [
+            worker.pid
+            for group in _workers.values()
+            for worker in group
+            if project_root is None or worker.project_root == project_root
+        ]
+    return sum(_resident_memory(str(pid)) for pid in pids if pid is not None)
+
+
+def _is_stale(worker: IntrospectionWorker) -> bool:
+    """Whether a worker started before its project's environment last changed.
+
+    Callers hold _workers_lock.
+    """
+    stale_before = _stale_before.get(str(worker.project_root))
+    return (
+        stale_before is not None
+        and worker.started_at is not None
+        and worker.started_at < stale_before
+    )
+
+
+def restart_workers(project_root: Path, changed_at: float) -> None:
+    """Restart the workers of a project whose installed packages changed.
+
+    Only workers started before the change hold stale modules. Idle ones are
+    stopped now; busy ones finish their request and are restarted when next
+    checked out. Workers started since keep running, so reporting the same
+    change again (e.g. once per stale cache entry) costs nothing.
+
+    Args:
+        project_root: Project root whose environment changed
+        changed_at: Wall-clock time of the change (file mtime or ctime)
+    """
+    key = str(project_root)
+    with _workers_lock:
+        if changed_at <= _stale_before.get(key, 0.0):
+            return
+        _stale_before[key] = changed_at
+        stale = [
+            worker
+            for group in _workers.values()
+            for worker in group
+            if worker.project_root == project_root
+            and worker not in _busy_workers
+            and _is_stale(worker)
+        ]
+        # Reserved while stopping, so that nobody checks them out meanwhile
+        _busy_workers.update(stale)
+    for worker in stale:
+        worker.stop()
+    with _workers_lock:
+        _busy_workers.difference_update(stale)
+    if stale:
+        logger.info(
+            f"Stopped {len(stale)} stale worker(s) at {project_root}; "
+            f"they restart on next use"
+        )
+
+
+def shutdown_workers(project_root: Optional[Path] = None) -> None:
+    """Stop persistent workers.
+
+    Args:
+        project_root: Only stop this project's workers (e.g. because its
+            installed packages changed and warm imports are stale); all
+            workers if None
+    """
+    with _workers_lock:
+        keys = [
+            key
+            for key, group in _workers.items()
+            if project_root is None
+            or any(worker.project_root == project_root for worker in group)
+        ]
+        workers = [worker for key in keys for worker in _workers.pop(key)]
+    for worker in workers:
+        worker.stop()
+    if workers:
+        logger.info(f"Stopped {len(workers)} persistent introspection worker(s)")
+
+
+atexit.register(shutdown_workers)
@@ -0,0 +1,216 @@
+"""Documentation servers per workspace root.
+
+Each project root (or, outside any project, each root directory) gets its own
+MCPyDoc: an analyzer with its own environment detection, import and search
+caches, docstring caches and persistent introspection workers. Switching
+between the services of a monorepo, or between the workspaces of several
+clients sharing one HTTP server (http_transport.py), then finds each root's
+caches warm instead of re-detecting environments on every switch.
+
+The pool is a bounded LRU. When more than MCPYDOC_MAX_WORKSPACES workspaces
+are open, or their introspection workers use more than
+MCPYDOC_WORKSPACE_MEMORY_MB of memory, the least recently used workspaces
+that are not answering a tool call are closed and their workers stopped.
+Only worker memory counts: it is what closing a workspace gives back, while
+the server's own memory rarely shrinks (imported modules stay loaded).
+"""
+
+import logging
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from .metrics import increment
+from .security import MAX_CONCURRENT_REQUESTS
+from .server import MCPyDoc
+from .subprocess_introspection import find_project_root, workspace_scope
+from .worker_pool import shutdown_workers, worker_memory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKSPACES = 8
+
+DEFAULT_WORKSPACE_MEMORY_MB = 2048
+
+
+def max_workspaces() -> int:
+    """Get the number of workspaces kept open (MCPYDOC_MAX_WORKSPACES)."""
+    value = os.environ.get("MCPYDOC_MAX_WORKSPACES", str(DEFAULT_MAX_WORKSPACES))
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f"Ignoring invalid MCPYDOC_MAX_WORKSPACES: {value!r}")
+        return DEFAULT_MAX_WORKSPACES
+
+
+def workspace_memory_budget() -> int:
+    """Get the worker memory budget in MB above which idle workspaces are
+    closed (MCPYDOC_WORKSPACE_MEMORY_MB, 0 disables)."""
+    value = os.environ.get(
+        "MCPYDOC_WORKSPACE_MEMORY_MB", str(DEFAULT_WORKSPACE_MEMORY_MB)
+    )
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logger.warning(f"Ignoring invalid MCPYDOC_WORKSPACE_MEMORY_MB: {value!r}")
+        return DEFAULT_WORKSPACE_MEMORY_MB
+
+
+class WorkspacePool:
+    """LRU of MCPyDoc instances keyed by project root."""
+
+    def __init__(
+        self,
+        max_workers: int = MAX_CONCURRENT_REQUESTS,
+        max_open: Optional[int] = None,
+        memory_budget_mb: Optional[int] = None,
+    ) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            max_workers: Number of analyzer threads of each workspace's server
+            max_open: Maximum number of open workspaces. If None, uses
+                MCPYDOC_MAX_WORKSPACES or DEFAULT_MAX_WORKSPACES.
+            memory_budget_mb: Memory of the workspaces' introspection workers
+                above which idle workspaces are closed (0 disables). If None, uses
+                MCPYDOC_WORKSPACE_MEMORY_MB or DEFAULT_WORKSPACE_MEMORY_MB.
+        """
+        self._max_workers = max_workers
+        self._max_open = max_open if max_open is not None else max_workspaces()
+        if memory_budget_mb is None:
+            memory_budget_mb = workspace_memory_budget()
+        self._memory_budget = memory_budget_mb * 1024 * 1024
+        # Least recently used first; None is the server's own working directory
+        self._workspaces: "OrderedDict[Optional[Path], MCPyDoc]" = OrderedDict()
+        # Tool calls and pre-indexing runs using each workspace
+        self._pins: Dict[Optional[Path], int] = {}
+        self._warmed: Set[Optional[Path]] = set()
+
+    @staticmethod
+    def _key(root: Optional[Path]) -> Optional[Path]:
+        """Key of the workspace answering for a directory."""
+        if root is None:
+            return None
+        path = Path(root).resolve()
+        return find_project_root(path) or path
+
+    def get(self, root: Optional[Path]) -> MCPyDoc:
+        """Get the server of a workspace, opening it on first use.
+
+        Args:
+            root: Workspace root or any directory of a project in it, or None
+                for the server's own working directory
+
+        Returns:
+            The workspace's server, shared by every session using it
+        """
+        key = self._key(root)
+        mcpydoc = self._workspaces.get(key)
+        if mcpydoc is not None:
+            self._workspaces.move_to_end(key)
+            return mcpydoc
+
+        # Environment detection starts in the background, for this root
+        with workspace_scope(key):
+            mcpydoc = MCPyDoc(max_workers=self._max_workers, working_directory=key)
+        self._workspaces[key] = mcpydoc
+        logger.info(f"Opened workspace {key or Path.cwd()}")
+        self._evict(keep=key)
+        return mcpydoc
+
+    def pin(self, root: Optional[Path]) -> MCPyDoc:
+        """Get the server of a workspace and keep it open until unpin().
+
+        Args:
+            root: Workspace root or project directory, or None
+
+        Returns:
+            The workspace's server
+        """
+        mcpydoc = self.get(root)
+        key = self._key(root)
+        self._pins[key] = self._pins.get(key, 0) + 1
+        return mcpydoc
+
+    def unpin(self, root: Optional[Path]) -> None:
+        """Release a workspace pinned with pin()."""
+        key = self._key(root)
+        count = self._pins.pop(key, 0) - 1
+        if count > 0:
+            self._pins[key] = count
+        self._evict(keep=key)
+
+    @contextmanager
+    def use(self, root: Optional[Path]) -> Iterator[MCPyDoc]:
+        """Pin a workspace for the duration of a block, e.g. one tool call.
+
+        Args:
+            root: Workspace root or project directory, or None
+
+        Yields:
+            The workspace's server
+        """
+        mcpydoc = self.pin(root)
+        try:
+            yield mcpydoc
+        finally:
+            self.unpin(root)
+
+    def claim_prewarm(self, root: Optional[Path]) -> bool:
+        """Claim a workspace's background pre-indexing.
+
+        Args:
+            root: Workspace root or project directory, or None
+
+        Returns:
+            True for the first caller since the workspace was opened; later
+            sessions find its caches already warm(ing)
+        """
+        key = self._key(root)
+        if key in self._warmed:
+            return False
+        self._warmed.add(key)
+        return True
+
+    def roots(self) -> List[Optional[Path]]:
+        """Get the roots of the open workspaces, least recently used first."""
+        return list(self._workspaces)
+
+    def _evict(self, keep: Optional[Path]) -> None:
+        """Close idle workspaces beyond the size limit or the memory budget."""
+        idle = [
+            key for key in self._workspaces if key != keep and not self._pins.get(key)
+        ]
+        while idle and len(self._workspaces) > self._max_open:
+            self._close(idle.pop(0), "count")
+        if not self._memory_budget or not idle:
+            return
+
+        # Closing a workspace frees exactly its workers' memory; the default
+        # (None) workspace keeps no project workers of its own
+        usage = {key: worker_memory(key) for key in self._workspaces if key}
+        total = sum(usage.values())
+        while idle and total > self._memory_budget:
+            key = idle.pop(0)
+            if key is not None:
+                total -= usage.get(key, 0)
+            self._close(key, "memory")
+
+    def _close(self, key: Optional[Path], reason: str) -> None:
+        mcpydoc = self._workspaces.pop(key)
+        self._warmed.discard(key)
+        mcpydoc.shutdown()
+        if key is not None:
+            shutdown_workers(key)
+        increment("workspace.evictions", reason=reason)
+        logger.info(f"Closed workspace {key or Path.cwd()} ({reason} limit)")
+
+    def shutdown(self) -> None:
+        """Release the analyzer threads of every workspace."""
+        for mcpydoc in self._workspaces.values():
+            mcpydoc.shutdown()
+        self._workspaces.clear()
+        self._pins.clear()
+        self._warmed.clear()
@@ -0,0 +1,9 @@
+"""Shared pytest fixtures for MCPyDoc tests."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep the persistent symbol index out of the user's real cache directory."""
+    monkeypatch.setenv("MCPYDOC_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
@@ -0,0 +1,49 @@
+"""Smoke test of the benchmark suite."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_benchmark_reports_all_tools(tmp_path):
+    """A tiny benchmark run produces error-free results for every tool."""
+    output = tmp_path / "result.json"
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.run",
+            "--modules=2",
+            "--classes=2",
+            "--methods=2",
+            "--iterations=1",
+            "--warm-iterations=1",
+            "--startup-iterations=1",
+            "--modes",
+            "subprocess",
+            "direct",
+            f"--output={output}",
+        ],
+        cwd=REPO_ROOT,
+        check=True,
+        timeout=120,
+    )
+    report = json.loads(output.read_text())
+
+    assert report["startup"]["spawn_to_initialize"]["n"] == 1
+    assert set(report["modes"]) == {"subprocess", "direct"}
+    for mode in report["modes"].values():
+        assert set(mode["tools"]) == {
+            "get_package_docs",
+            "search_symbols",
+            "get_source_code",
+            "analyze_structure",
+        }
+        for tool in mode["tools"].values():
+            assert tool["errors"] == 0
+            assert tool["cold"]["p50_ms"] > 0
+    assert report["modes"]["subprocess"]["subprocess_spawns"]["cold"] >= 1
+    assert report["modes"]["direct"]["subprocess_spawns"]["cold"] == 0
@@ -0,0 +1,128 @@
+"""Tests for the per-directory distribution index."""
+
+import os
+import sys
+
+import pytest
+
+from mcpydoc.analyzer import PackageAnalyzer
+from mcpydoc.dist_index import (
+    clear_indexes,
+    find_distribution,
+    find_distribution_by_import_name,
+    get_index,
+    normalize_name,
+    resolve_import_name,
+)
+
+
+def _install(site_packages, dir_name, name, version, top_level=None):
+    dist_info = site_packages / dir_name
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+        f"Summary: The {name} package\n"
+    )
+    if top_level:
+        (dist_info / "top_level.txt").write_text(top_level)
+    return dist_info
+
+
+@pytest.fixture
+def site_packages(tmp_path):
+    clear_indexes()
+    site_packages = tmp_path / "venv" / "lib" / "python3.11" / "site-packages"
+    _install(site_packages, "Foo_Bar-1.2.dist-info", "Foo-Bar", "1.2", "foobar\n")
+    _install(site_packages, "legacy-0.1-py3.11.egg-info", "legacy", "0.1")
+    yield site_packages
+    clear_indexes()
+
+
+def test_normalize_name():
+    assert normalize_name("Foo.Bar_baz") == "foo-bar-baz"
+    assert normalize_name("typing-extensions") == "typing-extensions"
+
+
+def test_find_distribution(site_packages):
+    dist = find_distribution("foo.bar", [site_packages])
+    assert (dist.name, dist.version) == ("Foo_Bar", "1.2")
+    assert dist.metadata()["Summary"] == "The Foo-Bar package"
+    assert find_distribution("LEGACY", [site_packages]).version == "0.1"
+    assert find_distribution("missing", [site_packages / "nope", site_packages]) is None
+
+    assert find_distribution_by_import_name("foobar", [site_packages]) is dist
+    assert find_distribution_by_import_name("legacy", [site_packages]).version == "0.1"
+
+
+def test_index_rebuilt_only_when_directory_changes(site_packages):
+    index = get_index(site_packages)
+    assert get_index(site_packages) is index
+
+    _install(site_packages, "newpkg-2.0.dist-info", "newpkg", "2.0")
+    stat = os.stat(site_packages)
+    os.utime(site_packages, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    rebuilt = get_index(site_packages)
+    assert rebuilt is not index
+    assert rebuilt.get("newpkg").version == "2.0"
+
+
+def test_analyzer_lookup_leaves_sys_path_alone(site_packages, monkeypatch):
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    _install(site_packages, "demo_pkg-1.0.dist-info", "demo-pkg", "1.0", "demo_pkg\n")
+    (site_packages / "demo_pkg").mkdir()
+    (site_packages / "demo_pkg" / "__init__.py").write_text("VALUE = 1\n")
+    analyzer = PackageAnalyzer(
+        python_paths=[str(site_packages.parents[2])], enable_subprocess=False
+    )
+
+    before = list(sys.path)
+    info = analyzer.get_package_info("demo_pkg")
+    assert (info.name, info.version) == ("demo-pkg", "1.0")
+    assert info.location == site_packages
+    assert sys.path == before
+
+    try:
+        # Importing the package makes its environment importable
+        assert analyzer._import_module("demo_pkg").VALUE == 1
+        assert sys.path[0] == str(site_packages)
+    finally:
+        sys.modules.pop("demo_pkg", None)
+
+
+def test_import_names_from_record(site_packages, monkeypatch):
+    """Distributions without top_level.txt are mapped through RECORD."""
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    dist_info = _install(site_packages, "PyDemo-1.0.dist-info", "PyDemo", "1.0")
+    (dist_info / "RECORD").write_text(
+        "demoyaml/__init__.py,sha256=abc,30\n"
+        "demoyaml/__pycache__/__init__.cpython-311.pyc,,\n"
+        "_demoyaml_ext.cpython-311-x86_64-linux-gnu.so,sha256=def,10\n"
+        "PyDemo-1.0.dist-info/METADATA,,\n"
+        "../../../bin/demoyaml,,\n"
+    )
+    (site_packages / "demoyaml").mkdir()
+    (site_packages / "demoyaml" / "__init__.py").write_text(
+        'def load(stream):\n    """Load a document."""\n'
+    )
+
+    dist = find_distribution("pydemo", [site_packages])
+    assert dist.top_level == ["demoyaml", "_demoyaml_ext"]
+    assert dist.import_name == "demoyaml"
+    assert resolve_import_name("PyDemo", [site_packages]) == "demoyaml"
+    assert resolve_import_name("demoyaml", [site_packages]) == "demoyaml"
+    assert resolve_import_name("Foo_Bar", [site_packages]) == "foobar"
+    assert resolve_import_name("json", [site_packages]) == "json"
+
+    analyzer = PackageAnalyzer(
+        python_paths=[str(site_packages.parents[2])], enable_subprocess=False
+    )
+    try:
+        # Either name finds the distribution and the module
+        assert analyzer.get_package_info("demoyaml").name == "PyDemo"
+        symbol = analyzer.get_symbol_info("PyDemo", "load")
+        assert (symbol.kind, symbol.module) == ("function", "demoyaml")
+        assert [s.qualname for s in analyzer.search_symbols("PyDemo", "load")] == [
+            "load"
+        ]
+    finally:
+        sys.modules.pop("demoyaml", None)
@@ -0,0 +1,178 @@
+"""Tests for the streamable HTTP transport."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import aiohttp
+import pytest
+
+from mcpydoc.http_transport import SESSION_HEADER, HTTPTransport, http_port
+
+
+@pytest.fixture(autouse=True)
+def no_environment_detection(monkeypatch):
+    monkeypatch.setenv("MCPYDOC_PREWARM", "0")
+    monkeypatch.setattr(
+        "mcpydoc.env_detection.get_active_python_environments",
+        lambda use_cache=True: [],
+    )
+
+
+@asynccontextmanager
+async def _serve(transport):
+    """Run a transport, yielding the URL of its MCP endpoint."""
+    runner = await transport.start(0)
+    host, port = runner.addresses[0][:2]
+    try:
+        yield f"http://{host}:{port}/mcp"
+    finally:
+        transport.close()
+        await runner.cleanup()
+        transport.shutdown()
+
+
+@pytest.fixture
+async def endpoint():
+    """A running transport and the URL of its MCP endpoint."""
+    transport = HTTPTransport()
+    async with _serve(transport) as url:
+        yield transport, url
+
+
+async def _initialize(client, url, roots=False):
+    capabilities = {"roots": {"listChanged": True}} if roots else {}
+    message = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {"capabilities": capabilities},
+    }
+    async with client.post(url, json=message) as response:
+        assert response.status == 200
+        assert "result" in await response.json()
+        return response.headers[SESSION_HEADER]
+
+
+async def _next_event(stream):
+    """Read the data of the next server-sent event."""
+    while True:
+        line = (await stream.content.readline()).decode()
+        if line.startswith("data: "):
+            return json.loads(line[len("data: ") :])
+
+
+def test_http_port_is_opt_in(monkeypatch):
+    monkeypatch.delenv("MCPYDOC_HTTP_PORT", raising=False)
+    assert http_port() is None
+
+    monkeypatch.setenv("MCPYDOC_HTTP_PORT", "8765")
+    assert http_port() == 8765
+
+
+async def test_session_lifecycle(endpoint):
+    """initialize opens a session that later requests must name."""
+    transport, url = endpoint
+    async with aiohttp.ClientSession() as client:
+        session_id = await _initialize(client, url)
+        headers = {SESSION_HEADER: session_id}
+
+        tools_list = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
+        async with client.post(url, json=tools_list, headers=headers) as response:
+            assert response.status == 200
+            tools = (await response.json())["result"]["tools"]
+            assert any(tool["name"] == "search_symbols" for tool in tools)
+
+        initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+        async with client.post(url, json=initialized, headers=headers) as response:
+            assert response.status == 202
+
+        async with client.post(url, json=tools_list) as response:
+            assert response.status == 400
+        async with client.post(
+            url, json=tools_list, headers={SESSION_HEADER: "unknown"}
+        ) as response:
+            assert response.status == 404
+        async with client.post(
+            url, json=tools_list, headers={**headers, "Origin": "https://evil.example"}
+        ) as response:
+            assert response.status == 403
+
+        async with client.delete(url, headers=headers) as response:
+            assert response.status == 204
+        async with client.post(url, json=tools_list, headers=headers) as response:
+            assert response.status == 404
+    assert transport.sessions == {}
+
+
+async def test_sessions_keep_own_roots_and_share_workspaces(endpoint, tmp_path):
+    """Each session gets its roots over its event stream; sessions in the same
+    workspace share a documentation server."""
+    transport, url = endpoint
+    roots = [tmp_path / "a", tmp_path / "b", tmp_path / "a"]
+    for root in roots:
+        root.mkdir(exist_ok=True)
+
+    async with aiohttp.ClientSession() as client:
+        session_ids = []
+        for root in roots:
+            session_id = await _initialize(client, url, roots=True)
+            headers = {SESSION_HEADER: session_id}
+            async with client.get(url, headers=headers) as stream:
+                initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+                async with client.post(
+                    url, json=initialized, headers=headers
+                ) as response:
+                    assert response.status == 202
+                request = await asyncio.wait_for(_next_event(stream), 5)
+            assert request["method"] == "roots/list"
+
+            reply = {
+                "jsonrpc": "2.0",
+                "id": request["id"],
+                "result": {"roots": [{"uri": f"file://{root}"}]},
+            }
+            async with client.post(url, json=reply, headers=headers) as response:
+                assert response.status == 202
+            session_ids.append(session_id)
+
+    first, second, third = (transport.sessions[s] for s in session_ids)
+    assert first._client_roots == [str(roots[0])]
+    assert second._client_roots == [str(roots[1])]
+    assert first.mcpydoc is third.mcpydoc
+    assert first.mcpydoc is not second.mcpydoc
+    assert first.mcpydoc.analyzer._working_directory == roots[0].resolve()
+    assert second.mcpydoc.analyzer._working_directory == roots[1].resolve()
+
+
+async def test_abandoned_sessions_are_closed(monkeypatch):
+    """Sessions without DELETE expire when idle and are capped in number."""
+    # Disconnected event streams are noticed on their next keepalive
+    monkeypatch.setattr("mcpydoc.http_transport.KEEPALIVE_INTERVAL", 0.05)
+    transport = HTTPTransport(max_open_sessions=2, idle_timeout=60)
+    async with _serve(transport) as url, aiohttp.ClientSession() as client:
+        first = await _initialize(client, url)
+        second = await _initialize(client, url)
+        third = await _initialize(client, url)
+        assert set(transport.sessions) == {second, third}
+
+        # Sessions with an event stream are kept, even when idle for long
+        async with client.get(url, headers={SESSION_HEADER: second}):
+            async with client.get(url, headers={SESSION_HEADER: third}):
+                message = {"jsonrpc": "2.0", "id": 1, "method": "initialize"}
+                async with client.post(url, json=message) as response:
+                    assert response.status == 503
+
+                for session in transport.sessions.values():
+                    session.last_active -= 120
+                transport.expire_sessions()
+                assert set(transport.sessions) == {second, third}
+
+        await asyncio.sleep(0.3)
+        transport.sessions[second].last_active -= 120
+        transport.expire_sessions()
+        assert set(transport.sessions) == {third}
+        async with client.post(
+            url, json=message, headers={SESSION_HEADER: first}
+        ) as response:
+            assert response.status == 200
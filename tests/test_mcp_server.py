@@ -1,9 +1,14 @@
+import asyncio
 import json
+import threading
+import time
 
 import pytest
 
 import mcpydoc
 from mcpydoc.mcp_server import MCPServer
+from mcpydoc.models import SymbolSearchPage
+from mcpydoc.security import MAX_CONCURRENT_REQUESTS, MAX_REQUEST_TIME_SECONDS
 
 
 @pytest.mark.asyncio
@@ -14,3 +19,334 @@ async def test_initialize_reports_correct_version():
     )
     response = json.loads(response_json)
     assert response["result"]["serverInfo"]["version"] == mcpydoc.__version__
+
+
+@pytest.mark.asyncio
+async def test_handshake_does_not_wait_for_environment_detection(monkeypatch):
+    detected = threading.Event()
+
+    def slow_detection(use_cache=True):
+        detected.wait(10)
+        return []
+
+    monkeypatch.setattr(
+        "mcpydoc.env_detection.get_active_python_environments", slow_detection
+    )
+    start = time.monotonic()
+    server = MCPServer()
+    for request_id, method in enumerate(("initialize", "tools/list"), 1):
+        response = json.loads(
+            await server.handle_request(
+                json.dumps(
+                    {"jsonrpc": "2.0", "id": request_id, "method": method, "params": {}}
+                )
+            )
+        )
+        assert "result" in response
+    assert time.monotonic() - start < 0.5
+    assert not server.mcpydoc.analyzer.environments_ready.done()
+
+    # Tool calls wait for detection to finish
+    call = asyncio.ensure_future(
+        server.handle_request(
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": 3,
+                    "method": "tools/call",
+                    "params": {
+                        "name": "get_package_docs",
+                        "arguments": {"package_name": "json"},
+                    },
+                }
+            )
+        )
+    )
+    await asyncio.sleep(0.1)
+    assert not call.done()
+    detected.set()
+    response = json.loads(await asyncio.wait_for(call, 30))
+    assert "error" not in json.loads(response["result"]["content"][0]["text"])
+
+
+@pytest.mark.asyncio
+async def test_response_timings_and_server_stats(monkeypatch):
+    monkeypatch.setenv("MCPYDOC_RESPONSE_TIMINGS", "1")
+    server = MCPServer()
+
+    async def call(request_id, name, arguments):
+        request = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": {"name": name, "arguments": arguments},
+        }
+        return json.loads(await server.handle_request(json.dumps(request)))
+
+    response = await call(1, "get_package_docs", {"package_name": "json"})
+    timings = response["result"]["_meta"]["timings"]
+    assert timings["tool.get_package_docs"]["count"] == 1
+    assert "validate" in timings
+    assert "analyzer.get_package_info" in timings
+
+    response = await call(2, "server_stats", {})
+    stats = json.loads(response["result"]["content"][0]["text"])
+    assert stats["spans"]["tool.get_package_docs"]["count"] >= 1
+    assert "counters" in stats
+    assert stats["active_tool_calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_symbols_docs_tool():
+    server = MCPServer()
+    response_json = await server.handle_request(
+        json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "id": 2,
+                "method": "tools/call",
+                "params": {
+                    "name": "get_symbols_docs",
+                    "arguments": {
+                        "package_name": "pytest",
+                        "symbol_paths": ["main", "not_a_symbol_12345"],
+                    },
+                },
+            }
+        )
+    )
+    response = json.loads(response_json)
+    payload = json.loads(response["result"]["content"][0]["text"])
+    assert [s["name"] for s in payload["symbols"]] == ["main"]
+    assert payload["not_found"] == ["not_a_symbol_12345"]
+
+
+@pytest.mark.asyncio
+async def test_requests_are_handled_concurrently(monkeypatch):
+    server = MCPServer(max_concurrency=2)
+    written = []
+    monkeypatch.setattr(server, "_write_message", written.append)
+    release = asyncio.Event()
+
+    async def slow_search(
+        package_name, pattern=None, version=None, offset=0, limit=50, detail="full"
+    ):
+        await release.wait()
+        return SymbolSearchPage(total=0)
+
+    monkeypatch.setattr(server.mcpydoc, "search_package_symbols_page", slow_search)
+
+    slow = server._dispatch(
+        json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "tools/call",
+                "params": {
+                    "name": "search_symbols",
+                    "arguments": {"package_name": "pytest"},
+                },
+            }
+        )
+    )
+    fast = server._dispatch(
+        json.dumps({"jsonrpc": "2.0", "id": 2, "method": "tools/list", "params": {}})
+    )
+
+    await fast
+    assert [json.loads(message)["id"] for message in written] == [2]
+
+    release.set()
+    await slow
+    assert [json.loads(message)["id"] for message in written] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_respect_concurrency_limit(monkeypatch):
+    server = MCPServer(max_concurrency=2)
+    monkeypatch.setattr(server, "_write_message", lambda message: None)
+    running = 0
+    peak = 0
+
+    async def tracked_search(
+        package_name, pattern=None, version=None, offset=0, limit=50, detail="full"
+    ):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return SymbolSearchPage(total=0)
+
+    monkeypatch.setattr(server.mcpydoc, "search_package_symbols_page", tracked_search)
+
+    tasks = [
+        server._dispatch(
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": "tools/call",
+                    "params": {
+                        "name": "search_symbols",
+                        "arguments": {"package_name": "pytest"},
+                    },
+                }
+            )
+        )
+        for request_id in range(6)
+    ]
+    await asyncio.gather(*tasks)
+    assert peak == 2
+
+
+async def _search(server, request_id, **arguments):
+    response_json = await server.handle_request(
+        json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "tools/call",
+                "params": {"name": "search_symbols", "arguments": arguments},
+            }
+        )
+    )
+    response = json.loads(response_json)
+    return json.loads(response["result"]["content"][0]["text"])
+
+
+@pytest.mark.asyncio
+async def test_search_symbols_pagination(monkeypatch):
+    server = MCPServer()
+    parsed = []
+    parse_docstring = server.mcpydoc.doc_parser.parse_docstring
+
+    def tracked_parse(docstring):
+        parsed.append(docstring)
+        return parse_docstring(docstring)
+
+    monkeypatch.setattr(server.mcpydoc.doc_parser, "parse_docstring", tracked_parse)
+
+    first = await _search(server, 1, package_name="json", limit=2)
+    assert len(first["symbols"]) == 2
+    assert len(parsed) == 2
+    assert first["query"]["total_results"] > 2
+    assert first["next_cursor"]
+
+    second = await _search(
+        server, 2, package_name="json", limit=2, cursor=first["next_cursor"]
+    )
+    assert second["query"]["offset"] == 2
+    first_names = [s["qualified_name"] for s in first["symbols"]]
+    second_names = [s["qualified_name"] for s in second["symbols"]]
+    assert not set(first_names) & set(second_names)
+
+    everything = await _search(server, 3, package_name="json", limit=200)
+    all_names = [s["qualified_name"] for s in everything["symbols"]]
+    assert all_names[:4] == first_names + second_names
+    assert everything["next_cursor"] is None
+
+    mismatched = await _search(
+        server, 4, package_name="json", pattern="load", cursor=first["next_cursor"]
+    )
+    assert "cursor" in mismatched["error"]
+
+
+@pytest.mark.asyncio
+async def test_search_symbols_detail_levels(monkeypatch):
+    server = MCPServer()
+    parse_docstring = server.mcpydoc.doc_parser.parse_docstring
+    parsed = []
+    monkeypatch.setattr(
+        server.mcpydoc.doc_parser,
+        "parse_docstring",
+        lambda docstring: parsed.append(docstring) or parse_docstring(docstring),
+    )
+
+    signature = await _search(
+        server, 1, package_name="json", pattern="loads", detail="signature"
+    )
+    symbol = signature["symbols"][0]
+    assert symbol["qualified_name"] == "loads"
+    assert "signature" in symbol
+    assert not {"documentation", "type_hints"} & set(symbol)
+
+    summary = await _search(
+        server, 2, package_name="json", pattern="loads", detail="summary"
+    )
+    assert set(summary["symbols"][0]["documentation"]) == {"description"}
+    assert parsed == []
+
+    full = await _search(server, 3, package_name="json", pattern="loads")
+    assert "long_description" in full["symbols"][0]["documentation"]
+    assert parsed
+
+    invalid = await _search(server, 4, package_name="json", detail="everything")
+    assert "detail must be one of" in invalid["error"]
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_stop_at_request_deadline(monkeypatch):
+    server = MCPServer(request_timeout=0.2)
+
+    def stuck_search(*args):
+        time.sleep(1)
+
+    monkeypatch.setattr(server.mcpydoc.analyzer, "search_symbols_page", stuck_search)
+
+    started = time.monotonic()
+    payload = await _search(server, 1, package_name="json")
+    assert time.monotonic() - started < 1
+    assert "time budget" in payload["error"]
+
+
+@pytest.mark.asyncio
+async def test_prewarm_starts_on_initialized_and_yields_to_tool_calls(
+    monkeypatch, tmp_path
+):
+    (tmp_path / "pyproject.toml").write_text('[project]\ndependencies = ["demo"]\n')
+    monkeypatch.setattr(
+        "mcpydoc.subprocess_introspection.get_working_directory", lambda: tmp_path
+    )
+    server = MCPServer()
+    started = []
+    monkeypatch.setattr(server._prewarmer, "start", started.append)
+
+    await server.handle_request(
+        json.dumps({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+    )
+    await server.handle_request(
+        json.dumps({"jsonrpc": "2.0", "method": "notifications/initialized"})
+    )
+    assert started == [tmp_path]
+
+    release = asyncio.Event()
+
+    async def slow_search(
+        package_name, pattern=None, version=None, offset=0, limit=50, detail="full"
+    ):
+        await release.wait()
+        return SymbolSearchPage(total=0)
+
+    monkeypatch.setattr(server.mcpydoc, "search_package_symbols_page", slow_search)
+
+    call = asyncio.ensure_future(_search(server, 2, package_name="pytest"))
+    idle = asyncio.ensure_future(server._wait_until_idle())
+    await asyncio.sleep(0.05)
+    assert not idle.done()
+
+    release.set()
+    await call
+    await asyncio.wait_for(idle, 1)
+
+
+def test_invalid_limits_fall_back_to_defaults(monkeypatch, caplog):
+    """A typo in a limit's environment variable does not stop the server."""
+    monkeypatch.setenv("MCPYDOC_MAX_CONCURRENCY", "eight")
+    monkeypatch.setenv("MCPYDOC_REQUEST_TIMEOUT", "60s")
+    server = MCPServer()
+
+    assert server._max_concurrency == MAX_CONCURRENT_REQUESTS
+    assert server._request_timeout == MAX_REQUEST_TIME_SECONDS
+    assert "Ignoring invalid MCPYDOC_MAX_CONCURRENCY: 'eight'" in caplog.text
+    assert "Ignoring invalid MCPYDOC_REQUEST_TIMEOUT: '60s'" in caplog.text
@@ -1,11 +1,22 @@
 """Tests for the MCPyDoc MCP server."""
 
+import threading
 from importlib import metadata
+from unittest.mock import patch
 
 import pytest
 
-from mcpydoc import MCPyDoc, PackageInfo, SymbolInfo
-from mcpydoc.exceptions import PackageNotFoundError, SymbolNotFoundError
+from mcpydoc import DocumentationParser, MCPyDoc, PackageInfo, SymbolInfo
+from mcpydoc.analyzer import PackageAnalyzer
+from mcpydoc.deadline import deadline_scope
+from mcpydoc.documentation import DEFAULT_DOCSTRING_CACHE_SIZE
+from mcpydoc.exceptions import (
+    PackageNotFoundError,
+    ResourceLimitError,
+    SymbolNotFoundError,
+    ValidationError,
+)
+from mcpydoc.subprocess_introspection import clear_cache
 
 
 @pytest.fixture
@@ -99,6 +110,62 @@ async def test_documentation_parsing(server):
         assert hasattr(result.documentation, "params")
 
 
+def test_docstring_parse_cache():
+    """Test parsed docstrings are cached by content with LRU eviction."""
+    parser = DocumentationParser(cache_size=2)
+    first = parser.parse_docstring("Do things.\n\nArgs:\n    x: The x value\n")
+    again = parser.parse_docstring("Do things.\n\nArgs:\n    x: The x value\n")
+    assert again is first
+    assert first.params[0]["name"] == "x"
+
+    parser.parse_docstring("Second.")
+    parser.parse_docstring("Third.")
+    assert parser.cache_info() == {"hits": 1, "misses": 3, "size": 2, "max_size": 2}
+    assert parser.parse_docstring("Do things.\n\nArgs:\n    x: The x value\n") == (
+        first
+    )
+    assert parser.cache_info()["misses"] == 4
+
+    uncached = DocumentationParser(cache_size=0)
+    assert uncached.parse_docstring("Same.") is not uncached.parse_docstring("Same.")
+    assert uncached.cache_info()["size"] == 0
+
+
+def test_docstring_cache_size_from_environment(monkeypatch):
+    """Test an invalid cache size setting falls back to the default."""
+    monkeypatch.setenv("MCPYDOC_DOCSTRING_CACHE_SIZE", "16")
+    assert DocumentationParser().cache_size == 16
+
+    monkeypatch.setenv("MCPYDOC_DOCSTRING_CACHE_SIZE", "4k")
+    assert DocumentationParser().cache_size == DEFAULT_DOCSTRING_CACHE_SIZE
+
+
+def test_direct_lookup_failures_cached():
+    """Test failed direct-import lookups are not repeated."""
+    clear_cache()
+    analyzer = PackageAnalyzer(python_paths=[], enable_subprocess=False)
+
+    with patch(
+        "mcpydoc.analyzer.import_module", side_effect=ModuleNotFoundError
+    ) as mock:
+        for _ in range(2):
+            with pytest.raises(PackageNotFoundError):
+                analyzer.get_package_info("nonexistent_package_12345")
+    mock.assert_called_once()
+
+    with patch.object(
+        analyzer,
+        "_resolve_symbol_directly",
+        side_effect=SymbolNotFoundError("missing", "json"),
+    ) as mock:
+        for _ in range(2):
+            with pytest.raises(SymbolNotFoundError, match="json"):
+                analyzer.get_symbol_info("json", "missing")
+        assert analyzer.get_symbols_info("json", ["missing"]) == {}
+    mock.assert_called_once()
+    clear_cache()
+
+
 @pytest.mark.asyncio
 async def test_type_hints_extraction(server):
     """Test type hints extraction."""
@@ -186,3 +253,77 @@ async def test_server_get_package_docs():
         first_param = result["documentation"]["parameters"][0]
         assert isinstance(first_param, dict)
         assert "name" in first_param
+
+
+@pytest.mark.asyncio
+async def test_get_symbols_documentation(server):
+    """Test resolving several symbols in one call."""
+    result = await server.get_symbols_documentation(
+        "pytest", ["main", "fixture", "non_existent_symbol_12345"]
+    )
+    assert [r.symbol.name for r in result.symbols] == ["main", "fixture"]
+    assert result.not_found == ["non_existent_symbol_12345"]
+
+
+def test_get_symbols_info_rejects_oversized_batch(server):
+    """Test that batch size is bounded."""
+    with pytest.raises(ValidationError):
+        server.analyzer.get_symbols_info("pytest", ["main"] * 51)
+
+
+def test_direct_scan_builds_symbols_in_one_pass(tmp_path, monkeypatch):
+    """Test the import-based scan never re-resolves symbols it already holds."""
+    package_dir = tmp_path / "mcpydoc_scan_demo"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text(
+        "from .models import *\n\ndef helper(x: int) -> int:\n    return x\n"
+    )
+    (package_dir / "models.py").write_text(
+        "".join(
+            f"class Model{i}:\n    '''Model {i}.'''\n\n"
+            f"    def save(self, force=False):\n        pass\n\n"
+            for i in range(300)
+        )
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    analyzer = MCPyDoc().analyzer
+    package_info = PackageInfo(name="mcpydoc_scan_demo", version="1.0")
+    monkeypatch.setattr(analyzer, "get_package_info", lambda *args: package_info)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("get_symbol_info must not be called during a scan")
+
+    monkeypatch.setattr(analyzer, "get_symbol_info", fail)
+
+    symbols = analyzer._scan_symbols_directly("mcpydoc_scan_demo")
+    by_qualname = {symbol.qualname: symbol for symbol in symbols}
+
+    assert by_qualname["Model7"].kind == "class"
+    assert by_qualname["Model7"].docstring == "Model 7."
+    assert by_qualname["Model7"].module == "mcpydoc_scan_demo.models"
+    assert by_qualname["Model7.save"].signature == "(self, force=False)"
+    assert by_qualname["helper"].signature == "(x: int) -> int"
+    assert all(symbol.source is None for symbol in symbols)
+
+    with_source = analyzer._scan_symbols_directly(
+        "mcpydoc_scan_demo", include_source=True
+    )
+    assert "def helper" in next(s for s in with_source if s.name == "helper").source
+
+
+async def test_timed_out_calls_counted_until_their_thread_returns():
+    """Analyzer threads outliving their request are accounted for."""
+    server = MCPyDoc(python_paths=[], max_workers=1)
+    release = threading.Event()
+    try:
+        with deadline_scope(0.1):
+            with pytest.raises(ResourceLimitError):
+                await server._run_blocking(release.wait, 5)
+        assert server.abandoned_calls == 1
+
+        release.set()
+        assert await server._run_blocking(sum, [1, 2]) == 3
+        assert server.abandoned_calls == 0
+    finally:
+        server.shutdown()
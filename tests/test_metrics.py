@@ -0,0 +1,63 @@
+"""Tests for timing spans and counters."""
+
+import contextvars
+import threading
+
+from mcpydoc.metrics import (
+    Histogram,
+    MetricsRegistry,
+    registry,
+    request_timings,
+    span,
+)
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    """Quantiles are estimated as bucket upper bounds, capped at the maximum."""
+    histogram = Histogram()
+    for seconds in (0.002, 0.003, 0.004, 0.2):
+        histogram.observe(seconds)
+
+    summary = histogram.to_dict()
+    assert summary["count"] == 4
+    assert summary["p50_ms"] == 5.0
+    assert summary["p95_ms"] == 200.0
+    assert summary["max_ms"] == 200.0
+
+
+def test_registry_snapshot_and_reset():
+    """Spans and counters show up in the snapshot until reset."""
+    metrics = MetricsRegistry()
+    metrics.observe("step", 0.01)
+    metrics.increment("cache.hit")
+    metrics.increment("cache.hit", 2)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["spans"]["step"]["count"] == 1
+    assert snapshot["counters"] == {"cache.hit": 3}
+
+    metrics.reset()
+    assert metrics.snapshot()["spans"] == {}
+
+
+def test_request_timings_include_spans_from_threads():
+    """Spans on threads running a copy of the request context are attributed."""
+
+    def analyzer_call():
+        with span("threaded"):
+            pass
+
+    with request_timings() as timings:
+        with span("outer"):
+            thread = threading.Thread(
+                target=contextvars.copy_context().run, args=(analyzer_call,)
+            )
+            thread.start()
+            thread.join()
+    with span("outside"):
+        pass
+
+    assert timings["outer"]["count"] == 1
+    assert timings["threaded"]["count"] == 1
+    assert "outside" not in timings
+    assert registry.snapshot()["spans"]["outside"]["count"] >= 1
@@ -0,0 +1,78 @@
+"""Tests for the Prometheus metrics endpoint."""
+
+import aiohttp
+
+from mcpydoc.metrics import MetricsRegistry
+from mcpydoc.metrics_exporter import (
+    CONTENT_TYPE,
+    metrics_port,
+    render_metrics,
+    start_metrics_server,
+)
+
+
+def test_render_metrics_families():
+    """Tool spans, cache counters, labeled counters and gauges are exported."""
+    metrics = MetricsRegistry()
+    metrics.observe("tool.search_symbols", 0.02)
+    metrics.observe("tool.search_symbols", 3.0)
+    metrics.observe("subprocess.run_script", 0.5)
+    metrics.increment("cache.introspection.hit", 3)
+    metrics.increment("cache.introspection.miss")
+    metrics.increment("subprocess.timeouts", package="numpy")
+
+    text = render_metrics(metrics, {"mcpydoc_active_workers": ("Running workers.", 2)})
+    lines = text.splitlines()
+
+    assert "# TYPE mcpydoc_tool_duration_seconds histogram" in lines
+    assert (
+        'mcpydoc_tool_duration_seconds_bucket{tool="search_symbols",le="0.025"} 1'
+        in lines
+    )
+    assert (
+        'mcpydoc_tool_duration_seconds_bucket{tool="search_symbols",le="+Inf"} 2'
+        in lines
+    )
+    assert 'mcpydoc_tool_duration_seconds_count{tool="search_symbols"} 2' in lines
+    assert (
+        'mcpydoc_span_duration_seconds_count{span="subprocess.run_script"} 1' in lines
+    )
+    assert 'mcpydoc_cache_lookups_total{cache="introspection",result="hit"} 3' in lines
+    assert 'mcpydoc_cache_hit_ratio{cache="introspection"} 0.75' in lines
+    assert 'mcpydoc_subprocess_timeouts_total{package="numpy"} 1' in lines
+    assert "mcpydoc_active_workers 2" in lines
+    assert text.endswith("\n")
+
+
+def test_metrics_port_is_opt_in(monkeypatch):
+    monkeypatch.delenv("MCPYDOC_METRICS_PORT", raising=False)
+    assert metrics_port() is None
+
+    monkeypatch.setenv("MCPYDOC_METRICS_PORT", "not-a-port")
+    assert metrics_port() is None
+
+    monkeypatch.setenv("MCPYDOC_METRICS_PORT", "9464")
+    assert metrics_port() == 9464
+
+
+async def test_metrics_endpoint_serves_exposition_text():
+    """The endpoint answers scrapes on localhost with the current gauges."""
+    scrapes = []
+
+    def gauges():
+        scrapes.append(1)
+        return {"mcpydoc_tool_calls_in_flight": ("Calls.", len(scrapes))}
+
+    runner = await start_metrics_server(gauges, 0)
+    try:
+        host, port = runner.addresses[0][:2]
+        assert host == "127.0.0.1"
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://{host}:{port}/metrics") as response:
+                assert response.status == 200
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                text = await response.text()
+    finally:
+        await runner.cleanup()
+
+    assert "mcpydoc_tool_calls_in_flight 1" in text.splitlines()
@@ -0,0 +1,78 @@
+"""Tests for background pre-indexing of project dependencies."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from mcpydoc.exceptions import PackageNotFoundError
+from mcpydoc.models import SymbolInfo
+from mcpydoc.prewarm import DependencyPrewarmer, direct_dependencies
+from mcpydoc.worker_pool import _background
+
+PYPROJECT = """
+[project]
+name = "demo-app"
+dependencies = [
+    "requests>=2.0",
+    "typing-extensions; python_version < '3.10'",
+    "Demo-App[extra]",
+]
+
+[tool.poetry]
+name = "demo-app"
+
+[tool.poetry.dependencies]
+python = "^3.9"
+Django = "^4.2"
+requests = "*"
+"""
+
+
+def test_direct_dependencies(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(PYPROJECT)
+    (tmp_path / "Pipfile").write_text('[packages]\ncharset-normalizer = "*"\n')
+
+    assert direct_dependencies(tmp_path) == [
+        "requests",
+        "typing_extensions",
+        "django",
+        "charset_normalizer",
+    ]
+    assert direct_dependencies(tmp_path / "missing") == []
+
+
+async def test_prewarm_waits_for_idle_server(tmp_path):
+    """Dependencies are warmed one step at a time, only while idle."""
+    (tmp_path / "pyproject.toml").write_text(
+        '[project]\ndependencies = ["missing", "Demo-Lib"]\n'
+    )
+
+    def get_package_info(name):
+        assert _background.get(), "warming must run at background priority"
+        if name == "missing":
+            raise PackageNotFoundError(name)
+
+    mcpydoc = MagicMock()
+    mcpydoc.analyzer.resolve_import_name.side_effect = lambda name: {
+        "demo_lib": "demo"
+    }.get(name, name)
+    mcpydoc.analyzer.get_package_info.side_effect = get_package_info
+    mcpydoc.analyzer.search_symbols.return_value = [
+        SymbolInfo(name="run", qualname="run", kind="function", module="demo")
+    ]
+    idle = asyncio.Event()
+    prewarmer = DependencyPrewarmer(mcpydoc, idle.wait)
+
+    try:
+        task = prewarmer.start(tmp_path)
+        await asyncio.sleep(0.05)
+        mcpydoc.analyzer.get_package_info.assert_not_called()
+
+        idle.set()
+        await asyncio.wait_for(task, 5)
+    finally:
+        prewarmer.shutdown()
+
+    assert prewarmer.warmed == ["demo"]
+    assert mcpydoc.analyzer.search_symbols.call_count == 1
+    mcpydoc.analyzer.get_package_docstring.assert_called_once_with("demo")
+    mcpydoc.doc_parser.parse_docstring.assert_called()
@@ -0,0 +1,172 @@
+"""Tests for the in-memory symbol search index."""
+
+from unittest.mock import patch
+
+import pytest
+
+from mcpydoc.analyzer import PackageAnalyzer
+from mcpydoc.models import PackageInfo, SymbolInfo
+from mcpydoc.search_index import index_symbols, split_identifier, symbol_path
+
+
+def _symbol(qualname, kind="function", module="demo"):
+    return SymbolInfo(
+        name=qualname.split(".")[-1], qualname=qualname, kind=kind, module=module
+    )
+
+
+SYMBOLS = [
+    _symbol("client", kind="module", module="demo.client"),
+    _symbol("HTTPClientError", kind="class", module="demo.errors"),
+    _symbol("get_symbols_docs", module="demo.tools"),
+    _symbol("Client", kind="class", module="demo.client"),
+    _symbol("Client.connect", kind="method", module="demo.client"),
+    _symbol("create_client"),
+    _symbol("ClientSession", kind="class", module="demo.client"),
+]
+
+
+def _paths(symbols):
+    return [symbol_path("demo", symbol) for symbol in symbols]
+
+
+def test_split_identifier():
+    assert split_identifier("HTTPClientError") == ["http", "client", "error"]
+    assert split_identifier("get_symbols_docs") == ["get", "symbols", "docs"]
+    assert split_identifier("net.parseURL2") == ["net", "parse", "url", "2"]
+
+
+def test_symbol_path():
+    assert _paths(SYMBOLS[:5]) == [
+        "client",
+        "errors.HTTPClientError",
+        "tools.get_symbols_docs",
+        "client.Client",
+        "client.Client.connect",
+    ]
+
+
+def test_ranking_prefers_exact_then_prefix_then_substring():
+    index = index_symbols("demo", SYMBOLS)
+
+    assert _paths(index.search("client")) == [
+        "client.Client",
+        "client",
+        "client.ClientSession",
+        "errors.HTTPClientError",
+        "create_client",
+        "client.Client.connect",
+    ]
+
+
+def test_token_acronym_and_typo_matches():
+    index = index_symbols("demo", SYMBOLS)
+
+    assert _paths(index.search("client error")) == ["errors.HTTPClientError"]
+    assert _paths(index.search("gsd")) == ["tools.get_symbols_docs"]
+    assert "tools.get_symbols_docs" in _paths(index.search("get_symbol_docs"))
+    assert _paths(index.search("connect", limit=1)) == ["client.Client.connect"]
+
+
+def test_fuzzy_matches_only_without_real_matches():
+    numbered = [
+        _symbol(f"Class{i}_{j}", kind="class") for i in range(60) for j in (4, 5)
+    ]
+    index = index_symbols("demo", numbered)
+
+    assert index.search_page("Class59_4") == ([numbered[118]], 1)
+    assert _paths(index.search("Clas59_4"))[0] == "Class59_4"
+
+
+def test_search_page():
+    index = index_symbols("demo", SYMBOLS)
+    ranked = index.search("client")
+
+    page, total = index.search_page("client", limit=2, offset=2)
+    assert page == ranked[2:4]
+    assert total == len(ranked)
+    assert index.search_page("client", limit=2, offset=10) == ([], len(ranked))
+    assert index.search_page(None, limit=3, offset=1) == (SYMBOLS[1:4], len(SYMBOLS))
+
+
+def test_empty_pattern_returns_all_in_order():
+    index = index_symbols("demo", SYMBOLS)
+    assert index.search(None) == SYMBOLS
+    assert index.search("") == SYMBOLS
+
+
+def test_search_symbols_reuses_index():
+    analyzer = PackageAnalyzer(python_paths=[], enable_subprocess=False)
+
+    with patch.object(
+        analyzer, "_collect_symbols", return_value=SYMBOLS
+    ) as mock_collect:
+        first = analyzer.search_symbols("demo", "client")
+        second = analyzer.search_symbols("demo", "ClientSession")
+        everything = analyzer.search_symbols("demo")
+
+    mock_collect.assert_called_once_with("demo", None, False)
+    assert first[0].qualname == "Client"
+    assert second[0].qualname == "ClientSession"
+    assert everything == SYMBOLS
+
+    analyzer.refresh_environments()
+    with patch.object(
+        analyzer, "_collect_symbols", return_value=SYMBOLS
+    ) as mock_collect:
+        analyzer.search_symbols("demo", "client")
+    mock_collect.assert_called_once()
+
+
+def test_search_indexes_revalidated_and_bounded(tmp_path, monkeypatch):
+    """Reinstalling a package rebuilds its index; old indexes are evicted."""
+    monkeypatch.setattr("mcpydoc.analyzer.SEARCH_INDEX_CACHE_SIZE", 2)
+    analyzer = PackageAnalyzer(python_paths=[], enable_subprocess=False)
+    site_packages = tmp_path / "site-packages"
+    (site_packages / "demo").mkdir(parents=True)
+    (site_packages / "demo" / "__init__.py").write_text("")
+    package_info = PackageInfo(name="demo", version="1.0", location=site_packages)
+
+    with patch.object(analyzer, "get_package_info", return_value=package_info):
+        with patch.object(
+            analyzer, "_collect_symbols", return_value=SYMBOLS
+        ) as collect:
+            analyzer.search_symbols("demo", "client")
+            analyzer.search_symbols("demo", "client")
+            assert collect.call_count == 1
+
+            (site_packages / "demo-1.1.dist-info").mkdir()
+            analyzer.search_symbols("demo", "client")
+            assert collect.call_count == 2
+
+            for name in ("other", "third"):
+                analyzer.search_symbols(name)
+            assert list(analyzer._search_indexes) == ["other@latest", "third@latest"]
+
+
+@pytest.mark.parametrize("static", [True, False])
+def test_search_beyond_scan_limit(tmp_path, monkeypatch, static):
+    """Packages with more symbols than a scan collects are searched per pattern."""
+    monkeypatch.setattr("mcpydoc.analyzer.MAX_SCAN_SYMBOLS", 50)
+    monkeypatch.setattr("mcpydoc.static_analysis.MAX_SCAN_SYMBOLS", 50)
+    package_name = f"mcpydoc_large_{'static' if static else 'imported'}"
+    package = tmp_path / package_name
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    for module in range(8):
+        (package / f"mod{module}.py").write_text(
+            "".join(f"class Class{module}_{i}:\n    pass\n" for i in range(10))
+        )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    analyzer = PackageAnalyzer(
+        python_paths=[], enable_subprocess=False, enable_static_analysis=static
+    )
+    package_info = PackageInfo(name=package_name, version="1.0", location=tmp_path)
+
+    with patch.object(analyzer, "get_package_info", return_value=package_info):
+        results = analyzer.search_symbols(package_name, "Class7_4")
+        page, total = analyzer.search_symbols_page(package_name, "class7_", limit=3)
+
+    assert [symbol.qualname for symbol in results] == ["Class7_4"]
+    assert results[0].module == f"{package_name}.mod7"
+    assert total == 10 and len(page) == 3
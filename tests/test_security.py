@@ -6,11 +6,13 @@ to verify that ValidationError, PackageSecurityError, and other security excepti
 are raised when they should be. This is the expected and correct behavior.
 """
 
-import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from mcpydoc.deadline import check_deadline, deadline_scope, remaining_time
 from mcpydoc.exceptions import (
     PackageSecurityError,
     ResourceLimitError,
@@ -25,6 +27,7 @@ from mcpydoc.security import (
     timeout,
     validate_file_path,
     validate_package_name,
+    validate_root,
     validate_symbol_path,
     validate_version,
 )
@@ -155,20 +158,20 @@ class TestResourceLimits:
         result = quick_function()
         assert result == "success"
 
-    @pytest.mark.skipif(
-        not hasattr(signal, "SIGALRM"), reason="SIGALRM not available on Windows"
-    )
     def test_timeout_decorator_timeout(self):
-        """Test timeout decorator with timeout."""
-        import time
+        """Work past the deadline is stopped at the next check, but a call
+        that completes late still returns its result."""
 
         @timeout(1)
-        def slow_function():
-            time.sleep(2)
-            return "should not reach"
+        def slow_function(check):
+            time.sleep(1.2)
+            if check:
+                check_deadline("slow_function")
+            return "late result"
 
         with pytest.raises(ResourceLimitError):
-            slow_function()
+            slow_function(check=True)
+        assert slow_function(check=False) == "late result"
 
     def test_memory_limit_decorator(self):
         """Test memory limit decorator."""
@@ -181,6 +184,48 @@ class TestResourceLimits:
         result = test_function()
         assert result == "success"
 
+    def test_limits_skipped_off_main_thread(self):
+        """Decorated functions can run on executor threads."""
+
+        @timeout(1)
+        @memory_limit(100)
+        def threaded_function():
+            return "success"
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(threaded_function).result() == "success"
+
+    def test_timeout_enforced_off_main_thread(self):
+        """Deadlines are checked cooperatively on any thread."""
+
+        @timeout(1)
+        def busy_function():
+            while True:
+                check_deadline("busy_function")
+                time.sleep(0.01)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(ResourceLimitError):
+                executor.submit(busy_function).result(timeout=5)
+
+    def test_nested_timeouts_share_deadline(self):
+        """Nested timed calls can shorten but never extend the deadline."""
+
+        @timeout(30)
+        def inner():
+            return remaining_time()
+
+        @timeout(1)
+        def outer():
+            return inner()
+
+        assert remaining_time() is None
+        assert 0 < outer() <= 1
+        assert remaining_time(5) == 5
+        with deadline_scope(10):
+            assert remaining_time(5) <= 5
+            assert 5 < remaining_time() <= 10
+
 
 class TestSecurityContext:
     """Test SecurityContext context manager."""
@@ -261,6 +306,20 @@ class TestPathValidation:
         with pytest.raises(ValidationError):
             validate_file_path("invalid\0path")
 
+    def test_validate_root(self, tmp_path):
+        """Tool roots must be directories within the client's roots."""
+        service = tmp_path / "services" / "api"
+        service.mkdir(parents=True)
+
+        assert validate_root("services/api", [str(tmp_path)], tmp_path) == service
+        assert validate_root(str(service), [], None) == service
+        with pytest.raises(ValidationError):
+            validate_root(str(tmp_path), [str(service)], None)
+        with pytest.raises(ValidationError):
+            validate_root(str(tmp_path / "missing"), [], None)
+        with pytest.raises(ValidationError):
+            validate_root("invalid\0path", [], None)
+
 
 class TestSecurityIntegration:
     """Integration tests for security features."""
@@ -0,0 +1,194 @@
+"""Tests for static (AST-based) symbol extraction."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from mcpydoc.analyzer import PackageAnalyzer
+from mcpydoc.models import PackageInfo
+from mcpydoc.static_analysis import extract_symbols, find_package_source
+
+INIT_SOURCE = '''"""Demo package."""
+
+from .core import Engine
+
+raise RuntimeError("static analysis must not import this package")
+
+
+def connect(host: str, port: int = 80) -> "Engine":
+    """Open a connection."""
+'''
+
+CORE_SOURCE = '''"""Core engine."""
+
+import functools
+
+
+class Engine:
+    """The engine."""
+
+    def __init__(self, name, debug=False):
+        self.name = name
+
+    @functools.lru_cache()
+    def run(self, *args, **kwargs) -> int:
+        """Run the engine."""
+        return 0
+
+    async def stop(self):
+        pass
+
+    def _private(self):
+        pass
+
+
+def _helper():
+    pass
+'''
+
+
+@pytest.fixture
+def demo_package(tmp_path):
+    """Create an importable-looking package that explodes on import."""
+    package = tmp_path / "demo"
+    (package / "sub").mkdir(parents=True)
+    (package / "__init__.py").write_text(INIT_SOURCE)
+    (package / "core.py").write_text(CORE_SOURCE)
+    (package / "_internal.py").write_text("def hidden():\n    pass\n")
+    (package / "sub" / "__init__.py").write_text("")
+    (package / "sub" / "broken.py").write_text("def oops(:\n")
+    (package / "notpkg").mkdir()
+    (package / "notpkg" / "stray.py").write_text("def stray():\n    pass\n")
+    return tmp_path
+
+
+def test_find_package_source(demo_package):
+    assert find_package_source("demo", demo_package) == demo_package / "demo"
+    assert find_package_source("demo", demo_package / "demo") == demo_package / "demo"
+    assert find_package_source("missing", demo_package) is None
+    assert find_package_source("demo", None) is None
+
+    (demo_package / "single.py").write_text("def f():\n    pass\n")
+    assert find_package_source("single", demo_package) == demo_package / "single.py"
+
+
+def test_extract_symbols(demo_package):
+    symbols = extract_symbols("demo", demo_package / "demo")
+    by_path = {symbol["path"]: symbol for symbol in symbols}
+
+    assert set(by_path) == {
+        "connect",
+        "core",
+        "core.Engine",
+        "core.Engine.run",
+        "core.Engine.stop",
+        "sub",
+        "sub.broken",
+    }
+    assert "demo" not in sys.modules
+
+    connect = by_path["connect"]
+    assert connect["kind"] == "function"
+    assert connect["module"] == "demo"
+    assert connect["signature"] == "(host: str, port: int=80) -> 'Engine'"
+    assert connect["docstring"] == "Open a connection."
+
+    engine = by_path["core.Engine"]
+    assert engine["kind"] == "class"
+    assert engine["module"] == "demo.core"
+    assert engine["signature"] == "(name, debug=False)"
+    assert engine["docstring"] == "The engine."
+
+    run = by_path["core.Engine.run"]
+    assert run["kind"] == "method"
+    assert run["qualname"] == "Engine.run"
+    assert run["signature"] == "(self, *args, **kwargs) -> int"
+    assert run["decorators"] == ["functools.lru_cache()"]
+    assert run["lineno"] == 13
+
+    assert by_path["core"]["kind"] == "module"
+    assert by_path["core"]["docstring"] == "Core engine."
+
+
+def test_extract_symbols_with_pattern(demo_package):
+    symbols = extract_symbols("demo", demo_package / "demo", "ENGINE")
+    assert [symbol["path"] for symbol in symbols] == [
+        "core.Engine",
+        "core.Engine.run",
+        "core.Engine.stop",
+    ]
+
+
+def test_extract_symbols_follows_reexports(tmp_path):
+    """Public API defined in private modules is listed under the package."""
+    package = tmp_path / "client"
+    (package / "_impl").mkdir(parents=True)
+    (package / "__init__.py").write_text(
+        "from ._impl import Client, connect\n"
+        "from ._constants import TIMEOUT\n"
+        "__all__ = ['Client', 'connect', 'TIMEOUT', 'version']\n"
+        "def version():\n    pass\n"
+    )
+    (package / "_constants.py").write_text("TIMEOUT = 30\n")
+    (package / "_impl" / "__init__.py").write_text(
+        "from ._client import *\n"
+        "def connect(url: str) -> 'Client':\n    '''Connect.'''\n"
+    )
+    (package / "_impl" / "_client.py").write_text(
+        "__all__ = ['Client']\n"
+        "class Client:\n    def get(self, key):\n        pass\n"
+    )
+
+    unresolved = []
+    symbols = extract_symbols("client", package, unresolved=unresolved)
+    by_path = {symbol["path"]: symbol for symbol in symbols}
+
+    assert unresolved == []
+    assert set(by_path) == {"Client", "Client.get", "connect", "version"}
+    assert by_path["Client"]["module"] == "client._impl._client"
+    assert by_path["connect"]["signature"] == "(url: str) -> 'Client'"
+    assert by_path["connect"]["file"] == str(package / "_impl" / "__init__.py")
+
+    # Names bound at runtime leave the search to import-based introspection
+    (package / "__init__.py").write_text(
+        "from ._impl import Client, connect\n"
+        "from ._speedups import parse\n"
+        "__all__ = ['Client', 'lazy']\n"
+    )
+    extract_symbols("client", package, unresolved=unresolved)
+    assert unresolved == ["parse", "lazy"]
+
+    analyzer = PackageAnalyzer(python_paths=[], enable_subprocess=False)
+    package_info = PackageInfo(name="client", version="1.0.0", location=tmp_path)
+    with patch.object(analyzer, "get_package_info", return_value=package_info):
+        assert analyzer._extract_symbols_statically("client") is None
+
+
+def test_analyzer_search_uses_static_analysis(demo_package):
+    analyzer = PackageAnalyzer(python_paths=[], enable_subprocess=False)
+    package_info = PackageInfo(name="demo", version="1.0.0", location=demo_package)
+
+    with patch.object(analyzer, "get_package_info", return_value=package_info):
+        with patch.object(analyzer, "_import_module") as mock_import:
+            results = analyzer.search_symbols("demo", "run")
+
+    mock_import.assert_not_called()
+    assert [symbol.qualname for symbol in results] == ["Engine.run"]
+    assert results[0].decorators == ["functools.lru_cache()"]
+
+
+def test_analyzer_falls_back_without_source(tmp_path):
+    analyzer = PackageAnalyzer(python_paths=[], enable_subprocess=False)
+    package_info = PackageInfo(name="demo", version="1.0.0", location=tmp_path)
+
+    with patch.object(analyzer, "get_package_info", return_value=package_info):
+        assert analyzer._extract_symbols_statically("demo") is None
+
+    disabled = PackageAnalyzer(
+        python_paths=[], enable_subprocess=False, enable_static_analysis=False
+    )
+    with patch.object(disabled, "_extract_symbols_statically") as mock_static:
+        disabled.search_symbols("json", "loads")
+    mock_static.assert_not_called()
@@ -8,16 +8,32 @@ from unittest.mock import MagicMock, Mock, patch
 import pytest
 
 from mcpydoc.subprocess_introspection import (
-    _find_project_root,
     _is_command_available,
     clear_cache,
     detect_package_manager,
+    find_project_root,
+    get_failure,
     get_working_directory,
     introspect_package_info,
     introspect_symbol,
+    introspect_symbols,
     is_subprocess_available,
     search_symbols_subprocess,
+    set_interpreter_resolution,
+    set_working_directory,
+    workspace_scope,
 )
+from mcpydoc.worker_pool import SlotTimeoutExpired, set_persistent_workers
+
+
+@pytest.fixture(autouse=True)
+def one_shot_subprocesses():
+    """Run introspection through run_process so it can be mocked."""
+    set_persistent_workers(False)
+    set_interpreter_resolution(False)
+    yield
+    set_persistent_workers(True)
+    set_interpreter_resolution(True)
 
 
 @pytest.fixture
@@ -57,13 +73,13 @@ def test_find_project_root(uv_project):
     subdir.mkdir(parents=True)
 
     # Should find project root from subdirectory
-    result = _find_project_root(subdir)
+    result = find_project_root(subdir)
     assert result == uv_project
 
 
 def test_find_project_root_no_project(tmp_path):
     """Test when no project root is found."""
-    result = _find_project_root(tmp_path)
+    result = find_project_root(tmp_path)
     assert result is None
 
 
@@ -180,7 +196,7 @@ def test_introspect_package_info_success(mock_cmd_available, uv_project):
         }
     )
 
-    with patch("mcpydoc.subprocess_introspection.subprocess.run") as mock_run:
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
         mock_run.return_value = Mock(returncode=0, stdout=mock_output)
 
         result = introspect_package_info("pytest", uv_project)
@@ -202,7 +218,7 @@ def test_introspect_package_info_failure(mock_cmd_available, uv_project):
     mock_cmd_available.return_value = True
     clear_cache()
 
-    with patch("mcpydoc.subprocess_introspection.subprocess.run") as mock_run:
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
         mock_run.return_value = Mock(returncode=1, stderr="Error message")
 
         result = introspect_package_info("nonexistent", uv_project)
@@ -216,7 +232,7 @@ def test_introspect_package_info_timeout(mock_cmd_available, uv_project):
     mock_cmd_available.return_value = True
     clear_cache()
 
-    with patch("mcpydoc.subprocess_introspection.subprocess.run") as mock_run:
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
         mock_run.side_effect = subprocess.TimeoutExpired("cmd", 15)
 
         result = introspect_package_info("pytest", uv_project)
@@ -249,7 +265,7 @@ def test_introspect_symbol_success(mock_cmd_available, uv_project):
         }
     )
 
-    with patch("mcpydoc.subprocess_introspection.subprocess.run") as mock_run:
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
         mock_run.return_value = Mock(returncode=0, stdout=mock_output)
 
         result = introspect_symbol("pytest", "main", uv_project)
@@ -266,7 +282,7 @@ def test_introspect_symbol_failure(mock_cmd_available, uv_project):
     mock_cmd_available.return_value = True
     clear_cache()
 
-    with patch("mcpydoc.subprocess_introspection.subprocess.run") as mock_run:
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
         mock_run.return_value = Mock(returncode=1, stderr="Symbol not found")
 
         result = introspect_symbol("pytest", "nonexistent", uv_project)
@@ -274,6 +290,104 @@ def test_introspect_symbol_failure(mock_cmd_available, uv_project):
         assert result is None
 
 
+@patch("mcpydoc.subprocess_introspection._is_command_available")
+def test_introspect_symbols_single_round_trip(mock_cmd_available, uv_project):
+    """Test that a batch of symbols is resolved by one subprocess call."""
+    mock_cmd_available.return_value = True
+    clear_cache()
+
+    mock_output = json.dumps(
+        {
+            "symbols": {
+                "main": {
+                    "name": "main",
+                    "qualname": "main",
+                    "kind": "function",
+                    "module": "pytest",
+                    "docstring": "Main entry point",
+                    "signature": "(args=None)",
+                },
+                "nonexistent": {"error": "no attribute", "type": "AttributeError"},
+            }
+        }
+    )
+
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
+        mock_run.return_value = Mock(returncode=0, stdout=mock_output)
+
+        result = introspect_symbols("pytest", ["main", "nonexistent"], uv_project)
+
+        assert mock_run.call_count == 1
+        assert set(result) == {"main"}
+        assert result["main"]["signature"] == "(args=None)"
+
+        # Resolved symbols are cached individually for single-symbol lookups
+        assert introspect_symbol("pytest", "main", uv_project) == result["main"]
+        assert mock_run.call_count == 1
+
+
+def test_introspect_symbols_real_interpreter(tmp_path):
+    """Test the batched script against the current interpreter."""
+    import sys
+
+    clear_cache()
+    with patch(
+        "mcpydoc.subprocess_introspection.detect_package_manager",
+        return_value=([sys.executable], tmp_path),
+    ):
+        result = introspect_symbols("json", ["dumps", "JSONDecoder", "nope"], tmp_path)
+
+    assert result["dumps"]["kind"] == "function"
+    assert result["JSONDecoder"]["kind"] == "class"
+    assert "nope" not in result
+
+
+def test_symbol_detail_levels(tmp_path):
+    """Lower detail levels skip work in the script; full results serve them."""
+    import sys
+
+    clear_cache()
+    with patch(
+        "mcpydoc.subprocess_introspection.detect_package_manager",
+        return_value=([sys.executable], tmp_path),
+    ):
+        signature = introspect_symbol(
+            "json", "JSONDecoder", tmp_path, detail="signature"
+        )
+        assert signature["signature"]
+        assert (signature["docstring"], signature["methods"]) == (None, None)
+        assert signature["source"] is None
+
+        summary = introspect_symbol("json", "JSONDecoder", tmp_path, detail="summary")
+        assert summary["docstring"] and summary["methods"]
+        assert summary["source"] is None
+
+        full = introspect_symbol("json", "JSONEncoder", tmp_path)
+        assert full["source"].startswith("class JSONEncoder")
+        with patch("mcpydoc.subprocess_introspection._run_script") as mock_run:
+            assert (
+                introspect_symbol("json", "JSONEncoder", tmp_path, detail="summary")
+                == full
+            )
+        mock_run.assert_not_called()
+
+
+def test_scripts_accept_distribution_and_import_names(tmp_path):
+    """Distribution and import names resolve in the project interpreter."""
+    import sys
+
+    clear_cache()
+    with patch(
+        "mcpydoc.subprocess_introspection.detect_package_manager",
+        return_value=([sys.executable], tmp_path),
+    ):
+        info = introspect_package_info("pytest_asyncio", tmp_path)
+        symbol = introspect_symbol("pytest-asyncio", "fixture", tmp_path)
+
+    assert (info["name"], info["import_name"]) == ("pytest-asyncio", "pytest_asyncio")
+    assert symbol["module"].startswith("pytest_asyncio")
+
+
 @patch("mcpydoc.subprocess_introspection._is_command_available")
 def test_search_symbols_subprocess_success(mock_cmd_available, uv_project):
     """Test successful symbol search via subprocess."""
@@ -300,7 +414,7 @@ def test_search_symbols_subprocess_success(mock_cmd_available, uv_project):
     ]
     mock_output = json.dumps({"symbols": mock_symbols, "count": 2})
 
-    with patch("mcpydoc.subprocess_introspection.subprocess.run") as mock_run:
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
         mock_run.return_value = Mock(returncode=0, stdout=mock_output)
 
         result = search_symbols_subprocess("pytest", None, uv_project)
@@ -329,7 +443,7 @@ def test_search_symbols_subprocess_with_pattern(mock_cmd_available, uv_project):
     ]
     mock_output = json.dumps({"symbols": mock_symbols, "count": 1})
 
-    with patch("mcpydoc.subprocess_introspection.subprocess.run") as mock_run:
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
         mock_run.return_value = Mock(returncode=0, stdout=mock_output)
 
         result = search_symbols_subprocess("pytest", "fixture", uv_project)
@@ -349,7 +463,7 @@ def test_search_symbols_subprocess_failure(mock_cmd_available, uv_project):
     mock_cmd_available.return_value = True
     clear_cache()
 
-    with patch("mcpydoc.subprocess_introspection.subprocess.run") as mock_run:
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
         mock_run.return_value = Mock(returncode=1, stderr="Package not found")
 
         result = search_symbols_subprocess("nonexistent", None, uv_project)
@@ -375,7 +489,7 @@ def test_caching_behavior(mock_cmd_available, uv_project):
         }
     )
 
-    with patch("mcpydoc.subprocess_introspection.subprocess.run") as mock_run:
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
         mock_run.return_value = Mock(returncode=0, stdout=mock_output)
 
         # First call - should execute subprocess
@@ -408,6 +522,20 @@ def test_get_working_directory_fallback():
         assert result == Path.cwd()
 
 
+def test_workspace_scope_overrides_client_root(tmp_path):
+    """A workspace scope applies to its own context only."""
+    client_root, session_root = tmp_path / "client", tmp_path / "session"
+    client_root.mkdir()
+    session_root.mkdir()
+    set_working_directory(str(client_root))
+    try:
+        with workspace_scope(session_root):
+            assert get_working_directory() == session_root
+        assert get_working_directory() == client_root
+    finally:
+        set_working_directory(None)
+
+
 def test_clear_cache(uv_project):
     """Test that clear_cache removes all cached data."""
     # First populate the cache
@@ -442,11 +570,9 @@ def test_is_subprocess_available(mock_cmd_available, uv_project, mock_project_di
 
     clear_cache()
 
-    # Should not be available for empty directory (mock _find_project_root to prevent
+    # Should not be available for empty directory (mock find_project_root to prevent
     # searching up to parent directories which might find the test runner's project)
-    with patch(
-        "mcpydoc.subprocess_introspection._find_project_root", return_value=None
-    ):
+    with patch("mcpydoc.subprocess_introspection.find_project_root", return_value=None):
         # Clear cache again inside patch context to ensure fresh detection
         clear_cache()
         assert is_subprocess_available(mock_project_dir) is False
@@ -493,3 +619,118 @@ def test_integration_subprocess_with_real_package():
         assert project_root.exists()
     else:
         pytest.skip("No package manager detected, skipping real subprocess test")
+
+
+@patch("mcpydoc.subprocess_introspection._is_command_available")
+def test_cached_results_revalidated_against_environment(mock_cmd_available, uv_project):
+    """Only results whose files, dist-info or lockfiles changed are recomputed."""
+    mock_cmd_available.return_value = True
+    clear_cache()
+
+    dist_info = uv_project / "demo-1.0.dist-info"
+    dist_info.mkdir()
+    core = uv_project / "core.py"
+    utils = uv_project / "utils.py"
+    core.write_text("def run(): pass\n")
+    utils.write_text("def helper(): pass\n")
+
+    def fake_run(command, cwd, timeout):
+        script = command[-1]
+        if "symbol_path = 'run'" in script:
+            data = {"name": "run", "qualname": "run", "kind": "function"}
+            data.update(module="demo.core", file=str(core))
+        elif "symbol_path = 'helper'" in script:
+            data = {"name": "helper", "qualname": "helper", "kind": "function"}
+            data.update(module="demo.utils", file=str(utils))
+        else:
+            data = {"name": "demo", "version": "1.0", "dist_info": str(dist_info)}
+        return Mock(returncode=0, stdout=json.dumps(data))
+
+    def calls():
+        return [call.args[0][-1] for call in mock_run.call_args_list]
+
+    with patch(
+        "mcpydoc.subprocess_introspection.run_process", side_effect=fake_run
+    ) as mock_run:
+        introspect_package_info("demo", uv_project)
+        for _ in range(2):
+            assert introspect_symbol("demo", "run", uv_project)["name"] == "run"
+            assert introspect_symbol("demo", "helper", uv_project)["name"] == "helper"
+        assert mock_run.call_count == 3
+
+        # Editing one source file only invalidates symbols defined in it
+        core.write_text("def run(fast=False): pass\n")
+        introspect_symbol("demo", "run", uv_project)
+        introspect_symbol("demo", "helper", uv_project)
+        assert mock_run.call_count == 4
+        assert "symbol_path = 'run'" in calls()[-1]
+
+        # Reinstalling the distribution invalidates everything from it
+        dist_info.rmdir()
+        introspect_package_info("demo", uv_project)
+        introspect_symbol("demo", "helper", uv_project)
+        assert mock_run.call_count == 6
+
+        # So does a lockfile change
+        (uv_project / "uv.lock").write_text("version = 2\n")
+        introspect_symbol("demo", "helper", uv_project)
+        assert mock_run.call_count == 7
+
+    clear_cache()
+
+
+@patch("mcpydoc.subprocess_introspection._is_command_available")
+def test_failed_lookups_cached_until_environment_changes(
+    mock_cmd_available, uv_project, monkeypatch
+):
+    """Missing packages and timeouts are not retried until something changes."""
+    mock_cmd_available.return_value = True
+    clear_cache()
+
+    site_packages = uv_project / "site-packages"
+    site_packages.mkdir()
+    missing = {
+        "error": "No package metadata was found for demo",
+        "type": "PackageNotFoundError",
+        "search_path": [str(site_packages)],
+    }
+
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
+        mock_run.return_value = Mock(returncode=1, stdout=json.dumps(missing))
+        assert introspect_package_info("demo", uv_project) is None
+        assert introspect_package_info("demo", uv_project) is None
+        assert mock_run.call_count == 1
+
+        failure = get_failure(f"pkg_info:demo:{uv_project}")
+        assert (failure.path, failure.kind) == ("subprocess", "not_found")
+
+        # Installing something into a searched directory retries the lookup
+        (site_packages / "demo-1.0.dist-info").mkdir()
+        assert introspect_package_info("demo", uv_project) is None
+        assert mock_run.call_count == 2
+
+        # Timeouts skip the subprocess path until the lockfile changes
+        mock_run.side_effect = subprocess.TimeoutExpired("cmd", 20)
+        assert introspect_symbol("demo", "run", uv_project) is None
+        assert introspect_symbol("demo", "run", uv_project) is None
+        assert mock_run.call_count == 3
+        assert get_failure(f"symbol:demo:run:{uv_project}").kind == "timeout"
+
+        (uv_project / "uv.lock").write_text("version = 2\n")
+        assert introspect_symbol("demo", "run", uv_project) is None
+        assert mock_run.call_count == 4
+
+        # A busy project says nothing about the lookup itself
+        mock_run.side_effect = SlotTimeoutExpired("introspection", 20)
+        assert introspect_symbol("demo", "other", uv_project) is None
+        assert get_failure(f"symbol:demo:other:{uv_project}") is None
+
+        # A zero TTL disables negative caching
+        monkeypatch.setenv("MCPYDOC_NEGATIVE_CACHE_TTL", "0")
+        clear_cache()
+        mock_run.side_effect = None
+        introspect_package_info("demo", uv_project)
+        introspect_package_info("demo", uv_project)
+        assert mock_run.call_count == 7
+
+    clear_cache()
@@ -0,0 +1,187 @@
+"""Tests for the persistent on-disk symbol index."""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mcpydoc.subprocess_introspection import (
+    _introspection_cache,
+    clear_cache,
+    introspect_package_info,
+    search_symbols_subprocess,
+    set_interpreter_resolution,
+)
+from mcpydoc.symbol_index import (
+    PersistentSymbolIndex,
+    filter_symbols,
+    get_persistent_index,
+    lockfile_hash,
+)
+from mcpydoc.worker_pool import set_persistent_workers
+
+PACKAGE_OUTPUT = json.dumps(
+    {
+        "name": "demo",
+        "version": "1.0.0",
+        "summary": None,
+        "author": None,
+        "license": None,
+        "location": "/site-packages",
+        "is_builtin": False,
+    }
+)
+
+SEARCH_OUTPUT = json.dumps(
+    {
+        "symbols": [
+            {
+                "name": "Client",
+                "qualname": "Client",
+                "kind": "class",
+                "module": "demo",
+                "docstring": None,
+                "signature": "()",
+                "path": "Client",
+            },
+            {
+                "name": "connect",
+                "qualname": "connect",
+                "kind": "function",
+                "module": "demo.net",
+                "docstring": None,
+                "signature": "()",
+                "path": "net.connect",
+            },
+        ],
+        "count": 2,
+        "truncated": False,
+    }
+)
+
+
+@pytest.fixture
+def uv_project(tmp_path):
+    """Create a mock uv project directory."""
+    (tmp_path / "uv.lock").write_text("version = 1\n")
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def one_shot_subprocesses():
+    """Run introspection through run_process so it can be mocked."""
+    set_persistent_workers(False)
+    set_interpreter_resolution(False)
+    clear_cache()
+    yield
+    set_persistent_workers(True)
+    set_interpreter_resolution(True)
+
+
+def _new_session():
+    """Simulate a server restart: drop every in-memory cache."""
+    _introspection_cache.clear()
+
+
+def test_index_round_trip(tmp_path):
+    """Stored entries are returned for the same key only."""
+    index = PersistentSymbolIndex(tmp_path / "index.sqlite3")
+    index.put_package(tmp_path, "demo", "hash1", {"name": "demo"})
+
+    assert index.get_package(tmp_path, "demo", "hash1") == {"name": "demo"}
+    assert index.get_package(tmp_path, "demo", "hash2") is None
+
+    index.put_symbol(tmp_path, "demo", "1.0", "hash1", "Client", {"kind": "class"})
+    assert index.get_symbol(tmp_path, "demo", "1.0", "hash1", "Client") == {
+        "kind": "class"
+    }
+    assert index.get_symbol(tmp_path, "demo", "2.0", "hash1", "Client") is None
+    index.close()
+
+
+def test_index_prunes_superseded_entries(tmp_path):
+    """Entries for an older lockfile or version are dropped on the next write."""
+    index = PersistentSymbolIndex(tmp_path / "index.sqlite3")
+    index.put_package(tmp_path, "demo", "hash1", {"version": "1.0"})
+    index.put_package(tmp_path, "other", "hash1", {"version": "3.0"})
+    index.put_symbol_set(tmp_path, "demo", "1.0", "hash1", {"symbols": []})
+    index.put_symbol(tmp_path, "demo", "1.0", "hash1", "Client", {"kind": "class"})
+    index.put_symbol(tmp_path, "demo", "1.0", "hash1", "connect", {})
+
+    index.put_package(tmp_path, "demo", "hash2", {"version": "2.0"})
+    index.put_symbol_set(tmp_path, "demo", "2.0", "hash2", {"symbols": []})
+    index.put_symbol(tmp_path, "demo", "2.0", "hash2", "Client", {"kind": "class"})
+
+    assert index.get_package(tmp_path, "demo", "hash1") is None
+    assert index.get_package(tmp_path, "other", "hash1") == {"version": "3.0"}
+    assert index.get_symbol_set(tmp_path, "demo", "1.0", "hash1") is None
+    assert index.get_symbol(tmp_path, "demo", "1.0", "hash1", "connect") is None
+    for table in ("packages", "symbol_sets", "symbols"):
+        count = index._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        assert count == (2 if table == "packages" else 1)
+    index.close()
+
+
+def test_lockfile_hash_tracks_content(uv_project):
+    """Changing the lockfile produces a new key."""
+    before = lockfile_hash(uv_project)
+    assert lockfile_hash(uv_project) == before
+
+    (uv_project / "uv.lock").write_text("version = 2\n# changed\n")
+    assert lockfile_hash(uv_project) != before
+
+
+def test_filter_symbols_matches_dotted_path():
+    """Patterns match the same dotted path the search script uses."""
+    symbols = json.loads(SEARCH_OUTPUT)["symbols"]
+
+    assert [s["name"] for s in filter_symbols(symbols, "NET")] == ["connect"]
+    assert len(filter_symbols(symbols, None)) == 2
+
+
+@patch("mcpydoc.subprocess_introspection._is_command_available", return_value=True)
+def test_repeat_session_served_from_index(mock_cmd_available, uv_project):
+    """A restarted server answers package info and searches without subprocesses."""
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
+        mock_run.side_effect = [
+            Mock(returncode=0, stdout=PACKAGE_OUTPUT),
+            Mock(returncode=0, stdout=SEARCH_OUTPUT),
+        ]
+        introspect_package_info("demo", uv_project)
+        search_symbols_subprocess("demo", None, uv_project)
+        assert mock_run.call_count == 2
+
+    _new_session()
+
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
+        info = introspect_package_info("demo", uv_project)
+        all_symbols = search_symbols_subprocess("demo", None, uv_project)
+        filtered = search_symbols_subprocess("demo", "client", uv_project)
+
+        mock_run.assert_not_called()
+
+    assert info["version"] == "1.0.0"
+    assert len(all_symbols) == 2
+    assert [s["name"] for s in filtered] == ["Client"]
+
+
+@patch("mcpydoc.subprocess_introspection._is_command_available", return_value=True)
+def test_lockfile_change_invalidates_index(mock_cmd_available, uv_project):
+    """After the lockfile changes, the package is introspected again."""
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
+        mock_run.return_value = Mock(returncode=0, stdout=PACKAGE_OUTPUT)
+        introspect_package_info("demo", uv_project)
+
+    _new_session()
+    (uv_project / "uv.lock").write_text("version = 1\n# demo upgraded\n")
+
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
+        mock_run.return_value = Mock(returncode=0, stdout=PACKAGE_OUTPUT)
+        introspect_package_info("demo", uv_project)
+        assert mock_run.call_count == 1
+
+
+def test_index_disabled(monkeypatch):
+    """MCPYDOC_PERSISTENT_INDEX=0 turns the index off."""
+    monkeypatch.setenv("MCPYDOC_PERSISTENT_INDEX", "0")
+    assert get_persistent_index() is None
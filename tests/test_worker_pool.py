@@ -0,0 +1,353 @@
+"""Tests for persistent introspection workers."""
+
+import contextvars
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from mcpydoc.subprocess_introspection import (
+    _IMPORT_NAME_RESOLVER,
+    PACKAGE_INFO_SCRIPT,
+    PRELOAD_SCRIPT,
+    _interpreter_cache,
+    _run_script,
+    clear_cache,
+    introspect_package_info,
+)
+from mcpydoc.worker_pool import (
+    IntrospectionWorker,
+    SlotTimeoutExpired,
+    WorkerError,
+    active_worker_count,
+    background_priority,
+    checkout_worker,
+    get_worker,
+    project_slot,
+    restart_workers,
+    run_process,
+    set_persistent_workers,
+    set_zygote_workers,
+    shutdown_workers,
+)
+
+
+@pytest.fixture
+def worker(tmp_path):
+    """A worker running the current interpreter."""
+    worker = IntrospectionWorker([sys.executable], tmp_path)
+    yield worker
+    worker.stop()
+
+
+@pytest.fixture(autouse=True)
+def clean_pool():
+    """Ensure each test starts and ends without running workers."""
+    set_persistent_workers(True)
+    set_zygote_workers(False)
+    shutdown_workers()
+    yield
+    set_zygote_workers(False)
+    shutdown_workers()
+
+
+def test_worker_executes_script(worker):
+    """Scripts run in the worker report stdout and exit code like python -c."""
+    result = worker.execute("print('hello')", timeout=30)
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "hello"
+
+
+def test_worker_reports_sys_exit(worker):
+    """sys.exit in a script maps to the response return code."""
+    result = worker.execute("import sys\nprint('x')\nsys.exit(3)", timeout=30)
+
+    assert result.returncode == 3
+    assert result.stdout.strip() == "x"
+
+
+def test_worker_keeps_modules_warm(worker):
+    """Modules imported by one request are still loaded for the next."""
+    worker.execute("import json, sys\nsys.modules['_mcpydoc_marker'] = json", 30)
+    result = worker.execute("import sys\nprint('_mcpydoc_marker' in sys.modules)", 30)
+
+    assert result.stdout.strip() == "True"
+    assert worker.spawn_count == 1
+
+
+def test_worker_stray_output_does_not_corrupt_protocol(worker):
+    """Writes straight to the stdout file descriptor go to stderr instead."""
+    result = worker.execute(
+        "import os\nos.write(1, b'garbage\\n')\nprint('ok')", timeout=30
+    )
+
+    assert result.stdout.strip() == "ok"
+
+
+def test_worker_restarts_after_crash(worker):
+    """A crashed worker raises and is respawned on the next request."""
+    worker.execute("print(1)", timeout=30)
+
+    with pytest.raises(WorkerError):
+        worker.execute("import os\nos._exit(1)", timeout=30)
+
+    result = worker.execute("print(2)", timeout=30)
+    assert result.stdout.strip() == "2"
+    assert worker.spawn_count == 2
+
+
+def test_worker_restarts_after_timeout(worker):
+    """A hung worker is killed on timeout and respawned."""
+    with pytest.raises(subprocess.TimeoutExpired):
+        worker.execute("import time\ntime.sleep(30)", timeout=1)
+
+    assert not worker.is_alive
+    result = worker.execute("print('back')", timeout=30)
+    assert result.stdout.strip() == "back"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="zygote mode needs os.fork")
+def test_zygote_worker_isolates_scripts(worker):
+    """In zygote mode scripts see the preloaded package but not each other."""
+    set_zygote_workers(True)
+    preload = PRELOAD_SCRIPT.format(package_name="json")
+    check = "import sys\nprint('json' in sys.modules, '_mcpydoc_marker' in sys.modules)"
+
+    worker.execute("import sys\nsys.modules['_mcpydoc_marker'] = sys", 30, preload)
+    result = worker.execute(check, 30, preload)
+
+    assert result.stdout.strip() == "True False"
+    assert worker.spawn_count == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="zygote mode needs os.fork")
+def test_zygote_worker_survives_crashing_script(worker):
+    """A script killing its forked process fails without taking the worker down."""
+    set_zygote_workers(True)
+
+    crashed = worker.execute("import os\nos._exit(1)", timeout=30)
+    result = worker.execute("import sys\nsys.exit(3)", timeout=30)
+
+    assert crashed.returncode == 1
+    assert "exited abnormally" in crashed.stderr
+    assert result.returncode == 3
+    assert worker.spawn_count == 1
+
+
+def test_worker_maps_import_names_until_installs(worker, tmp_path):
+    """The import name to distribution map is rebuilt only after installs."""
+    site_packages = tmp_path / "site-packages"
+    site_packages.mkdir()
+    resolver = _IMPORT_NAME_RESOLVER.format()
+    worker.execute(
+        resolver + f"sys.path.append({str(site_packages)!r})\npackages_distributions()",
+        30,
+    )
+    result = worker.execute(
+        resolver
+        + "real = metadata.packages_distributions\n"
+        + "metadata.packages_distributions = None\n"
+        + "print(find_distribution('_pytest').metadata['Name'])\n"
+        + "metadata.packages_distributions = real\n",
+        30,
+    )
+    assert result.stdout.strip() == "pytest"
+
+    dist_info = site_packages / "newdist-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Name: newdist\nVersion: 1.0\n")
+    (dist_info / "top_level.txt").write_text("newmod\n")
+    result = worker.execute(
+        resolver + "print(find_distribution('newmod').metadata['Name'])", 30
+    )
+    assert result.stdout.strip() == "newdist"
+
+
+def test_get_worker_reuses_worker_per_project(tmp_path):
+    """The pool hands out one worker per project root."""
+    first = get_worker([sys.executable], tmp_path)
+    second = get_worker([sys.executable], tmp_path)
+
+    assert first is second
+
+
+def test_run_script_uses_worker(tmp_path):
+    """_run_script goes through the persistent worker when enabled."""
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
+        result = _run_script([sys.executable], tmp_path, "print(40 + 2)", 30)
+
+    mock_run.assert_not_called()
+    assert result.stdout.strip() == "42"
+    assert active_worker_count() == 1
+
+
+def test_run_script_falls_back_when_worker_unavailable(tmp_path):
+    """A runner that cannot start a worker falls back to a one-shot process."""
+    with patch("mcpydoc.subprocess_introspection.run_process") as mock_run:
+        mock_run.return_value = subprocess.CompletedProcess([], 0, "{}", "")
+        result = _run_script(["mcpydoc-no-such-runner"], tmp_path, "print(1)", 5)
+
+    mock_run.assert_called_once()
+    assert result.stdout == "{}"
+
+
+def test_introspection_pays_startup_once(tmp_path):
+    """Repeated introspection calls share one interpreter."""
+    (tmp_path / "uv.lock").write_text("")
+    clear_cache()
+
+    with patch(
+        "mcpydoc.subprocess_introspection.detect_package_manager",
+        return_value=([sys.executable], tmp_path),
+    ):
+        info = introspect_package_info("pytest", tmp_path)
+        worker = get_worker([sys.executable], tmp_path)
+        for _ in range(3):
+            script = PACKAGE_INFO_SCRIPT.format(package_name="pytest")
+            data = json.loads(
+                _run_script([sys.executable], tmp_path, script, 30).stdout
+            )
+            assert data["name"] == info["name"]
+
+    assert worker.spawn_count == 1
+    clear_cache()
+
+
+def test_concurrent_scripts_share_capped_workers(tmp_path, monkeypatch):
+    """Concurrent calls for one project run in parallel up to the cap, then queue."""
+    monkeypatch.setenv("MCPYDOC_MAX_INTERPRETERS_PER_PROJECT", "2")
+
+    def run(_):
+        return _run_script(
+            [sys.executable], tmp_path, "import time\ntime.sleep(0.5)\nprint(1)", 30
+        )
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(run, range(4)))
+    elapsed = time.monotonic() - started
+
+    assert [result.stdout.strip() for result in results] == ["1"] * 4
+    assert active_worker_count() == 2
+    assert elapsed >= 1.0
+
+
+def test_project_slot_times_out_when_full(tmp_path, monkeypatch):
+    """Callers waiting longer than their timeout for a slot give up."""
+    monkeypatch.setenv("MCPYDOC_MAX_INTERPRETERS_PER_PROJECT", "1")
+
+    with project_slot(tmp_path, 1):
+        with pytest.raises(subprocess.TimeoutExpired):
+            with project_slot(tmp_path, 0.1):
+                pass
+    with project_slot(tmp_path, 0.1):
+        pass
+
+
+def test_background_work_leaves_a_slot_free(tmp_path, monkeypatch):
+    """Background callers never take a project's last interpreter slot."""
+    monkeypatch.setenv("MCPYDOC_MAX_INTERPRETERS_PER_PROJECT", "2")
+
+    def take_slot():
+        with project_slot(tmp_path, 0.1):
+            return True
+
+    with background_priority():
+        with project_slot(tmp_path, 0.1):
+            with pytest.raises(SlotTimeoutExpired):
+                take_slot()
+            # The slot kept free still serves interactive work
+            assert contextvars.Context().run(take_slot)
+
+
+def test_workers_restart_once_per_environment_change(tmp_path):
+    """Stale workers restart once; busy ones finish their request first."""
+    runner = [sys.executable]
+    with checkout_worker(runner, tmp_path) as busy:
+        with checkout_worker(runner, tmp_path) as idle:
+            busy.execute("pass", 30)
+            idle.execute("pass", 30)
+        changed_at = time.time()
+
+        restart_workers(tmp_path, changed_at)
+        assert not idle.is_alive
+        assert busy.is_alive
+        assert busy.execute("print(1)", 30).stdout.strip() == "1"
+
+    with checkout_worker(runner, tmp_path) as worker:
+        worker.execute("pass", 30)
+        assert worker.spawn_count == 2
+
+    # Reporting the same change again leaves the fresh workers alone
+    restart_workers(tmp_path, changed_at)
+    assert {busy.spawn_count, idle.spawn_count} == {1, 2}
+    assert active_worker_count() == 1
+
+
+def _is_running(pid):
+    try:
+        status = Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return False
+    return "\tZ" not in status
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="uses /proc")
+def test_run_process_kills_grandchildren_on_timeout(tmp_path):
+    """A timed-out runner does not leave its interpreter child running."""
+    pid_file = tmp_path / "child.pid"
+    script = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+        "child.wait()\n"
+    )
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_process([sys.executable, "-c", script], tmp_path, 2)
+
+    child_pid = int(pid_file.read_text())
+    for _ in range(50):
+        if not _is_running(child_pid):
+            break
+        time.sleep(0.05)
+    assert not _is_running(child_pid)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script runner")
+def test_runner_resolved_to_interpreter_once(tmp_path):
+    """Package-manager runners are invoked once, then the interpreter directly."""
+    clear_cache()
+    log = tmp_path / "runner.log"
+    runner = tmp_path / "fake-pm"
+    runner.write_text(
+        f'#!/bin/sh\necho run >> {log}\nshift\nexec {sys.executable} "$@"\n'
+    )
+    runner.chmod(0o755)
+    (tmp_path / "uv.lock").write_text("version = 1\n")
+
+    def run():
+        return _run_script([str(runner), "run"], tmp_path, "print(7)", 30)
+
+    for _ in range(3):
+        assert run().stdout.strip() == "7"
+    assert log.read_text().count("run") == 1
+
+    # A lockfile change re-resolves the interpreter
+    (tmp_path / "uv.lock").write_text("version = 2\n")
+    assert run().stdout.strip() == "7"
+    assert log.read_text().count("run") == 2
+
+    # So does an interpreter that no longer exists
+    for key, (lock_hash, _) in list(_interpreter_cache.items()):
+        _interpreter_cache[key] = (lock_hash, str(tmp_path / "missing-python"))
+    assert run().stdout.strip() == "7"
+    assert log.read_text().count("run") == 3
+    clear_cache()
@@ -0,0 +1,155 @@
+"""Tests for the per-root workspace pool."""
+
+import json
+
+import pytest
+
+from mcpydoc.mcp_server import MCPServer
+from mcpydoc.models import SymbolSearchPage
+from mcpydoc.server import MCPyDoc
+from mcpydoc.workspaces import WorkspacePool
+
+
+@pytest.fixture(autouse=True)
+def instant_environment_detection(monkeypatch):
+    monkeypatch.setattr(
+        "mcpydoc.env_detection.get_active_python_environments",
+        lambda use_cache=True: [],
+    )
+
+
+@pytest.fixture
+def roots(tmp_path):
+    """Three project roots of a monorepo."""
+    paths = []
+    for name in ("api", "worker", "web"):
+        path = tmp_path / name
+        path.mkdir()
+        (path / "pyproject.toml").write_text(f'[project]\nname = "{name}"\n')
+        paths.append(path)
+    return paths
+
+
+def test_pool_keys_by_project_root(roots):
+    pool = WorkspacePool(memory_budget_mb=0)
+    subdirectory = roots[0] / "src" / "api"
+    subdirectory.mkdir(parents=True)
+    try:
+        assert pool.get(subdirectory) is pool.get(roots[0])
+        assert pool.get(roots[0]).analyzer._working_directory == roots[0]
+        assert pool.get(roots[1]) is not pool.get(roots[0])
+    finally:
+        pool.shutdown()
+
+
+def test_pool_evicts_least_recently_used_idle_workspace(roots):
+    api, worker, web = roots
+    pool = WorkspacePool(max_open=2, memory_budget_mb=0)
+    try:
+        pool.get(api)
+        pool.get(worker)
+        pool.get(api)
+        pool.get(web)
+        assert pool.roots() == [api, web]
+
+        # Workspaces answering a tool call are never closed
+        with pool.use(api):
+            pool.get(worker)
+            pool.get(web)
+            assert pool.roots() == [api, web]
+    finally:
+        pool.shutdown()
+
+
+def test_pool_closes_idle_workspace_over_memory_budget(roots, monkeypatch):
+    api, worker, web = roots
+    usage = {api: 600 * 2**20, worker: 600 * 2**20, web: 0}
+    monkeypatch.setattr("mcpydoc.workspaces.worker_memory", usage.get)
+    pool = WorkspacePool(max_open=8, memory_budget_mb=1024)
+    try:
+        pool.get(api)
+        pool.get(worker)
+        assert pool.roots() == [worker]
+        # Under the budget nothing else is closed, however often it is checked
+        with pool.use(web):
+            assert pool.roots() == [worker, web]
+        assert pool.roots() == [worker, web]
+
+        # The workspace just used is kept, even alone over the budget
+        usage[web] = 2**40
+        with pool.use(web):
+            pass
+        assert pool.roots() == [web]
+    finally:
+        pool.shutdown()
+
+
+async def test_tool_calls_choose_workspace_by_root(roots, monkeypatch):
+    """Alternating between services keeps both analyzers open and warm."""
+    api, worker, _ = roots
+    server = MCPServer()
+    server._client_roots = [str(api.parent)]
+    answered = []
+
+    async def search(
+        mcpydoc,
+        package_name,
+        pattern=None,
+        version=None,
+        offset=0,
+        limit=50,
+        detail="full",
+    ):
+        answered.append(mcpydoc)
+        return SymbolSearchPage(total=0)
+
+    monkeypatch.setattr(MCPyDoc, "search_package_symbols_page", search)
+
+    async def call(request_id, **arguments):
+        response = await server.handle_request(
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": "tools/call",
+                    "params": {"name": "search_symbols", "arguments": arguments},
+                }
+            )
+        )
+        return json.loads(json.loads(response)["result"]["content"][0]["text"])
+
+    for request_id, root in enumerate((api, worker, api, worker)):
+        result = await call(request_id, package_name="json", root=str(root))
+        assert "error" not in result
+    assert [m.analyzer._working_directory for m in answered] == [
+        api,
+        worker,
+        api,
+        worker,
+    ]
+    assert answered[0] is answered[2]
+    assert answered[1] is answered[3]
+
+    result = await call(9, package_name="json", root=str(api.parent.parent))
+    assert "outside the client's workspace roots" in result["error"]
+
+
+async def test_roots_change_keeps_workspace_until_new_roots(roots):
+    """A roots change opens no workspace for the server's own directory."""
+    api, worker, _ = roots
+    server = MCPServer()
+    server._client_capabilities = {"roots": {"listChanged": True}}
+    sent = []
+    server._write_message = sent.append
+    try:
+        server._handle_roots_response({"roots": [{"uri": f"file://{api}"}]})
+        opened = server._workspaces.roots()
+        server._handle_roots_changed()
+        assert server._workspaces.roots() == opened
+        assert server._workspace_root == api
+        assert json.loads(sent[-1])["method"] == "roots/list"
+
+        server._handle_roots_response({"roots": [{"uri": f"file://{worker}"}]})
+        assert server.mcpydoc.analyzer._working_directory == worker
+    finally:
+        server._workspaces.shutdown()